@@ -111,36 +111,56 @@ const ProcessingPage: React.FC<ProcessingPageProps> = ({ campaignId, onComplete,
   const [isPolling, setIsPolling] = useState(true);
 
   useEffect(() => {
-    const pollPlanStatus = async () => {
-      try {
-        const steps = await apiService.getCampaignPlan(campaignId);
-        setPlanSteps(steps);
-
-        const allCompleted = steps.every(step => step.status === 'completed');
-        const hasError = steps.some(step => step.status === 'error');
+    let cancelled = false;
 
-        if (hasError) {
+    // Long-poll: each request returns as soon as the plan version changes
+    const pollPlanStatus = async () => {
+      let version: number | undefined;
+
+      while (!cancelled) {
+        try {
+          const plan = await apiService.getCampaignPlan(campaignId, version);
+          if (cancelled) return;
+
+          const steps = plan.steps;
+          setPlanSteps(steps);
+
+          const allCompleted = steps.every(step => step.status === 'completed');
+          const hasError = steps.some(step => step.status === 'error');
+
+          if (hasError) {
+            setIsPolling(false);
+            onError('Campaign processing encountered an error');
+            return;
+          }
+
+          if (allCompleted) {
+            setIsPolling(false);
+            setTimeout(() => {
+              onComplete();
+            }, 2000);
+            return;
+          }
+
+          if (plan.version !== null) {
+            version = plan.version;
+          } else {
+            // Server without versioning: fall back to interval polling
+            await new Promise(resolve => setTimeout(resolve, APP_CONFIG.POLLING_INTERVAL));
+          }
+        } catch (error) {
           setIsPolling(false);
-          onError('Campaign processing encountered an error');
+          onError(error instanceof Error ? error.message : 'Failed to fetch plan status');
           return;
         }
-
-        if (allCompleted) {
-          setIsPolling(false);
-          setTimeout(() => {
-            onComplete();
-          }, 2000);
-        }
-      } catch (error) {
-        setIsPolling(false);
-        onError(error instanceof Error ? error.message : 'Failed to fetch plan status');
       }
     };
 
-    const interval = setInterval(pollPlanStatus, APP_CONFIG.POLLING_INTERVAL);
-    pollPlanStatus(); // Initial poll
+    pollPlanStatus();
 
-    return () => clearInterval(interval);
+    return () => {
+      cancelled = true;
+    };
   }, [campaignId, onComplete, onError]);
 
   // Calculate the active step dynamically based on the current plan steps
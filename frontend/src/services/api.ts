@@ -128,15 +128,17 @@ export const apiService = {
   },
 
 
-  async getCampaignPlan(campaignId: string): Promise<PlanStep[]> {
-    const response = await fetch(`${API_ENDPOINTS.BASE_URL}${API_ENDPOINTS.CAMPAIGNS.PLAN(campaignId)}`);
+  async getCampaignPlan(campaignId: string, sinceVersion?: number): Promise<{ steps: PlanStep[]; version: number | null }> {
+    // With sinceVersion the server holds the request until the plan changes (long-poll)
+    const query = sinceVersion !== undefined ? `?since_version=${sinceVersion}` : '';
+    const response = await fetch(`${API_ENDPOINTS.BASE_URL}${API_ENDPOINTS.CAMPAIGNS.PLAN(campaignId)}${query}`);
 
-    console.log(response)
     if (!response.ok) {
       throw new Error(`Failed to get campaign plan: ${response.statusText}`);
     }
 
-    return response.json();
+    const version = response.headers.get('X-Plan-Version');
+    return { steps: await response.json(), version: version !== null ? Number(version) : null };
   },
 
   async getCampaignResults(campaignId: string): Promise<CampaignResult> {
@@ -1,11 +1,46 @@
 """Campaign Strategist Agent - Recommends campaign approach and strategy."""
 
-from typing import Dict, Any, List
+import asyncio
+import json
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime, timedelta
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
-from src.llm import ClaudeProvider
+from src.llm import get_agent_llm_provider, run_sync, estimate_tokens, compact_prompt, record_llm_fallback
+
+# Static strategy format shared by per-segment and batched calls; sent as the
+# (cacheable) system prompt so each call only carries segment data
+SEGMENT_STRATEGY_SYSTEM_PROMPT = compact_prompt("""
+You are an expert insurance marketing strategist specializing in agent segmentation and personalized campaign strategies.
+
+Write each segment strategy in this format:
+
+**Profile Summary**
+[1 sentence mentioning the segment's dominant interest + key challenge/opportunity]
+
+**Engagement Tactics**
+
+1. Performance Incentive: [Milestone] → [Reward $100-200]
+   Milestones: New agents (<2y): "2 policies in 60 days" | Mid (2-5y): "5 policies in Q4" | Vets (5+y): "$500K AUM"
+   Rewards by interest:
+   - fitness: $150 gym membership, fitness tracker + gear, sports tickets
+   - travel: $200 travel voucher, premium luggage, hotel gift card
+   - computers: Wireless headphones, smart watch, tech accessories bundle
+   - apparel: $150 clothing allowance, designer accessories
+   - none: $150 gift card, cash bonus
+
+2. Training: [Pick one based on the segment's tenure]
+   New: Sales fundamentals, 1-1 coaching | Mid: Product certification, leadership workshop | Vet: Executive masterclass
+
+3. Recognition: [Pick one based on segment]
+   New: New agent spotlight | Mid: Regional leaderboard, peer network | Vet: Advisory board invite, achievement award
+
+Keep it concise. One line per tactic.
+""")
+
+# per_segment: one LLM call per segment; batched: one structured call for all segments
+STRATEGY_MODES = ("per_segment", "batched")
 
 
 class CampaignStrategistAgent(BaseAgent):
@@ -33,16 +68,16 @@ class CampaignStrategistAgent(BaseAgent):
         
         self.settings = settings
         
-        # Get LLM provider configuration
-        llm_provider_name = agent_config.get('provider', settings.llm_default_provider)
-        llm_config = settings.get_llm_config(llm_provider_name)
-        
-        # Override temperature if specified in agent config
-        if 'temperature' in agent_config:
-            llm_config['temperature'] = agent_config['temperature']
-        
-        # Initialize LLM provider
-        self.llm = ClaudeProvider(llm_config)
+        # Shared LLM provider (pooled client, agent temperature/cache overrides)
+        self.llm = get_agent_llm_provider(agent_config, self.name)
+
+        # Maximum number of per-segment LLM calls in flight at once
+        self.strategy_concurrency = max(1, agent_config.get('strategy_concurrency', 4))
+
+        # How segment narratives are requested from the LLM
+        self.strategy_mode = agent_config.get('strategy_mode', 'per_segment')
+        if self.strategy_mode not in STRATEGY_MODES:
+            raise ValueError(f"Invalid strategy_mode: {self.strategy_mode}. Must be one of {STRATEGY_MODES}")
         
     def process(self, message: Message) -> Dict[str, Any]:
         """
@@ -59,6 +94,7 @@ class CampaignStrategistAgent(BaseAgent):
             profiles = message.content.get('profiles', {})
             goal = message.content.get('goal', '')
             criteria = message.content.get('criteria', {})
+            stream_callback = message.content.get('stream_callback')
             
             if not profiles.get('success'):
                 raise ValueError("No valid profile analysis provided")
@@ -75,7 +111,7 @@ class CampaignStrategistAgent(BaseAgent):
             if segments_breakdown:
                 # Generate strategy per segment
                 return self._generate_per_segment_strategies(
-                    goal, criteria, segment_summary, segments_breakdown
+                    goal, criteria, segment_summary, segments_breakdown, stream_callback
                 )
             else:
                 # Fallback: Generate single unified strategy (original behavior)
@@ -466,11 +502,12 @@ class CampaignStrategistAgent(BaseAgent):
         
         try:
             strategy = self.llm.query(
-                prompt=prompt,
+                prompt=compact_prompt(prompt),
                 system="You are a senior insurance marketing strategist with expertise in agent relationship management and campaign optimization."
             )
             return strategy
         except Exception as e:
+            record_llm_fallback(self.name, e)
             return f"Strategic campaign approach focusing on {strategy_context['objective']} for {strategy_context['segment_size']} high-value agents using {strategy_context['messaging_theme']} messaging delivered via {strategy_context['primary_channel']} over {strategy_context['timeline']} period."
     
     def _generate_implementation_plan(self, messaging_strategy: Dict[str, Any], 
@@ -647,7 +684,8 @@ class CampaignStrategistAgent(BaseAgent):
         goal: str,
         criteria: Dict[str, Any],
         segment_summary: Dict[str, Any],
-        segments_breakdown: Dict[str, Any]
+        segments_breakdown: Dict[str, Any],
+        stream_callback: Optional[Callable[..., None]] = None
     ) -> Dict[str, Any]:
         """
         Generate separate campaign strategy for each customer segment.
@@ -657,16 +695,33 @@ class CampaignStrategistAgent(BaseAgent):
             criteria: Parsed criteria
             segment_summary: Overall segment summary
             segments_breakdown: Per-segment breakdowns from ProfileGenerator
+            stream_callback: Optional (key, chunk) callback receiving narratives as they stream
 
         Returns:
             Campaign strategies per segment
         """
         segment_strategies = {}
+        token_usage = {
+            "mode": self.strategy_mode,
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "split_segments": []
+        }
+
+        # LLM narratives for all segments (batched or concurrent per-segment calls)
+        narratives = run_sync(
+            self._agenerate_segment_narratives(
+                segments_breakdown, goal, criteria, token_usage, stream_callback
+            )
+        )
 
+        # Assemble in segment order
         for segment_name, segment_data in segments_breakdown.items():
             # Generate strategy for this segment
             strategy = self._generate_single_segment_strategy(
-                segment_name, segment_data, goal, criteria
+                segment_name, segment_data, goal, criteria,
+                strategy_narrative=narratives.get(segment_name)
             )
             segment_strategies[segment_name] = strategy
 
@@ -675,15 +730,130 @@ class CampaignStrategistAgent(BaseAgent):
             "objective": criteria.get('objective', 'unknown'),
             "total_agents": segment_summary.get('total_agents', 0),
             "segment_strategies": segment_strategies,
+            "token_usage": token_usage,
             "confidence_score": self._calculate_overall_confidence(segments_breakdown)
         }
 
+    async def _agenerate_segment_narratives(
+        self,
+        segments_breakdown: Dict[str, Any],
+        goal: str,
+        criteria: Dict[str, Any],
+        token_usage: Optional[Dict[str, Any]] = None,
+        stream_callback: Optional[Callable[..., None]] = None
+    ) -> Dict[str, str]:
+        """
+        Generate LLM strategy narratives for all segments.
+
+        In batched mode one structured call covers every segment; segments
+        missing from a malformed or truncated batch response are split into
+        per-segment calls. Per-segment calls run concurrently with at most
+        strategy_concurrency in flight, and a failed segment falls back to its
+        template narrative without affecting the others.
+
+        Args:
+            segments_breakdown: Per-segment breakdowns from ProfileGenerator
+            goal: Campaign goal
+            criteria: Campaign criteria
+            token_usage: Optional accumulator for LLM call and token counts
+            stream_callback: Optional (key, chunk) callback; per-segment narratives
+                stream under 'strategy:<segment>', batched ones arrive whole
+
+        Returns:
+            Segment name -> strategy narrative, in segment order
+        """
+        segment_names = list(segments_breakdown)
+        narratives = {}
+
+        if self.strategy_mode == 'batched' and len(segment_names) > 1:
+            narratives = await self._agenerate_batched_narratives(
+                segments_breakdown, criteria, token_usage
+            )
+            if token_usage is not None:
+                token_usage["split_segments"] = [name for name in segment_names if name not in narratives]
+            if stream_callback is not None:
+                for segment_name, narrative in narratives.items():
+                    stream_callback(f"strategy:{segment_name}", narrative)
+
+        semaphore = asyncio.Semaphore(self.strategy_concurrency)
+
+        async def generate(segment_name: str, segment_data: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self._agenerate_segment_llm_strategy(
+                    segment_name, segment_data, goal, criteria, token_usage, stream_callback
+                )
+
+        remaining = [name for name in segment_names if name not in narratives]
+        results = await asyncio.gather(*(
+            generate(segment_name, segments_breakdown[segment_name])
+            for segment_name in remaining
+        ))
+        narratives.update(zip(remaining, results))
+
+        return {name: narratives[name] for name in segment_names}
+
+    async def _agenerate_batched_narratives(
+        self,
+        segments_breakdown: Dict[str, Any],
+        criteria: Dict[str, Any],
+        token_usage: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        Request narratives for every segment in one structured JSON call.
+
+        Args:
+            segments_breakdown: Per-segment breakdowns from ProfileGenerator
+            criteria: Campaign criteria
+            token_usage: Optional accumulator for LLM call and token counts
+
+        Returns:
+            Segment name -> narrative for the segments present in a valid
+            response (empty if the call or parsing failed)
+        """
+        prompt = self._build_batched_strategy_prompt(segments_breakdown, criteria)
+
+        try:
+            response = await self.llm.aquery_json(
+                prompt=prompt,
+                system=SEGMENT_STRATEGY_SYSTEM_PROMPT
+            )
+        except Exception as e:
+            print(f"⚠️  Batched strategy call failed, splitting per segment: {e}")
+            record_llm_fallback(self.name)
+            self._record_token_usage(token_usage, prompt, None)
+            return {}
+
+        self._record_token_usage(token_usage, prompt, response)
+
+        if not isinstance(response, dict):
+            return {}
+
+        # Keep only complete narratives for known segments
+        return {
+            name: response[name].strip()
+            for name in segments_breakdown
+            if isinstance(response.get(name), str) and response[name].strip()
+        }
+
+    def _record_token_usage(self, token_usage: Optional[Dict[str, Any]], prompt: str, response: Any) -> None:
+        """Add an LLM call's estimated prompt and completion tokens to the accumulator."""
+        if token_usage is None:
+            return
+
+        if isinstance(response, dict):
+            response = json.dumps(response)
+
+        token_usage["llm_calls"] += 1
+        token_usage["prompt_tokens"] += estimate_tokens(SEGMENT_STRATEGY_SYSTEM_PROMPT) + estimate_tokens(prompt)
+        token_usage["completion_tokens"] += estimate_tokens(response)
+
     def _generate_single_segment_strategy(
         self,
         segment_name: str,
         segment_data: Dict[str, Any],
         goal: str,
-        criteria: Dict[str, Any]
+        criteria: Dict[str, Any],
+        strategy_narrative: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate campaign strategy for a single customer segment.
@@ -693,7 +863,7 @@ class CampaignStrategistAgent(BaseAgent):
             segment_data: Segment-specific data and statistics
             goal: Campaign goal
             criteria: Parsed criteria
-            overall_summary: Overall campaign summary
+            strategy_narrative: Pre-generated LLM narrative (generated here if None)
 
         Returns:
             Strategy for this segment
@@ -708,9 +878,11 @@ class CampaignStrategistAgent(BaseAgent):
         budget = self._generate_segment_budget(agent_count, stats)
 
         # Generate LLM-powered strategy for this segment
-        segment_strategy = self._generate_segment_llm_strategy(
-            segment_name, segment_data, goal, criteria
-        )
+        segment_strategy = strategy_narrative
+        if segment_strategy is None:
+            segment_strategy = self._generate_segment_llm_strategy(
+                segment_name, segment_data, goal, criteria
+            )
 
         return {
             "segment_name": segment_name,
@@ -742,8 +914,90 @@ class CampaignStrategistAgent(BaseAgent):
         Returns:
             Strategy narrative string
         """
+        prompt = self._build_segment_strategy_prompt(segment_name, segment_data, criteria)
+
+        try:
+            strategy = self.llm.query(
+                prompt=prompt,
+                system=SEGMENT_STRATEGY_SYSTEM_PROMPT
+            )
+            return strategy
+        except Exception as e:
+            record_llm_fallback(self.name, e)
+            return self._segment_template_strategy(segment_name, segment_data, criteria)
+
+    async def _agenerate_segment_llm_strategy(
+        self,
+        segment_name: str,
+        segment_data: Dict[str, Any],
+        goal: str,
+        criteria: Dict[str, Any],
+        token_usage: Optional[Dict[str, Any]] = None,
+        stream_callback: Optional[Callable[..., None]] = None
+    ) -> str:
+        """
+        Async variant of _generate_segment_llm_strategy.
+
+        Args:
+            segment_name: Customer segment name
+            segment_data: Segment statistics and insights
+            goal: Campaign goal
+            criteria: Campaign criteria
+            token_usage: Optional accumulator for LLM call and token counts
+            stream_callback: Optional (key, chunk) callback receiving the narrative as it streams
+                (called with replace=True for the template narrative after a failure)
+
+        Returns:
+            Strategy narrative string
+        """
+        prompt = self._build_segment_strategy_prompt(segment_name, segment_data, criteria)
+
+        try:
+            if stream_callback is None:
+                strategy = await self.llm.aquery(
+                    prompt=prompt,
+                    system=SEGMENT_STRATEGY_SYSTEM_PROMPT
+                )
+            else:
+                chunks = []
+                async for chunk in self.llm.astream(prompt=prompt, system=SEGMENT_STRATEGY_SYSTEM_PROMPT):
+                    chunks.append(chunk)
+                    stream_callback(f"strategy:{segment_name}", chunk)
+                strategy = "".join(chunks)
+            self._record_token_usage(token_usage, prompt, strategy)
+            return strategy
+        except Exception as e:
+            record_llm_fallback(self.name, e)
+            self._record_token_usage(token_usage, prompt, None)
+            strategy = self._segment_template_strategy(segment_name, segment_data, criteria)
+            if stream_callback is not None:
+                # Supersede whatever streamed before the failure
+                stream_callback(f"strategy:{segment_name}", strategy, replace=True)
+            return strategy
+
+    def _segment_template_strategy(
+        self,
+        segment_name: str,
+        segment_data: Dict[str, Any],
+        criteria: Dict[str, Any]
+    ) -> str:
+        """Template narrative used when the LLM call for a segment fails."""
+        stats = segment_data['statistics']
+        agent_count = segment_data['agent_count']
+        return f"Strategy for {segment_name}: {agent_count} agents with avg AUM ${stats.get('aum', {}).get('mean', 0):,.0f}. Focus on segment-specific needs and {criteria.get('objective', 'engagement')}."
+
+    def _segment_prompt_context(self, segment_name: str, segment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the segment-specific values used in strategy prompts.
+
+        Args:
+            segment_name: Customer segment name
+            segment_data: Segment statistics and insights
+
+        Returns:
+            Dictionary with tagline, data line, interest and tenure
+        """
         stats = segment_data['statistics']
-        insights = segment_data['insights']
         agent_count = segment_data['agent_count']
 
         # Build segment characteristics description
@@ -780,44 +1034,92 @@ class CampaignStrategistAgent(BaseAgent):
         avg_tenure = stats.get('tenure', {}).get('mean', 0)
         avg_policies = stats.get('sales_performance', {}).get('mean', 0)
 
+        return {
+            "tagline": segment_tagline,
+            "dominant_habit": dominant_habit,
+            "habits_text": habits_text,
+            "avg_tenure": avg_tenure,
+            "data": (
+                f"{agent_count} agents | AUM: ${stats.get('aum', {}).get('mean', 0):,.0f} | "
+                f"NPS: {stats.get('nps', {}).get('mean', 0):.1f} | Tenure: {avg_tenure:.1f}y | "
+                f"Sales: {avg_policies:.1f}"
+            )
+        }
+
+    def _build_segment_strategy_prompt(
+        self,
+        segment_name: str,
+        segment_data: Dict[str, Any],
+        criteria: Dict[str, Any]
+    ) -> str:
+        """
+        Build the strategy prompt for a specific segment.
+
+        Args:
+            segment_name: Customer segment name
+            segment_data: Segment statistics and insights
+            criteria: Campaign criteria
+
+        Returns:
+            Prompt string
+        """
+        context = self._segment_prompt_context(segment_name, segment_data)
+        dominant_habit = context['dominant_habit']
+
         prompt = f"""
-        Brief campaign strategy for "{segment_name}" ({segment_tagline}).
+        Brief campaign strategy for "{segment_name}" ({context['tagline']}).
 
-        DATA: {agent_count} agents | AUM: ${stats.get('aum', {}).get('mean', 0):,.0f} | NPS: {stats.get('nps', {}).get('mean', 0):.1f} | Tenure: {avg_tenure:.1f}y | Sales: {avg_policies:.1f}
-        INTEREST: {habits_text}
+        DATA: {context['data']}
+        INTEREST: {context['habits_text']}
         GOAL: {criteria.get('objective', 'unknown')}
 
-        **Profile Summary**
-        [1 sentence mentioning their {dominant_habit if dominant_habit else 'interest'} preference + key challenge/opportunity]
+        Mention their {dominant_habit if dominant_habit else 'interest'} preference in the Profile Summary
+        and pick Training for a tenure of {context['avg_tenure']:.1f}y.
+        """
+
+        return compact_prompt(prompt)
+
+    def _build_batched_strategy_prompt(
+        self,
+        segments_breakdown: Dict[str, Any],
+        criteria: Dict[str, Any]
+    ) -> str:
+        """
+        Build one strategy prompt covering every segment.
+
+        The goal is sent once and the tactic guidance lives in the shared
+        system prompt; each segment contributes only its data line.
+
+        Args:
+            segments_breakdown: Per-segment breakdowns from ProfileGenerator
+            criteria: Campaign criteria
+
+        Returns:
+            Prompt string
+        """
+        segment_lines = []
+        for segment_name, segment_data in segments_breakdown.items():
+            context = self._segment_prompt_context(segment_name, segment_data)
+            segment_lines.append(
+                f"- \"{segment_name}\" ({context['tagline']}) | DATA: {context['data']} | INTEREST: {context['habits_text']}"
+            )
+        segments_text = "\n        ".join(segment_lines)
 
-        **Engagement Tactics**
+        prompt = f"""
+        Brief campaign strategies for {len(segment_lines)} agent segments.
 
-        1. Performance Incentive: [Milestone] → [Reward $100-200]
-           Milestones: New agents (<2y): "2 policies in 60 days" | Mid (2-5y): "5 policies in Q4" | Vets (5+y): "$500K AUM"
-           Rewards by interest:
-           - fitness: $150 gym membership, fitness tracker + gear, sports tickets
-           - travel: $200 travel voucher, premium luggage, hotel gift card
-           - computers: Wireless headphones, smart watch, tech accessories bundle
-           - apparel: $150 clothing allowance, designer accessories
-           - none: $150 gift card, cash bonus
+        GOAL: {criteria.get('objective', 'unknown')}
 
-        2. Training: [Pick one based on tenure {avg_tenure:.1f}y]
-           New: Sales fundamentals, 1-1 coaching | Mid: Product certification, leadership workshop | Vet: Executive masterclass
+        SEGMENTS:
+        {segments_text}
 
-        3. Recognition: [Pick one based on segment]
-           New: New agent spotlight | Mid: Regional leaderboard, peer network | Vet: Advisory board invite, achievement award
+        Write a strategy in the segment strategy format for EACH segment.
 
-        Keep it concise. One line per tactic.
+        Return a JSON object whose keys are exactly the segment names above (without the quotes)
+        and whose values are the strategy text for that segment as a single markdown string.
         """
 
-        try:
-            strategy = self.llm.query(
-                prompt=prompt,
-                system="You are an expert insurance marketing strategist specializing in agent segmentation and personalized campaign strategies."
-            )
-            return strategy
-        except Exception as e:
-            return f"Strategy for {segment_name}: {agent_count} agents with avg AUM ${stats.get('aum', {}).get('mean', 0):,.0f}. Focus on segment-specific needs and {criteria.get('objective', 'engagement')}."
+        return compact_prompt(prompt)
 
     def _generate_segment_messaging(self, segment_name: str, stats: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
         """Generate messaging strategy for specific segment."""
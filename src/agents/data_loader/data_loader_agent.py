@@ -1,11 +1,14 @@
 """Data Loader Agent - Loads insurance agent population data from various sources."""
 
+import threading
+import time
 import pandas as pd
 from typing import Dict, Any, List
 from pathlib import Path
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
+from src.core.stats import compute_dataset_version, get_population_baseline, DATASET_VERSION_ATTR
 from src.connectors.factory import create_connector
 
 
@@ -22,6 +25,10 @@ class DataLoaderAgent(BaseAgent):
     policy data, survey data) are now unified in the single Agent Persona.csv file.
     """
 
+    # Process-wide dataset cache shared by every DataLoaderAgent instance
+    _shared_cache: Dict[str, Dict[str, Any]] = {}
+    _shared_cache_lock = threading.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize data loader agent.
@@ -40,6 +47,10 @@ class DataLoaderAgent(BaseAgent):
         connector_type = settings.data_connector
         connector_config = settings.get_connector_config(connector_type)
         self.connector = create_connector(connector_type, connector_config)
+
+        # Dataset caching (agent config wins over connector config)
+        self.cache_enabled = agent_config.get('cache_enabled', True)
+        self.cache_ttl = agent_config.get('cache_ttl', connector_config.get('cache_ttl', 3600))
         
     def process(self, message: Message) -> Dict[str, Any]:
         """
@@ -52,8 +63,9 @@ class DataLoaderAgent(BaseAgent):
             Dictionary with loaded data and metadata
         """
         try:
-            # Load unified agent persona data (now contains all previously separate data)
-            agent_data = self._load_agent_persona_data()
+            # Load unified agent persona data (now contains all previously separate data);
+            # only metadata is read here, so the shared frame is not copied
+            agent_data = self._get_shared_agent_persona_data()
             
             # Clean sample data for JSON serialization
             sample_data = []
@@ -66,6 +78,7 @@ class DataLoaderAgent(BaseAgent):
                 "agent_data": "Unified dataset loaded successfully",
                 "metadata": {
                     "total_agents": len(agent_data),
+                    "dataset_version": agent_data.attrs.get(DATASET_VERSION_ATTR),
                     "data_sources_loaded": ['agent_persona_unified'],
                     "columns": list(agent_data.columns) if isinstance(agent_data, pd.DataFrame) else [],
                     "sample_data": sample_data,
@@ -80,10 +93,46 @@ class DataLoaderAgent(BaseAgent):
                 "agent_data": None
             }
     
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Load the dataset and its population baseline into the shared caches.
+
+        Run speculatively while the goal is still being parsed, so that the
+        data and segmentation steps find both ready.
+
+        Returns:
+            Dictionary with row count, dataset version and load time
+        """
+        start = time.perf_counter()
+        df = self._get_shared_agent_persona_data()
+        baseline = get_population_baseline(df)
+        return {
+            "total_agents": len(df),
+            "dataset_version": baseline.dataset_version,
+            "warm_up_time": round(time.perf_counter() - start, 3)
+        }
+
     def _load_agent_persona_data(self) -> pd.DataFrame:
         """
         Load the unified agent persona data from database or CSV file.
 
+        Returns a private copy of the shared dataset (see
+        _get_shared_agent_persona_data), so callers may modify it freely.
+
+        Returns:
+            DataFrame with complete unified agent data
+        """
+        df = self._get_shared_agent_persona_data().copy()
+
+        # Cache the data
+        self.data_cache['agent_persona'] = df
+        
+        return df
+
+    def _get_shared_agent_persona_data(self) -> pd.DataFrame:
+        """
+        Get the unified agent persona data shared by every campaign.
+
         This data includes all previously separate data sources:
         - Agent persona information
         - Complaints data
@@ -92,29 +141,58 @@ class DataLoaderAgent(BaseAgent):
         - Policy data
         - Survey data
 
+        The loaded DataFrame is shared process-wide until the cache TTL expires
+        and is stamped with a dataset version (``df.attrs['dataset_version']``)
+        so that population aggregates can be reused across campaigns.
+
+        The frame is shared by reference and must be treated as read-only:
+        an in-place change would leak into other campaigns and invalidate
+        its dataset version. Use _load_agent_persona_data for a private copy.
+
         Returns:
-            DataFrame with complete unified agent data
+            Shared DataFrame with complete unified agent data
+        """
+        cache_key = 'agent_persona'
+
+        # Hold the lock while loading so concurrent campaigns share one load
+        with self._shared_cache_lock:
+            entry = self._shared_cache.get(cache_key)
+            if (self.cache_enabled and entry is not None
+                    and time.monotonic() - entry['loaded_at'] < self.cache_ttl):
+                df = entry['data']
+            else:
+                df = self._read_agent_persona_source()
+                df.attrs[DATASET_VERSION_ATTR] = compute_dataset_version(df)
+                if self.cache_enabled:
+                    self._shared_cache[cache_key] = {
+                        "data": df,
+                        "loaded_at": time.monotonic()
+                    }
+
+        return df
+
+    def _read_agent_persona_source(self) -> pd.DataFrame:
+        """
+        Read the agent persona data from the configured connector.
+
+        Returns:
+            Freshly loaded DataFrame
         """
         # Check if we're using PostgreSQL connector
         if hasattr(self.connector, 'get_agents'):
             # Load from database
-            df = self.connector.get_agents()
-        else:
-            # Fallback to CSV file
-            data_sources = self.settings.data_sources
-            agent_filename = data_sources.get('agent_persona', 'Agent_persona.csv')
-            
-            # Check if file exists
-            if not self.connector.file_exists(agent_filename):
-                raise FileNotFoundError(f"Agent persona file not found: {agent_filename}")
-            
-            # Load CSV using connector
-            df = self.connector.read_csv(agent_filename)
+            return self.connector.get_agents()
+
+        # Fallback to CSV file
+        data_sources = self.settings.data_sources
+        agent_filename = data_sources.get('agent_persona', 'Agent_persona.csv')
         
-        # Cache the data
-        self.data_cache['agent_persona'] = df
+        # Check if file exists
+        if not self.connector.file_exists(agent_filename):
+            raise FileNotFoundError(f"Agent persona file not found: {agent_filename}")
         
-        return df
+        # Load CSV using connector
+        return self.connector.read_csv(agent_filename)
     
     
     def get_data_summary(self) -> Dict[str, Any]:
@@ -1,5 +1,7 @@
 """Goal parser agent for extracting structured criteria from natural language."""
 
 from .goal_parser_agent import GoalParserAgent
+from .goal_cache import GoalCache, get_goal_cache
+from .rule_parser import RuleBasedGoalParser
 
-__all__ = ["GoalParserAgent"]
+__all__ = ["GoalParserAgent", "GoalCache", "get_goal_cache", "RuleBasedGoalParser"]
@@ -0,0 +1,276 @@
+"""Near-duplicate goal → criteria cache using a MinHash LSH index."""
+
+import copy
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.core.config import get_settings
+
+from .rule_parser import FIELD_WORDS, FILLER_WORDS, PERCENTILE_THRESHOLDS, RuleBasedGoalParser
+
+# Mersenne prime modulus for the MinHash permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+# Words that flip or scope a constraint; goals differing in them are never reused
+NEGATION_WORDS = {"not", "no", "non", "without", "except", "excluding", "exclude", "never", "only"}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_goal(goal: str) -> Tuple[str, ...]:
+    """
+    Reduce a goal to its meaningful lowercase tokens, in order.
+
+    Order is kept: "NPS above 8 and tenure below 2" and "NPS below 8 and
+    tenure above 2" have the same tokens but opposite constraints.
+
+    Args:
+        goal: Natural language campaign goal
+
+    Returns:
+        Tokens without filler words (articles, "find", "agents", quarters, ...)
+    """
+    return tuple(token for token in _TOKEN_PATTERN.findall(goal.lower()) if token not in FILLER_WORDS)
+
+
+def _token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class GoalCache:
+    """
+    Goal → criteria cache that also matches lightly edited goals.
+
+    Exact hits require the same meaningful tokens in the same order. Other
+    goals are indexed by MinHash signatures split into LSH bands; a lookup
+    checks only the goals sharing a band, then confirms with exact token
+    Jaccard similarity. A near-duplicate is reused only if the tokens that
+    differ carry no constraint meaning (no numbers, field names or
+    negations), the tokens both goals share appear in the same order, and
+    the rule parser reads both goals the same way.
+
+    Cached criteria hold absolute percentile values, so entries belong to
+    one dataset version: a lookup or store under a new version empties the
+    cache first.
+    """
+
+    def __init__(self, max_entries: int = 1000, similarity_threshold: float = 0.8,
+                 num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """
+        Initialize goal cache.
+
+        Args:
+            max_entries: Maximum number of goals kept (least recently used evicted)
+            similarity_threshold: Minimum token Jaccard similarity for reuse
+            num_perm: MinHash permutations per signature
+            bands: LSH bands (num_perm must be divisible by bands)
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        # Only compares goals, so percentile phrases get placeholder thresholds
+        self._rule_parser = RuleBasedGoalParser(lambda: {name: name for name in PERCENTILE_THRESHOLDS})
+        # Ordered tokens -> (goal, criteria, token set, band keys)
+        self._entries: 'OrderedDict[Tuple[str, ...], Tuple[str, Dict[str, Any], FrozenSet[str], List[Tuple[int, bytes]]]]' = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self._dataset_version: Optional[str] = None
+        self._stats = {"lookups": 0, "exact_hits": 0, "near_hits": 0, "rejected": 0}
+
+    def _signature(self, tokens: FrozenSet[str]) -> np.ndarray:
+        """MinHash signature of a token set."""
+        hashes = np.fromiter((_token_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens))
+        if hashes.size == 0:
+            hashes = np.zeros(1, dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, tokens: FrozenSet[str]) -> List[Tuple[int, bytes]]:
+        """LSH bucket keys (band index, band bytes) for a token set."""
+        signature = self._signature(tokens)
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _same_meaning(self, goal: str, tokens: Tuple[str, ...], cached_goal: str,
+                      cached_tokens: Tuple[str, ...]) -> bool:
+        """Whether the differing tokens leave the constraints unchanged."""
+        token_set = set(tokens)
+        cached_set = set(cached_tokens)
+        for token in token_set ^ cached_set:
+            if token.isdigit() or any(ch.isdigit() for ch in token):
+                return False
+            if token in FIELD_WORDS or token in NEGATION_WORDS:
+                return False
+
+        # Reordered words can swap which value belongs to which field
+        shared = token_set & cached_set
+        reordered = ([token for token in tokens if token in shared]
+                     != [token for token in cached_tokens if token in shared])
+
+        parsed, _ = self._rule_parser.parse(goal)
+        cached_parsed, _ = self._rule_parser.parse(cached_goal)
+        if reordered and parsed is None:
+            # Nothing confirms the reordering is harmless
+            return False
+        return parsed == cached_parsed
+
+    def get(self, goal: str, dataset_version: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find cached criteria for a goal or a near-duplicate of it.
+
+        Args:
+            goal: Natural language campaign goal
+            dataset_version: Version of the population the criteria are for
+
+        Returns:
+            Tuple of (criteria copy, similarity), or None on a miss
+        """
+        tokens = normalize_goal(goal)
+        token_set = frozenset(tokens)
+        band_keys = self._band_keys(token_set)
+
+        with self._lock:
+            self._check_version(dataset_version)
+            self._stats["lookups"] += 1
+
+            entry = self._entries.get(tokens)
+            if entry is not None:
+                self._entries.move_to_end(tokens)
+                self._stats["exact_hits"] += 1
+                return copy.deepcopy(entry[1]), 1.0
+
+            candidates: Set[Tuple[str, ...]] = set()
+            for key in band_keys:
+                candidates.update(self._buckets.get(key, ()))
+
+            best: Optional[Tuple[str, ...]] = None
+            best_similarity = 0.0
+            for candidate in candidates:
+                candidate_set = self._entries[candidate][2]
+                union = len(token_set | candidate_set)
+                similarity = len(token_set & candidate_set) / union if union else 1.0
+                if similarity > best_similarity:
+                    best, best_similarity = candidate, similarity
+
+            if best is None or best_similarity < self.similarity_threshold:
+                return None
+
+            cached_goal, criteria, _, _ = self._entries[best]
+
+        if not self._same_meaning(goal, tokens, cached_goal, best):
+            with self._lock:
+                self._stats["rejected"] += 1
+            return None
+
+        with self._lock:
+            if best in self._entries:
+                self._entries.move_to_end(best)
+            self._stats["near_hits"] += 1
+        return copy.deepcopy(criteria), round(best_similarity, 3)
+
+    def set(self, goal: str, criteria: Dict[str, Any], dataset_version: Optional[str] = None) -> None:
+        """
+        Store criteria parsed for a goal.
+
+        Args:
+            goal: Natural language campaign goal
+            criteria: Parsed criteria
+            dataset_version: Version of the population the criteria were parsed against
+        """
+        tokens = normalize_goal(goal)
+        token_set = frozenset(tokens)
+        band_keys = self._band_keys(token_set)
+
+        with self._lock:
+            self._check_version(dataset_version)
+            if tokens in self._entries:
+                self._remove(tokens)
+            self._entries[tokens] = (goal, copy.deepcopy(criteria), token_set, band_keys)
+            for key in band_keys:
+                self._buckets.setdefault(key, set()).add(tokens)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _check_version(self, dataset_version: Optional[str]) -> None:
+        """Empty the cache when the dataset version changes (lock held)."""
+        if dataset_version is None or dataset_version == self._dataset_version:
+            return
+        if self._entries:
+            print(f"🔄 Dataset version changed ({self._dataset_version} -> {dataset_version}), "
+                  f"dropping {len(self._entries)} cached goals")
+        self._entries.clear()
+        self._buckets.clear()
+        self._dataset_version = dataset_version
+
+    def _remove(self, tokens: Tuple[str, ...]) -> None:
+        """Drop an entry and its bucket memberships (lock held)."""
+        _, _, _, band_keys = self._entries.pop(tokens)
+        for key in band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(tokens)
+                if not bucket:
+                    del self._buckets[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, lookups, exact/near hits, rejected
+            near-duplicates and hit rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        hits = stats["exact_hits"] + stats["near_hits"]
+        stats["hit_rate"] = round(hits / stats["lookups"], 3) if stats["lookups"] else 0.0
+        return stats
+
+
+_goal_cache: Optional[GoalCache] = None
+_goal_cache_lock = threading.Lock()
+
+
+def get_goal_cache() -> Optional[GoalCache]:
+    """
+    Get the process-wide goal cache configured under agents.goal_parser.goal_cache.
+
+    Returns:
+        GoalCache instance, or None if disabled
+    """
+    global _goal_cache
+
+    settings = get_settings()
+    config = settings.get('agents.goal_parser.goal_cache') or {}
+    if not config.get('enabled', True):
+        return None
+
+    with _goal_cache_lock:
+        if _goal_cache is None:
+            _goal_cache = GoalCache(
+                max_entries=config.get('max_entries', 1000),
+                similarity_threshold=config.get('similarity_threshold', 0.8),
+                num_perm=config.get('num_perm', 64),
+                bands=config.get('bands', 16)
+            )
+        return _goal_cache
@@ -1,10 +1,68 @@
 """Goal Parser Agent - Extracts structured criteria from natural language campaign goals."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
-from src.llm import ClaudeProvider
+from src.core.stats import PopulationBaseline, get_population_baseline
+from src.llm import get_agent_llm_provider, compact_prompt
+
+from .goal_cache import get_goal_cache
+from .rule_parser import RuleBasedGoalParser, percentile_thresholds
+
+# How the percentile thresholds are named in the per-call prompt
+PERCENTILE_LABELS = {
+    'high_aum': "AUM 75th percentile",
+    'high_premium': "PREMIUM_AMOUNT 75th percentile",
+    'low_premium': "PREMIUM_AMOUNT 25th percentile",
+}
+
+# Static instructions sent as the (cacheable) system prompt on every call
+GOAL_PARSER_SYSTEM_PROMPT = compact_prompt("""
+You are an expert at analyzing marketing campaign goals and extracting structured criteria for customer segmentation.
+
+Extract the following information from the campaign goal and return it as JSON:
+
+1. **objective**: The campaign type (retention, acquisition, upsell, winback, engagement)
+2. **constraints**: Array of filtering criteria with:
+   - field: The data field to filter on (e.g., AUM_SELFREPORTED, NPS_SCORE, AGENT_TENURE)
+   - operator: Comparison operator (>, >=, <, <=, ==, !=)
+   - value: The threshold value (number or string)
+3. **target_size**: Desired segment size (number or range)
+4. **priority**: Preference for segment quality (quality_over_quantity, balanced, quantity_over_quality)
+
+Available fields for constraints:
+- AUM_SELFREPORTED (numeric): Assets under management
+- NPS_SCORE (numeric 0-10): Net Promoter Score
+- AGENT_TENURE (numeric): Years with company
+- NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS (numeric): Policies sold
+- COMPLAINTS_LAST_12_MONTHS (numeric): Number of complaints
+- PREMIUM_AMOUNT (numeric): Premium amount generated
+- Age (numeric): Agent age
+- Segment (string): Agent segment (Independent Agents, Emerging Experts, etc.)
+
+Guidelines for interpretation:
+- "high-value" or "top performers" → AUM > 75th percentile
+- "good/excellent satisfaction" → NPS_SCORE >= 8
+- "poor satisfaction" or "at-risk" → NPS_SCORE <= 6
+- "active" or "productive" → NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS >= 5
+- "veteran" or "experienced" → AGENT_TENURE >= 10
+- "new" or "recent" → AGENT_TENURE < 2
+- "high premium" or "premium generators" → PREMIUM_AMOUNT > 75th percentile
+- "low premium" or "underperforming" → PREMIUM_AMOUNT < 25th percentile
+- Use the POPULATION PERCENTILES given with the goal as the percentile values
+
+Return ONLY valid JSON with this structure:
+{
+  "objective": "retention|acquisition|upsell|winback|engagement",
+  "constraints": [
+    {"field": "FIELD_NAME", "operator": ">", "value": NUMBER},
+    {"field": "FIELD_NAME", "operator": ">=", "value": NUMBER}
+  ],
+  "target_size": 100,
+  "priority": "quality_over_quantity|balanced|quantity_over_quality"
+}
+""")
 
 
 class GoalParserAgent(BaseAgent):
@@ -27,16 +85,19 @@ class GoalParserAgent(BaseAgent):
         agent_config = settings.get_agent_config('goal_parser')
         super().__init__("GoalParser", agent_config)
 
-        # Get LLM provider configuration
-        llm_provider_name = agent_config.get('provider', settings.llm_default_provider)
-        llm_config = settings.get_llm_config(llm_provider_name)
+        # Shared LLM provider (pooled client, agent temperature/cache overrides)
+        self.llm = get_agent_llm_provider(agent_config, self.name)
+
+        # Local parser for goals in the standard vocabulary (skips the LLM call)
+        self.fast_path_enabled = agent_config.get('fast_path', True)
+        self.fast_path_min_confidence = agent_config.get('fast_path_min_confidence', 0.85)
+        self.rule_parser = RuleBasedGoalParser(self._percentile_thresholds)
 
-        # Override temperature if specified in agent config
-        if 'temperature' in agent_config:
-            llm_config['temperature'] = agent_config['temperature']
+        # Loads the population for percentile thresholds (created on first use)
+        self._data_loader = None
 
-        # Initialize LLM provider
-        self.llm = ClaudeProvider(llm_config)
+        # Criteria of past (and lightly edited) goals
+        self.goal_cache = get_goal_cache()
 
     def process(self, message: Message) -> Dict[str, Any]:
         """
@@ -53,14 +114,38 @@ class GoalParserAgent(BaseAgent):
         if not goal:
             raise ValueError("No goal provided in message")
 
+        # Fast path: goals the rules fully understand need no LLM round trip
+        if self.fast_path_enabled:
+            criteria, confidence = self.rule_parser.parse(goal)
+            if criteria is not None and confidence >= self.fast_path_min_confidence:
+                criteria["parsed_by"] = "rules"
+                criteria["confidence"] = confidence
+                return criteria
+
+        # Reuse criteria parsed for the same or a near-duplicate goal (same population)
+        dataset_version = None
+        if self.goal_cache is not None:
+            baseline = self._population_baseline()
+            dataset_version = baseline.dataset_version if baseline is not None else None
+            cached = self.goal_cache.get(goal, dataset_version)
+            if cached is not None:
+                criteria, similarity = cached
+                criteria["parsed_by"] = "goal_cache"
+                criteria["similarity"] = similarity
+                return criteria
+
         # Create prompt for LLM
         prompt = self._build_prompt(goal)
 
         # Query LLM for structured output
         criteria = self.llm.query_json(
             prompt=prompt,
-            system="You are an expert at analyzing marketing campaign goals and extracting structured criteria for customer segmentation."
+            system=GOAL_PARSER_SYSTEM_PROMPT
         )
+        if isinstance(criteria, dict):
+            if self.goal_cache is not None:
+                self.goal_cache.set(goal, criteria, dataset_version)
+            criteria["parsed_by"] = "llm"
 
         return criteria
 
@@ -68,56 +153,49 @@ class GoalParserAgent(BaseAgent):
         """
         Build prompt for LLM to extract structured criteria.
 
+        The field catalog, guidelines and output schema live in the static
+        system prompt, so only the goal is sent per call.
+
         Args:
             goal: Natural language campaign goal
 
         Returns:
             Formatted prompt
         """
-        prompt = f"""
-Analyze this campaign goal and extract structured segmentation criteria:
+        prompt = f'Extract the segmentation criteria for this campaign goal.\n\nGOAL: "{goal}"'
 
-GOAL: "{goal}"
-
-Extract the following information and return as JSON:
-
-1. **objective**: The campaign type (retention, acquisition, upsell, winback, engagement)
-2. **constraints**: Array of filtering criteria with:
-   - field: The data field to filter on (e.g., AUM_SELFREPORTED, NPS_SCORE, AGENT_TENURE)
-   - operator: Comparison operator (>, >=, <, <=, ==, !=)
-   - value: The threshold value (number or string)
-3. **target_size**: Desired segment size (number or range)
-4. **priority**: Preference for segment quality (quality_over_quantity, balanced, quantity_over_quality)
+        # Same percentile values the rule parser uses, so both parsers agree
+        thresholds = self._percentile_thresholds()
+        if thresholds:
+            values = "; ".join(f"{PERCENTILE_LABELS[name]} = {value}" for name, value in thresholds.items())
+            prompt += f"\n\nPOPULATION PERCENTILES: {values}"
+        return prompt
 
-Available fields for constraints:
-- AUM_SELFREPORTED (numeric): Assets under management
-- NPS_SCORE (numeric 0-10): Net Promoter Score
-- AGENT_TENURE (numeric): Years with company
-- NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS (numeric): Policies sold
-- COMPLAINTS_LAST_12_MONTHS (numeric): Number of complaints
-- PREMIUM_AMOUNT (numeric): Premium amount generated
-- Age (numeric): Agent age
-- Segment (string): Agent segment (Independent Agents, Emerging Experts, etc.)
+    def _population_baseline(self) -> Optional[PopulationBaseline]:
+        """
+        Get the baseline statistics of the current population.
 
-Guidelines for interpretation:
-- "high-value" or "top performers" → AUM > 75th percentile
-- "good/excellent satisfaction" → NPS_SCORE >= 8
-- "poor satisfaction" or "at-risk" → NPS_SCORE <= 6
-- "active" or "productive" → NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS >= 5
-- "veteran" or "experienced" → AGENT_TENURE >= 10
-- "new" or "recent" → AGENT_TENURE < 2
-- "high premium" or "premium generators" → PREMIUM_AMOUNT > 75th percentile
-- "low premium" or "underperforming" → PREMIUM_AMOUNT < 25th percentile
+        Returns:
+            PopulationBaseline, or None if the population can't be loaded
+        """
+        try:
+            if self._data_loader is None:
+                from src.agents.data_loader import DataLoaderAgent
+                self._data_loader = DataLoaderAgent({})
+            # Read-only use (and shared with the speculative load), so the frame is not copied
+            return get_population_baseline(self._data_loader._get_shared_agent_persona_data())
+        except Exception as e:
+            print(f"⚠️  Population baseline unavailable ({e}), percentile phrases go to the LLM")
+            return None
+
+    def _percentile_thresholds(self) -> Optional[Dict[str, float]]:
+        """
+        Get the percentile thresholds of the current population.
 
-Return ONLY valid JSON with this structure:
-{{
-  "objective": "retention|acquisition|upsell|winback|engagement",
-  "constraints": [
-    {{"field": "FIELD_NAME", "operator": ">", "value": NUMBER}},
-    {{"field": "FIELD_NAME", "operator": ">=", "value": NUMBER}}
-  ],
-  "target_size": 100,
-  "priority": "quality_over_quantity|balanced|quantity_over_quality"
-}}
-"""
-        return prompt
+        Returns:
+            Threshold name -> value, or None if the population can't be loaded
+        """
+        baseline = self._population_baseline()
+        if baseline is None:
+            return None
+        return percentile_thresholds(baseline)
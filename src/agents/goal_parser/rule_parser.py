@@ -0,0 +1,242 @@
+"""Deterministic pattern-based parser for goals using the standard campaign vocabulary."""
+
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+# Percentile-based guideline phrases (see GOAL_PARSER_SYSTEM_PROMPT): threshold name ->
+# (population column, baseline statistic)
+PERCENTILE_THRESHOLDS = {
+    'high_aum': ('aum_selfreported', 'q75'),  # "high-value" → AUM > 75th percentile
+    'high_premium': ('premium_amount', 'q75'),  # "high premium" → PREMIUM_AMOUNT > 75th percentile
+    'low_premium': ('premium_amount', 'q25'),  # "low premium" → PREMIUM_AMOUNT < 25th percentile
+}
+
+# Phrase -> constraint (value is a threshold name or a literal number)
+PHRASE_RULES: List[Tuple[str, str, str, Any]] = [
+    (r"high[- ]value|top[- ]perform(?:ers?|ing)|high[- ]aum", 'AUM_SELFREPORTED', '>', 'high_aum'),
+    (r"(?:good|great|excellent|high|strong)[- ](?:customer )?(?:satisfaction|nps)|satisfied|promoters?",
+     'NPS_SCORE', '>=', 8),
+    (r"(?:poor|low|bad)[- ](?:customer )?(?:satisfaction|nps)|at[- ]risk|dissatisfied|detractors?",
+     'NPS_SCORE', '<=', 6),
+    (r"(?<!in)active|productive", 'NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS', '>=', 5),
+    (r"veterans?|experienced|seasoned", 'AGENT_TENURE', '>=', 10),
+    (r"new(?:ly hired)?(?= agents?\b)|recent(?:ly joined)?|newcomers?", 'AGENT_TENURE', '<', 2),
+    (r"high[- ]premium|premium generators?", 'PREMIUM_AMOUNT', '>', 'high_premium'),
+    (r"low[- ]premium|underperform(?:ing|ers?)", 'PREMIUM_AMOUNT', '<', 'low_premium'),
+]
+
+# Explicit comparisons, e.g. "NPS above 8", "tenure of at least 10 years", "AUM over $2M"
+FIELD_WORDS = {
+    'nps': 'NPS_SCORE',
+    'nps score': 'NPS_SCORE',
+    'tenure': 'AGENT_TENURE',
+    'aum': 'AUM_SELFREPORTED',
+    'assets': 'AUM_SELFREPORTED',
+    'premium': 'PREMIUM_AMOUNT',
+    'premiums': 'PREMIUM_AMOUNT',
+    'age': 'Age',
+    'complaints': 'COMPLAINTS_LAST_12_MONTHS',
+    'policies sold': 'NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS',
+    'policies': 'NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS',
+}
+COMPARATORS = {
+    'above': '>', 'over': '>', 'more than': '>', 'greater than': '>', 'higher than': '>',
+    'at least': '>=', 'minimum of': '>=', 'no less than': '>=',
+    'below': '<', 'under': '<', 'less than': '<', 'lower than': '<', 'fewer than': '<',
+    'at most': '<=', 'maximum of': '<=', 'no more than': '<=',
+}
+NUMBER_SUFFIXES = {'k': 1e3, 'm': 1e6, 'mm': 1e6, 'b': 1e9}
+
+# A negation shortly before a phrase or comparison ("not at-risk", "but not active",
+# "excluding veterans", "non-active"); such goals are left to the LLM
+_NEGATION_PATTERN = re.compile(
+    r"\b(?:not|no|non|never|without|excluding|exclude|except|other than|rather than|"
+    r"isn't|aren't|wasn't|weren't|don't|doesn't)\b(?:\s+[^\s,;.]+){0,3}\s*-?$"
+)
+_NEGATION_WINDOW = 60
+
+OBJECTIVE_RULES = [
+    ('winback', r"win[- ]?back|lapsed|churned|inactive|re-?activat\w*|lost"),
+    ('upsell', r"upsell\w*|up-sell\w*|cross[- ]sell\w*|upgrade\w*"),
+    ('acquisition', r"acqui\w*|recruit\w*|onboard\w*"),
+    ('engagement', r"engag\w*|re-engag\w*|activation"),
+    ('retention', r"retain\w*|retention|loyal\w*|keep"),
+]
+
+PRIORITY_RULES = [
+    ('quality_over_quantity', r"best|elite|vip|premier|top \d+|quality"),
+    ('quantity_over_quality', r"as many|broad\w*|all|widest|maximi[sz]e reach"),
+]
+
+TARGET_SIZE_PATTERN = re.compile(r"\b(?:top|first|best)\s+(\d{1,6})\b|\b(\d{1,6})\s+agents?\b")
+
+# Words that carry no segmentation meaning
+FILLER_WORDS = set("""
+a an the and or of for to in on with who whose that which their our my we i is are be have has
+find identify target targeting select get show list give me us all any some
+agent agents advisor advisors producer producers people group segment segments
+campaign campaigns program outreach initiative push boost drive focus focused
+q1 q2 q3 q4 quarter year month week this next upcoming season holiday annual
+""".split())
+
+_WORD_PATTERN = re.compile(r"[a-z0-9$]+(?:[.,][0-9]+)*[a-z]*")
+
+
+def _compile_alternatives(words: Dict[str, Any]) -> str:
+    """Regex alternation of phrases, longest first so multi-word phrases win."""
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_PHRASE_PATTERNS = [(re.compile(rf"\b(?:{pattern})\b"), field, op, value) for pattern, field, op, value in PHRASE_RULES]
+_OBJECTIVE_PATTERNS = [(objective, re.compile(rf"\b(?:{pattern})\b")) for objective, pattern in OBJECTIVE_RULES]
+_PRIORITY_PATTERNS = [(priority, re.compile(rf"\b(?:{pattern})\b")) for priority, pattern in PRIORITY_RULES]
+_COMPARISON_PATTERN = re.compile(
+    rf"\b(?P<field>{_compile_alternatives(FIELD_WORDS)})\b(?:\s+(?:score|of|is|was|at))*\s+"
+    rf"(?P<op>{_compile_alternatives(COMPARATORS)})\s+\$?(?P<number>\d+(?:[.,]\d+)*)\s*(?P<suffix>mm|k|m|b)?\b"
+    r"(?:\s+(?:years?|yrs?|points?|dollars?))?"
+)
+
+
+class RuleBasedGoalParser:
+    """
+    Local parser for goals phrased in the standard interpretation vocabulary.
+
+    Constraints come from guideline phrases ("high-value", "at-risk", ...)
+    and explicit comparisons ("NPS above 8"). Confidence is the share of the
+    goal's meaningful words the rules explain, so goals with unrecognised
+    qualifiers are left to the LLM, as are negated ones ("not at-risk").
+
+    Percentile phrases use the population's actual percentiles, the same
+    values the LLM is given; without a population baseline they are left to
+    the LLM as well.
+    """
+
+    def __init__(self, percentile_thresholds: Optional[Callable[[], Optional[Dict[str, float]]]] = None):
+        """
+        Initialize rule-based parser.
+
+        Args:
+            percentile_thresholds: Function returning the PERCENTILE_THRESHOLDS
+                values of the current population (see percentile_thresholds),
+                or None if unavailable
+        """
+        self.percentile_thresholds = percentile_thresholds
+
+    def parse(self, goal: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Parse a goal into criteria.
+
+        Args:
+            goal: Natural language campaign goal
+
+        Returns:
+            Tuple of (criteria or None if no constraint was recognised, confidence 0-1)
+        """
+        text = " ".join(goal.lower().replace("’", "'").split())
+        explained: List[Tuple[int, int]] = []
+        constraints: List[Dict[str, Any]] = []
+
+        def add(field: str, operator: str, value: Any, span: Tuple[int, int]) -> None:
+            explained.append(span)
+            constraint = {"field": field, "operator": operator, "value": value}
+            if constraint not in constraints:
+                constraints.append(constraint)
+
+        for match in _COMPARISON_PATTERN.finditer(text):
+            if self._negated(text, match.start()):
+                return None, 0.0
+            value = float(match.group('number').replace(',', ''))
+            value *= NUMBER_SUFFIXES.get(match.group('suffix') or '', 1)
+            add(FIELD_WORDS[match.group('field')], COMPARATORS[match.group('op')],
+                int(value) if value.is_integer() else value, match.span())
+
+        thresholds = None
+        for pattern, field, operator, value in _PHRASE_PATTERNS:
+            for match in pattern.finditer(text):
+                if any(start <= match.start() < end for start, end in explained):
+                    continue
+                if self._negated(text, match.start()):
+                    return None, 0.0
+                if value in PERCENTILE_THRESHOLDS:
+                    if thresholds is None:
+                        thresholds = (self.percentile_thresholds() if self.percentile_thresholds else None) or {}
+                    if value not in thresholds:
+                        return None, 0.0
+                    value = thresholds[value]
+                add(field, operator, value, match.span())
+
+        objective = None
+        for name, pattern in _OBJECTIVE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                if self._negated(text, match.start()):
+                    return None, 0.0
+                objective = objective or name
+                explained.append(match.span())
+
+        priority = "balanced"
+        for name, pattern in _PRIORITY_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                priority = name
+                explained.append(match.span())
+                break
+
+        target_size = 100
+        size_match = TARGET_SIZE_PATTERN.search(text)
+        if size_match:
+            target_size = int(size_match.group(1) or size_match.group(2))
+            explained.append(size_match.span())
+
+        if not constraints:
+            return None, 0.0
+
+        confidence = self._coverage(text, explained)
+        if objective is None:
+            # The LLM would have to infer the campaign type; retention is the common default
+            objective = "retention"
+            confidence *= 0.9
+
+        criteria = {
+            "objective": objective,
+            "constraints": constraints,
+            "target_size": target_size,
+            "priority": priority
+        }
+        return criteria, round(confidence, 3)
+
+    @staticmethod
+    def _negated(text: str, position: int) -> bool:
+        """Whether a negation closely precedes the match starting at position."""
+        return _NEGATION_PATTERN.search(text[max(0, position - _NEGATION_WINDOW):position]) is not None
+
+    @staticmethod
+    def _coverage(text: str, explained: List[Tuple[int, int]]) -> float:
+        """Share of meaningful words that fall inside an explained span."""
+        total = 0
+        covered = 0
+        for match in _WORD_PATTERN.finditer(text):
+            if match.group() in FILLER_WORDS:
+                continue
+            total += 1
+            if any(start <= match.start() < end for start, end in explained):
+                covered += 1
+        return covered / total if total else 1.0
+
+
+def percentile_thresholds(baseline: Any) -> Dict[str, float]:
+    """
+    Values of the percentile-based guideline thresholds in a population baseline.
+
+    Args:
+        baseline: PopulationBaseline of the current dataset
+
+    Returns:
+        Threshold name -> value (thresholds whose column has no data are omitted)
+    """
+    thresholds = {}
+    for name, (column, statistic) in PERCENTILE_THRESHOLDS.items():
+        value = baseline.numeric.get(column, {}).get(statistic)
+        if value is not None:
+            thresholds[name] = int(value) if float(value).is_integer() else round(value, 2)
+    return thresholds
@@ -1,12 +1,24 @@
 """Orchestrator agent that coordinates the campaign creation workflow."""
 
-from typing import Dict, Any, List
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Callable, Optional
 from datetime import datetime
 import pandas as pd
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
-from src.core.planner import CampaignPlanner, PlanStep, CampaignPlan
+from src.core.planner import CampaignPlanner, PlanStep, CampaignPlan, StepStatus, get_artifact_store
+from src.llm import (
+    backoff_delay,
+    is_retryable,
+    llm_call_scope,
+    llm_deadline,
+    pop_step_llm_metrics,
+    remaining_time,
+)
 
 
 class Todo:
@@ -59,9 +71,29 @@ class OrchestratorAgent(BaseAgent):
         agent_config = settings.get_agent_config('orchestrator')
         super().__init__("Orchestrator", agent_config)
 
+        # Campaign deadline (covers every step and LLM retry) and step retries
+        self.timeout = agent_config.get('timeout', 300)
+        self.max_retries = agent_config.get('max_retries', 0)
+
+        # Steps whose dependencies are met run concurrently on a pool shared by all campaigns
+        self.parallel_steps = agent_config.get('parallel_steps', True)
+        self._step_executor = ThreadPoolExecutor(
+            max_workers=agent_config.get('step_workers', 8),
+            thread_name_prefix="plan-step"
+        )
+
+        # Load the dataset and baselines while the goal is being parsed
+        self.speculative_data_load = agent_config.get('speculative_data_load', True)
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-prefetch")
+        self._prefetch: Optional[Future] = None
+        self._prefetch_lock = threading.Lock()
+
         # Get planner singleton
         self.planner = CampaignPlanner.get_instance()
 
+        # Large step outputs are kept in artifact files; the plan holds handles
+        self.artifacts = get_artifact_store()
+
         # Sub-agents
         from src.agents.goal_parser import GoalParserAgent
         from src.agents.data_loader import DataLoaderAgent
@@ -484,37 +516,20 @@ class OrchestratorAgent(BaseAgent):
                 "error": f"No plan found for campaign {campaign_id}"
             }
 
-        try:
-            # Execute each step sequentially
-            for step in campaign_plan.steps:
-                try:
-                    # Update to in_progress
-                    self.planner.update_step_status(
-                        campaign_id,
-                        step.step,
-                        "in_progress"
-                    )
-
-                    # Execute the step
-                    result = self._execute_single_step(step, campaign_plan)
-
-                    # Update to completed with result
-                    self.planner.update_step_status(
-                        campaign_id,
-                        step.step,
-                        "completed",
-                        result=result
-                    )
+        # The data load doesn't depend on the parsed goal; overlap it with step 1
+        if any(step.agent_name == "DataLoader" for step in campaign_plan.steps):
+            self._start_data_prefetch()
 
-                except Exception as step_error:
-                    # Mark step as failed
-                    self.planner.update_step_status(
-                        campaign_id,
-                        step.step,
-                        "failed",
-                        error=str(step_error)
-                    )
-                    raise
+        try:
+            # Execute the steps within the campaign deadline
+            with llm_deadline(self.timeout):
+                if self.parallel_steps:
+                    self._run_plan_graph(campaign_id, campaign_plan)
+                else:
+                    for step in campaign_plan.steps:
+                        # Steps checkpointed before a restart are not run again
+                        if step.status != StepStatus.COMPLETED.value:
+                            self._run_plan_step(campaign_id, step, campaign_plan)
 
             # All steps completed - mark plan as completed
             self.planner.update_plan_status(campaign_id, "completed")
@@ -532,6 +547,169 @@ class OrchestratorAgent(BaseAgent):
                 "plan": self.planner.get_plan_status(campaign_id)
             }
 
+    def _run_plan_graph(self, campaign_id: str, campaign_plan: CampaignPlan) -> None:
+        """
+        Execute plan steps as a dependency graph.
+
+        A step is submitted to the shared step pool as soon as every step in
+        its ``depends_on`` has completed, so the campaign takes as long as its
+        critical path. After a failure no new steps are started; running ones
+        are allowed to finish.
+
+        Args:
+            campaign_id: Campaign identifier
+            campaign_plan: Campaign plan to execute
+
+        Raises:
+            ValueError: If dependencies reference unknown steps or form a cycle
+            Exception: The first step error once running steps have finished
+        """
+        step_numbers = {step.step for step in campaign_plan.steps}
+        for step in campaign_plan.steps:
+            unknown = set(step.depends_on) - step_numbers
+            if unknown:
+                raise ValueError(f"Step {step.step} depends on unknown steps {sorted(unknown)}")
+
+        # Steps checkpointed before a restart count as done
+        completed = {step.step for step in campaign_plan.steps if step.status == StepStatus.COMPLETED.value}
+        pending = {step.step: step for step in campaign_plan.steps if step.step not in completed}
+        running: Dict[Future, int] = {}
+        first_error: Optional[Exception] = None
+
+        while pending or running:
+            if first_error is None:
+                ready = [step for step in pending.values() if all(dep in completed for dep in step.depends_on)]
+                for step in ready:
+                    del pending[step.step]
+                    # Each step gets a copy of this context (campaign deadline)
+                    context = contextvars.copy_context()
+                    future = self._step_executor.submit(
+                        context.run, self._run_plan_step, campaign_id, step, campaign_plan
+                    )
+                    running[future] = step.step
+
+            if not running:
+                if first_error is not None:
+                    break
+                raise ValueError(f"Steps {sorted(pending)} have circular dependencies")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step_number = running.pop(future)
+                try:
+                    future.result()
+                    completed.add(step_number)
+                except Exception as step_error:
+                    if first_error is None:
+                        first_error = step_error
+
+        if first_error is not None:
+            raise first_error
+
+    def _run_plan_step(self, campaign_id: str, step: PlanStep, campaign_plan: CampaignPlan) -> None:
+        """
+        Execute one plan step, retrying transient failures, and record its status.
+
+        Args:
+            campaign_id: Campaign identifier
+            step: Plan step to execute
+            campaign_plan: Full campaign plan (for context)
+
+        Raises:
+            Exception: The step's last error once retries are exhausted
+        """
+        attempt = 0
+        while True:
+            try:
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Campaign exceeded the orchestrator timeout of {self.timeout}s")
+
+                # Update to in_progress
+                self.planner.update_step_status(
+                    campaign_id,
+                    step.step,
+                    "in_progress"
+                )
+
+                # Execute the step, attributing its LLM calls to it
+                with llm_call_scope(campaign_id, step.step):
+                    result = self._execute_single_step(step, campaign_plan)
+                result = self.artifacts.offload(campaign_id, step.agent_name, result)
+
+                # Update to completed with result
+                self.planner.update_step_status(
+                    campaign_id,
+                    step.step,
+                    "completed",
+                    result=result,
+                    llm_metrics=pop_step_llm_metrics(campaign_id, step.step)
+                )
+                return
+
+            except Exception as step_error:
+                delay = self._step_retry_delay(step_error, attempt)
+                if delay is not None:
+                    attempt += 1
+                    print(f"⚠️  Step {step.step} ({step.agent_name}) failed: {step_error}; "
+                          f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+
+                # Mark step as failed
+                self.planner.update_step_status(
+                    campaign_id,
+                    step.step,
+                    "failed",
+                    error=str(step_error),
+                    llm_metrics=pop_step_llm_metrics(campaign_id, step.step)
+                )
+                raise
+
+    def _step_retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Decide whether a failed step is retried and how long to back off.
+
+        Args:
+            error: Exception raised by the step
+            attempt: Retries already made
+
+        Returns:
+            Seconds to sleep before retrying, or None to fail the step
+        """
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+
+        delay = backoff_delay(attempt, 1.0, 10.0)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def _start_data_prefetch(self) -> None:
+        """Start loading the dataset and population baseline in the background."""
+        # Without the shared dataset cache the data step would load again anyway
+        if not self.speculative_data_load or not self.data_loader.cache_enabled:
+            return
+
+        with self._prefetch_lock:
+            # One warm-up at a time; a finished one is re-run (a cache hit unless the TTL expired)
+            if self._prefetch is None or self._prefetch.done():
+                self._prefetch = self._prefetch_executor.submit(self.data_loader.warm_up)
+
+    def _await_data_prefetch(self) -> None:
+        """Wait for a running speculative load; on failure the data step loads itself."""
+        with self._prefetch_lock:
+            future = self._prefetch
+        if future is None:
+            return
+
+        try:
+            remaining = remaining_time()
+            future.result(timeout=max(remaining, 0) if remaining is not None else None)
+        except Exception as e:
+            print(f"⚠️  Speculative data load failed, loading in the data step: {e}")
+
     def _execute_single_step(self, step: PlanStep, campaign_plan: CampaignPlan) -> Dict[str, Any]:
         """
         Execute a single step from the plan.
@@ -557,14 +735,33 @@ class OrchestratorAgent(BaseAgent):
             return self._execute_segmentation_step(results)
 
         elif step.agent_name == "ProfileGeneratorAgent":
-            return self._execute_profile_generator_step(results)
+            return self._execute_profile_generator_step(results, campaign_plan.campaign_id)
 
         elif step.agent_name == "CampaignStrategistAgent":
-            return self._execute_campaign_strategist_step(results, goal)
+            return self._execute_campaign_strategist_step(results, goal, campaign_plan.campaign_id)
 
         else:
             raise ValueError(f"Unknown agent: {step.agent_name}")
 
+    def _stream_callback(self, campaign_id: str) -> Callable[..., None]:
+        """
+        Build the callback agents use to forward streamed LLM text to the planner.
+
+        Args:
+            campaign_id: Campaign identifier
+
+        Returns:
+            Function taking (output key, text chunk, replace=False); with
+            replace=True the text supersedes everything streamed for the key
+        """
+        def on_chunk(key: str, text: str, replace: bool = False) -> None:
+            if replace:
+                self.planner.replace_partial_output(campaign_id, key, text)
+            else:
+                self.planner.append_partial_output(campaign_id, key, text)
+
+        return on_chunk
+
     def _execute_goal_parser_step(self, goal: str) -> Dict[str, Any]:
         """Execute GoalParser step."""
         criteria = self.goal_parser.process(
@@ -578,7 +775,8 @@ class OrchestratorAgent(BaseAgent):
         return {"criteria": criteria}
 
     def _execute_data_loader_step(self) -> Dict[str, Any]:
-        """Execute DataLoader step."""
+        """Execute DataLoader step (served from the speculative load when it ran)."""
+        self._await_data_prefetch()
         data_result = self.data_loader.process(
             Message(
                 sender=self.name,
@@ -596,40 +794,45 @@ class OrchestratorAgent(BaseAgent):
                 sender=self.name,
                 recipient="SegmentationAgent",
                 content={
-                    "criteria": results.get('GoalParser', {}).get('criteria', {}),
-                    "agent_data": results.get('DataLoader', {}).get('agent_data', {})
+                    "criteria": self.artifacts.resolve(results.get('GoalParser', {}).get('criteria', {})),
+                    "agent_data": self.artifacts.resolve(results.get('DataLoader', {}).get('agent_data', {}))
                 },
                 message_type="segment_request"
             )
         )
         return {"segmentation": segmentation_result}
 
-    def _execute_profile_generator_step(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute ProfileGeneratorAgent step."""
+    def _execute_profile_generator_step(self, results: Dict[str, Any], campaign_id: str) -> Dict[str, Any]:
+        """Execute ProfileGeneratorAgent step (offloaded segment tables are read as DataFrames)."""
         profile_result = self.profile_generator.process(
             Message(
                 sender=self.name,
                 recipient="ProfileGeneratorAgent",
                 content={
-                    "segmentation": results.get('SegmentationAgent', {}).get('segmentation', {}),
-                    "agent_data": results.get('DataLoader', {}).get('agent_data', {}),
-                    "criteria": results.get('GoalParser', {}).get('criteria', {})
+                    "segmentation": self.artifacts.resolve(
+                        results.get('SegmentationAgent', {}).get('segmentation', {}), as_frame=True
+                    ),
+                    "agent_data": self.artifacts.resolve(results.get('DataLoader', {}).get('agent_data', {})),
+                    "criteria": self.artifacts.resolve(results.get('GoalParser', {}).get('criteria', {})),
+                    "stream_callback": self._stream_callback(campaign_id)
                 },
                 message_type="profile_request"
             )
         )
         return {"profiles": profile_result}
 
-    def _execute_campaign_strategist_step(self, results: Dict[str, Any], goal: str) -> Dict[str, Any]:
+    def _execute_campaign_strategist_step(self, results: Dict[str, Any], goal: str,
+                                          campaign_id: str) -> Dict[str, Any]:
         """Execute CampaignStrategistAgent step."""
         strategy_result = self.campaign_strategist.process(
             Message(
                 sender=self.name,
                 recipient="CampaignStrategistAgent",
                 content={
-                    "profiles": results.get('ProfileGeneratorAgent', {}).get('profiles', {}),
+                    "profiles": self.artifacts.resolve(results.get('ProfileGeneratorAgent', {}).get('profiles', {})),
                     "goal": goal,
-                    "criteria": results.get('GoalParser', {}).get('criteria', {})
+                    "criteria": self.artifacts.resolve(results.get('GoalParser', {}).get('criteria', {})),
+                    "stream_callback": self._stream_callback(campaign_id)
                 },
                 message_type="strategy_request"
             )
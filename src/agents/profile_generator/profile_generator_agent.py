@@ -1,12 +1,59 @@
 """Profile Generator Agent - Analyzes segments and generates comprehensive agent profiles."""
 
+import contextvars
+import math
+import os
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
-from src.llm import ClaudeProvider
+from src.core.stats import PopulationBaseline, get_cached_baseline, get_population_baseline, compute_lift
+from src.core.stats.partials import ColumnSpec, compute_partials
+from src.llm import get_agent_llm_provider, compact_prompt, record_llm_fallback
+from src.agents.profile_generator.theme_extractor import ThemeExtractor
+from src.agents.profile_generator.purchase_habits import PurchaseHabitMatrix
+
+
+# Partial aggregates needed to rebuild _compute_detailed_statistics from row partitions
+PROFILE_COLUMN_SPECS = {
+    'aum_selfreported': ColumnSpec(keep_values=True),
+    'nps_score': ColumnSpec(
+        keep_values=True,
+        value_counts=True,
+        bins=(
+            ('promoters', 9, math.inf, False),
+            ('passives', 7, 8, True),
+            ('detractors', -math.inf, 6, True)
+        )
+    ),
+    'agent_tenure': ColumnSpec(
+        keep_values=True,
+        bins=(
+            ('new', -math.inf, 2, False),
+            ('experienced', 2, 5, False),
+            ('veteran', 5, math.inf, False)
+        )
+    ),
+    'no_of_unique_policies_sold_last_12_months': ColumnSpec(
+        keep_values=True,
+        bins=(
+            ('low', -math.inf, 5, False),
+            ('medium', 5, 15, False),
+            ('high', 15, math.inf, False)
+        )
+    ),
+    'Age': ColumnSpec(
+        keep_values=True,
+        bins=(
+            ('young', -math.inf, 35, False),
+            ('middle', 35, 55, False),
+            ('senior', 55, math.inf, False)
+        )
+    )
+}
 
 
 class ProfileGeneratorAgent(BaseAgent):
@@ -33,16 +80,21 @@ class ProfileGeneratorAgent(BaseAgent):
         
         self.settings = settings
         
-        # Get LLM provider configuration
-        llm_provider_name = agent_config.get('provider', settings.llm_default_provider)
-        llm_config = settings.get_llm_config(llm_provider_name)
-        
-        # Override temperature if specified in agent config
-        if 'temperature' in agent_config:
-            llm_config['temperature'] = agent_config['temperature']
-        
-        # Initialize LLM provider
-        self.llm = ClaudeProvider(llm_config)
+        # Shared LLM provider (pooled client, agent temperature/cache overrides)
+        self.llm = get_agent_llm_provider(agent_config, self.name)
+
+        # Process-parallel statistics for very large segments
+        self.parallel_workers = agent_config.get('parallel_workers') or os.cpu_count() or 1
+        self.parallel_min_rows = agent_config.get('parallel_min_rows', 250000)
+
+        # Local feedback theme extraction (fixed keyword vocabulary, shared across campaigns)
+        self.theme_extractor = ThemeExtractor() if agent_config.get('analyze_feedback', True) else None
+
+        # The LLM description runs here while the deterministic breakdown is computed
+        self._description_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="profile-description")
+
+        # Loads the population when its baseline is not cached (created on first use)
+        self._data_loader = None
         
     def process(self, message: Message) -> Dict[str, Any]:
         """
@@ -59,36 +111,56 @@ class ProfileGeneratorAgent(BaseAgent):
             segmentation_results = message.content.get('segmentation', {})
             agent_data = message.content.get('agent_data', {})
             criteria = message.content.get('criteria', {})
+            stream_callback = message.content.get('stream_callback')
             
             if not segmentation_results.get('success'):
                 raise ValueError("No valid segmentation results provided")
             
             # Get filtered agent data - use all_filtered for profile generation
+            # (records, or a DataFrame when read from an artifact)
             filtered_agents = segmentation_results.get('all_filtered', [])
             agent_ids = segmentation_results.get('agent_ids', [])
             
-            if not filtered_agents:
+            if len(filtered_agents) == 0:
                 raise ValueError("No filtered agents to profile")
             
             # Convert to DataFrame for analysis
-            agent_df = pd.DataFrame(filtered_agents)
+            agent_df = filtered_agents if isinstance(filtered_agents, pd.DataFrame) else pd.DataFrame(filtered_agents)
+
+            # Segmentation hands over real nulls; text columns keep the "N/A" placeholder
+            # profiles and segment names always had (numeric nulls stay NaN for the stats)
+            text_columns = agent_df.select_dtypes(include=['object', 'string']).columns
+            agent_df = agent_df.fillna({column: "N/A" for column in text_columns})
             
             # Compute detailed statistics
             statistics = self._compute_detailed_statistics(agent_df)
+
+            # Compare the segment against cached population aggregates
+            lift = self._compute_segment_lift(agent_df, segmentation_results)
+            
+            # Extract feedback themes locally (no LLM calls)
+            feedback_themes = self._extract_feedback_themes(agent_df)
             
             # Generate segment insights
-            insights = self._generate_segment_insights(agent_df, criteria)
+            insights = self._generate_segment_insights(agent_df, criteria, lift, feedback_themes)
             
-            # Generate LLM-powered segment description
-            segment_description = self._generate_segment_description(
-                agent_df, criteria, statistics, insights
+            # Start the LLM-powered segment description (keeping the step's deadline and metrics scope)
+            context = contextvars.copy_context()
+            description_future = self._description_executor.submit(
+                context.run, self._generate_segment_description,
+                agent_df, criteria, statistics, insights, stream_callback
             )
             
+            # Purchase habits as one matrix shared by profiles and breakdowns
+            habit_matrix = PurchaseHabitMatrix(agent_df)
+            
             # Generate individual agent profiles
-            agent_profiles = self._generate_agent_profiles(agent_df)
+            agent_profiles = self._generate_agent_profiles(agent_df, habit_matrix)
 
             # Generate segment-specific breakdowns
-            segments_breakdown = self._generate_segments_breakdown(agent_df, criteria, statistics)
+            segments_breakdown = self._generate_segments_breakdown(agent_df, criteria, statistics, habit_matrix)
+
+            segment_description = description_future.result()
 
             return {
                 "success": True,
@@ -99,6 +171,8 @@ class ProfileGeneratorAgent(BaseAgent):
                     "criteria_applied": criteria.get('constraints', [])
                 },
                 "statistics": statistics,
+                "lift": lift,
+                "feedback_themes": feedback_themes,
                 "insights": insights,
                 "segment_description": segment_description,
                 "agent_profiles": agent_profiles,
@@ -121,12 +195,21 @@ class ProfileGeneratorAgent(BaseAgent):
         """
         Compute detailed statistics for the agent segment.
         
+        Segments with at least ``parallel_min_rows`` rows are aggregated by a
+        process pool over row partitions (see _compute_detailed_statistics_parallel).
+        
         Args:
             df: DataFrame of filtered agents
             
         Returns:
             Dictionary with comprehensive statistics
         """
+        if self.parallel_workers > 1 and len(df) >= self.parallel_min_rows:
+            try:
+                return self._compute_detailed_statistics_parallel(df)
+            except Exception as e:
+                print(f"⚠️  Parallel statistics failed ({e}), falling back to single process")
+        
         stats = {}
         
         # Financial metrics
@@ -208,13 +291,168 @@ class ProfileGeneratorAgent(BaseAgent):
         
         return stats
     
-    def _generate_segment_insights(self, df: pd.DataFrame, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    def _compute_detailed_statistics_parallel(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Compute detailed statistics from mergeable partials over row partitions.
+        
+        Produces the same structure as _compute_detailed_statistics, but the
+        numeric work runs in worker processes (outside this thread's GIL) and
+        the parent only merges the per-partition aggregates.
+        
+        Args:
+            df: DataFrame of filtered agents
+            
+        Returns:
+            Dictionary with comprehensive statistics
+        """
+        columns = {
+            column: df[column].to_numpy()
+            for column in PROFILE_COLUMN_SPECS
+            if column in df.columns
+        }
+        partials = compute_partials(columns, PROFILE_COLUMN_SPECS, workers=self.parallel_workers)
+        
+        stats = {}
+        
+        # Financial metrics
+        if 'aum_selfreported' in partials:
+            aum = partials['aum_selfreported']
+            stats['aum'] = {
+                "count": aum.count,
+                "mean": aum.mean_or(0),
+                "median": aum.quantile_or(0.5),
+                "std": aum.std_or(0),
+                "min": aum.min_or(0),
+                "max": aum.max_or(0),
+                "q25": aum.quantile_or(0.25),
+                "q75": aum.quantile_or(0.75)
+            }
+        
+        # Satisfaction metrics
+        if 'nps_score' in partials:
+            nps = partials['nps_score']
+            stats['nps'] = {
+                "count": nps.count,
+                "mean": nps.mean_or(0),
+                "median": nps.quantile_or(0.5),
+                "distribution": nps.value_counts,
+                "promoters": nps.bin_counts['promoters'],
+                "passives": nps.bin_counts['passives'],
+                "detractors": nps.bin_counts['detractors']
+            }
+        
+        # Tenure metrics
+        if 'agent_tenure' in partials:
+            tenure = partials['agent_tenure']
+            stats['tenure'] = {
+                "count": tenure.count,
+                "mean": tenure.mean_or(0),
+                "median": tenure.quantile_or(0.5),
+                "min": tenure.min_or(0),
+                "max": tenure.max_or(0),
+                "distribution": dict(tenure.bin_counts)
+            }
+        
+        # Performance metrics
+        if 'no_of_unique_policies_sold_last_12_months' in partials:
+            sales = partials['no_of_unique_policies_sold_last_12_months']
+            stats['sales_performance'] = {
+                "count": sales.count,
+                "mean": sales.mean_or(0),
+                "median": sales.quantile_or(0.5),
+                "total_policies": int(sales.total),
+                "distribution": dict(sales.bin_counts)
+            }
+        
+        # Demographics (categorical counts stay in-process)
+        if 'Segment' in df.columns:
+            stats['demographics'] = {
+                "segments": dict(Counter(df['Segment'].dropna())),
+                "total_segments": len(df['Segment'].unique())
+            }
+        
+        if 'Age' in partials:
+            age = partials['Age']
+            stats['demographics']['age'] = {
+                "mean": age.mean_or(0),
+                "median": age.quantile_or(0.5),
+                "distribution": dict(age.bin_counts)
+            }
+        
+        return stats
+    
+    def _compute_segment_lift(self, df: pd.DataFrame, segmentation_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute segment-vs-population lift when enabled in config.
+        
+        Uses the population baseline cached by the segmentation step. On a
+        miss (resumed campaign, evicted version, another process) the
+        baseline is computed from the loaded dataset.
+        
+        Args:
+            df: DataFrame of filtered agents
+            segmentation_results: Segmentation step output (carries dataset_version)
+            
+        Returns:
+            Lift analysis dictionary (empty if disabled or the dataset can't be loaded)
+        """
+        if not self.config.get('calculate_lift', False):
+            return {}
+        
+        dataset_version = segmentation_results.get('dataset_version')
+        baseline = get_cached_baseline(dataset_version)
+        if baseline is None:
+            try:
+                baseline = self._load_population_baseline()
+            except Exception as e:
+                print(f"⚠️  Population baseline unavailable ({e}), skipping lift computation")
+                return {}
+            if dataset_version and baseline.dataset_version != dataset_version:
+                print(f"⚠️  Dataset changed since segmentation ({dataset_version} -> "
+                      f"{baseline.dataset_version}), lift uses the current population")
+        
+        return compute_lift(df, baseline)
+
+    def _load_population_baseline(self) -> PopulationBaseline:
+        """
+        Compute (or fetch) the baseline of the currently loaded population.
+
+        Returns:
+            PopulationBaseline of the shared dataset
+        """
+        if self._data_loader is None:
+            from src.agents.data_loader import DataLoaderAgent
+            self._data_loader = DataLoaderAgent({})
+        # Read-only use, so the shared frame is not copied
+        return get_population_baseline(self._data_loader._get_shared_agent_persona_data())
+    
+    def _extract_feedback_themes(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Extract per-segment theme frequencies and example quotes from nps_feedback.
+        
+        Args:
+            df: DataFrame of filtered agents
+            
+        Returns:
+            Theme analysis dictionary (empty if disabled or no feedback column)
+        """
+        if self.theme_extractor is None or 'nps_feedback' not in df.columns:
+            return {}
+        
+        groups = df['segment'] if 'segment' in df.columns else None
+        return self.theme_extractor.extract(df['nps_feedback'], groups)
+    
+    def _generate_segment_insights(self, df: pd.DataFrame, criteria: Dict[str, Any],
+                                   lift: Optional[Dict[str, Any]] = None,
+                                   feedback_themes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Generate insights about the segment characteristics.
         
         Args:
             df: DataFrame of filtered agents
             criteria: Applied criteria
+            lift: Optional segment-vs-population lift analysis
+            feedback_themes: Optional theme analysis of nps_feedback
             
         Returns:
             Dictionary with segment insights
@@ -222,9 +460,27 @@ class ProfileGeneratorAgent(BaseAgent):
         insights = {
             "segment_characteristics": [],
             "key_findings": [],
-            "opportunities": []
+            "opportunities": [],
+            "distinguishing_features": [],
+            "feedback_themes": []
         }
         
+        # Most mentioned feedback themes with a representative quote
+        for theme, details in list((feedback_themes or {}).get('themes', {}).items())[:3]:
+            quote = details['examples'][0] if details['examples'] else ''
+            insights["feedback_themes"].append(
+                f"{theme.replace('_', ' ')}: {details['share']:.0%} of comments (e.g. \"{quote}\")"
+            )
+        
+        # What sets this segment apart from the population
+        for feature in (lift or {}).get('top_distinguishing', []):
+            if feature.get('lift') is None:
+                continue
+            direction = "above" if feature['std_diff'] > 0 else "below"
+            insights["distinguishing_features"].append(
+                f"{feature['feature']}: {feature['lift']:.2f}x population ({abs(feature['std_diff']):.2f} SD {direction})"
+            )
+        
         # Analyze segment characteristics
         if len(df) > 0:
             insights["segment_characteristics"].append(f"Segment size: {len(df)} agents")
@@ -271,7 +527,8 @@ class ProfileGeneratorAgent(BaseAgent):
         return insights
     
     def _generate_segment_description(self, df: pd.DataFrame, criteria: Dict[str, Any], 
-                                     statistics: Dict[str, Any], insights: Dict[str, Any]) -> str:
+                                     statistics: Dict[str, Any], insights: Dict[str, Any],
+                                     stream_callback: Optional[Callable[..., None]] = None) -> str:
         """
         Generate LLM-powered segment description.
         
@@ -280,6 +537,8 @@ class ProfileGeneratorAgent(BaseAgent):
             criteria: Applied criteria
             statistics: Computed statistics
             insights: Generated insights
+            stream_callback: Optional (key, chunk) callback receiving the text as it streams
+                (called with replace=True for the fallback text after a failure)
             
         Returns:
             LLM-generated segment description
@@ -314,6 +573,12 @@ class ProfileGeneratorAgent(BaseAgent):
         INSIGHTS:
         {insights.get('key_findings', [])}
         
+        DISTINGUISHING FEATURES (vs. full population):
+        {insights.get('distinguishing_features', [])}
+        
+        FEEDBACK THEMES:
+        {insights.get('feedback_themes', [])}
+        
         Please provide a comprehensive 2-3 paragraph description that:
         1. Summarizes the segment characteristics
         2. Highlights key strengths and opportunities
@@ -321,29 +586,47 @@ class ProfileGeneratorAgent(BaseAgent):
         
         Focus on actionable insights for marketing and retention strategies.
         """
+        prompt = compact_prompt(prompt)
+        
+        system = "You are an expert insurance marketing analyst specializing in agent segmentation and campaign strategy."
         
         try:
-            description = self.llm.query(
-                prompt=prompt,
-                system="You are an expert insurance marketing analyst specializing in agent segmentation and campaign strategy."
-            )
-            return description
+            if stream_callback is None:
+                return self.llm.query(prompt=prompt, system=system)
+            
+            # Stream the description so clients see it before the campaign finishes
+            chunks = []
+            for chunk in self.llm.stream(prompt=prompt, system=system):
+                chunks.append(chunk)
+                stream_callback('segment_description', chunk)
+            return "".join(chunks)
         except Exception as e:
-            return f"Segment analysis: {len(df)} agents meeting criteria with average AUM of ${data_summary['key_statistics']['avg_aum']:,.0f} and NPS of {data_summary['key_statistics']['avg_nps']:.1f}. {insights.get('key_findings', ['Standard segment characteristics'])[0]}."
+            record_llm_fallback(self.name, e)
+            description = f"Segment analysis: {len(df)} agents meeting criteria with average AUM of ${data_summary['key_statistics']['avg_aum']:,.0f} and NPS of {data_summary['key_statistics']['avg_nps']:.1f}. {insights.get('key_findings', ['Standard segment characteristics'])[0]}."
+            if stream_callback is not None:
+                # Supersede whatever streamed before the failure
+                stream_callback('segment_description', description, replace=True)
+            return description
     
-    def _generate_agent_profiles(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _generate_agent_profiles(self, df: pd.DataFrame,
+                                 habit_matrix: Optional[PurchaseHabitMatrix] = None) -> List[Dict[str, Any]]:
         """
         Generate individual agent profiles.
         
         Args:
             df: DataFrame of filtered agents
+            habit_matrix: Optional purchase-habit matrix for per-agent top habits
             
         Returns:
             List of individual agent profiles
         """
         profiles = []
         
-        for _, agent in df.iterrows():
+        top_habits = None
+        if habit_matrix is not None and habit_matrix.available:
+            top_habits = habit_matrix.agent_top_habits(top_k=2)
+        
+        for position, (_, agent) in enumerate(df.iterrows()):
             # Use lowercase column names to match the database schema
             profile = {
                 "agent_id": str(agent.get('agent_id', 'Unknown')),
@@ -359,6 +642,8 @@ class ProfileGeneratorAgent(BaseAgent):
                 "premium_amount": float(agent.get('premium_amount', 0)) if pd.notna(agent.get('premium_amount')) else 0,
                 "nps_feedback": agent.get('nps_feedback', 'No feedback available')
             }
+            if top_habits is not None:
+                profile["top_purchase_habits"] = top_habits[position]
             profiles.append(profile)
         
         return profiles
@@ -416,7 +701,8 @@ class ProfileGeneratorAgent(BaseAgent):
         return recommendations[:5]  # Limit to top 5 recommendations
 
     def _generate_segments_breakdown(self, df: pd.DataFrame, criteria: Dict[str, Any],
-                                     overall_statistics: Dict[str, Any]) -> Dict[str, Any]:
+                                     overall_statistics: Dict[str, Any],
+                                     habit_matrix: Optional[PurchaseHabitMatrix] = None) -> Dict[str, Any]:
         """
         Generate segment-specific breakdowns for each customer segment.
 
@@ -426,6 +712,7 @@ class ProfileGeneratorAgent(BaseAgent):
             df: Filtered agent DataFrame
             criteria: Campaign criteria
             overall_statistics: Overall statistics for all agents
+            habit_matrix: Optional precomputed purchase-habit matrix for df
 
         Returns:
             Dictionary with per-segment profiles and statistics
@@ -435,8 +722,13 @@ class ProfileGeneratorAgent(BaseAgent):
         if 'segment' not in df.columns or df.empty:
             return segments_breakdown
 
+        # Purchase-habit affinities for every segment in one grouped reduction
+        if habit_matrix is None:
+            habit_matrix = PurchaseHabitMatrix(df)
+        habit_affinities = habit_matrix.segment_affinities(df['segment'], top_k=2)
+
         # Group by Segment
-        for segment_name, segment_df in df.groupby('segment'):
+        for segment_name, segment_df in df.groupby('segment', dropna=False):
             if segment_df.empty:
                 continue
 
@@ -490,31 +782,10 @@ class ProfileGeneratorAgent(BaseAgent):
                     "total_policies": int(sales_data.sum()) if not sales_data.empty and pd.notna(sales_data.sum()) else 0
                 }
 
-            # Purchase habits analysis
-            purchase_habit_columns = [
-                'PURCHASE_HABITS_APPAREL',
-                'PURCHASE_HABITS_COMPUTERS',
-                'PURCHASE_HABITS_FITNESS',
-                'PURCHASE_HABITS_TRAVEL',
-                'PURCHASE_HABITS_OTHERS'
-            ]
-
-            purchase_habits = {}
-            for col in purchase_habit_columns:
-                if col in segment_df.columns:
-                    habit_data = pd.to_numeric(segment_df[col], errors='coerce')
-                    habit_name = col.replace('PURCHASE_HABITS_', '').lower()
-                    purchase_habits[habit_name] = {
-                        "mean": float(habit_data.mean()) if not habit_data.empty and pd.notna(habit_data.mean()) else 0,
-                        "count": int((habit_data > 0).sum()) if not habit_data.empty else 0
-                    }
-
-            # Identify top purchase habits for this segment
-            if purchase_habits:
-                segment_stats['purchase_habits'] = purchase_habits
-                # Find top 2 habits by mean value
-                sorted_habits = sorted(purchase_habits.items(), key=lambda x: x[1]['mean'], reverse=True)
-                segment_stats['top_purchase_habits'] = [habit[0] for habit in sorted_habits[:2] if habit[1]['mean'] > 0]
+            # Purchase habits analysis (precomputed from the habit matrix)
+            if segment_name in habit_affinities:
+                segment_stats['purchase_habits'] = habit_affinities[segment_name]['purchase_habits']
+                segment_stats['top_purchase_habits'] = habit_affinities[segment_name]['top_purchase_habits']
 
             segment_breakdown['statistics'] = segment_stats
 
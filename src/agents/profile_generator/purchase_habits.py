@@ -0,0 +1,151 @@
+"""Matrix-based purchase-habit affinity ranking for segments and agents."""
+
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+PURCHASE_HABIT_COLUMNS = [
+    'PURCHASE_HABITS_APPAREL',
+    'PURCHASE_HABITS_COMPUTERS',
+    'PURCHASE_HABITS_FITNESS',
+    'PURCHASE_HABITS_TRAVEL',
+    'PURCHASE_HABITS_OTHERS'
+]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k highest positive scores per row, best first.
+
+    Args:
+        scores: 2-D score matrix (rows x habits)
+        k: Number of habits to keep
+
+    Returns:
+        Index matrix (rows x k); entries for non-positive scores are -1
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+
+    masked = np.where(scores > 0, scores, -np.inf)
+    candidates = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(masked, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    top = np.take_along_axis(candidates, order, axis=1)
+    top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+    return np.where(np.isfinite(top_scores), top, -1)
+
+
+class PurchaseHabitMatrix:
+    """
+    Purchase-habit columns held as one float32 matrix (agents x habits).
+
+    Per-segment means, penetration, lift and top-k habits come from a single
+    grouped reduction over the matrix, and per-agent top habits from one
+    row-wise argpartition.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the habit matrix from an agent DataFrame.
+
+        Args:
+            df: Agent DataFrame (habit columns may be missing or non-numeric)
+        """
+        self.columns = [column for column in PURCHASE_HABIT_COLUMNS if column in df.columns]
+        self.habit_names = [column.replace('PURCHASE_HABITS_', '').lower() for column in self.columns]
+
+        if self.columns:
+            self.values = (
+                df[self.columns]
+                .apply(pd.to_numeric, errors='coerce')
+                .to_numpy(dtype=np.float32)
+            )
+        else:
+            self.values = np.empty((len(df), 0), dtype=np.float32)
+
+    @property
+    def available(self) -> bool:
+        """Whether any purchase-habit columns are present."""
+        return bool(self.columns)
+
+    def segment_affinities(self, segments: pd.Series, top_k: int = 2) -> Dict[Any, Dict[str, Any]]:
+        """
+        Compute per-segment habit statistics and top-k habits.
+
+        Args:
+            segments: Segment label per agent (aligned with the matrix rows)
+            top_k: Number of top habits to report per segment
+
+        Returns:
+            Segment label -> {"purchase_habits": {...}, "top_purchase_habits": [...]}
+        """
+        if not self.available:
+            return {}
+
+        codes, labels = pd.factorize(segments.reset_index(drop=True))
+        in_segment = codes >= 0
+        habit_count = len(self.columns)
+
+        present = ~np.isnan(self.values)
+        filled = np.where(present, self.values, 0.0)
+
+        # One grouped reduction over [values | non-null | positive]
+        stacked = np.hstack([filled, present, filled > 0]).astype(np.float64)
+        totals = np.zeros((len(labels), 3 * habit_count), dtype=np.float64)
+        np.add.at(totals, codes[in_segment], stacked[in_segment])
+
+        sums = totals[:, :habit_count]
+        non_null = totals[:, habit_count:2 * habit_count]
+        positive = totals[:, 2 * habit_count:]
+        agents = np.bincount(codes[in_segment], minlength=len(labels)).astype(np.float64)
+
+        means = np.divide(sums, non_null, out=np.zeros_like(sums), where=non_null > 0)
+        penetration = np.divide(positive, agents[:, None], out=np.zeros_like(positive), where=agents[:, None] > 0)
+
+        overall_non_null = non_null.sum(axis=0)
+        overall_means = np.divide(
+            sums.sum(axis=0), overall_non_null,
+            out=np.zeros(habit_count), where=overall_non_null > 0
+        )
+        lift = np.divide(means, overall_means, out=np.zeros_like(means), where=overall_means > 0)
+
+        top = _top_k(means, top_k)
+
+        affinities = {}
+        for row, label in enumerate(labels):
+            affinities[label] = {
+                "purchase_habits": {
+                    name: {
+                        "mean": float(means[row, col]),
+                        "count": int(positive[row, col]),
+                        "penetration": float(penetration[row, col]),
+                        "lift": float(lift[row, col])
+                    }
+                    for col, name in enumerate(self.habit_names)
+                },
+                "top_purchase_habits": [self.habit_names[col] for col in top[row] if col >= 0]
+            }
+
+        return affinities
+
+    def agent_top_habits(self, top_k: int = 2) -> List[List[str]]:
+        """
+        Top-k habits for every agent (highest positive scores first).
+
+        Args:
+            top_k: Number of habits per agent
+
+        Returns:
+            List aligned with the matrix rows
+        """
+        if not self.available:
+            return [[] for _ in range(len(self.values))]
+
+        top = _top_k(np.nan_to_num(self.values, nan=0.0), top_k)
+        names = np.array(self.habit_names + [''], dtype=object)
+        # -1 indexes the trailing '' placeholder, dropped below
+        labelled = names[top]
+        return [[name for name in row if name] for row in labelled.tolist()]
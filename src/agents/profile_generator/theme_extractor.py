@@ -0,0 +1,195 @@
+"""Local, batched theme extraction over agent NPS feedback text."""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Theme -> keywords (matched against lower-cased tokens)
+DEFAULT_THEMES: Dict[str, List[str]] = {
+    "claims": ["claim", "claims", "claimed", "payout", "payouts", "lodgement", "settlement"],
+    "pricing": ["premium", "premiums", "price", "prices", "pricing", "rates", "affordable",
+                "discount", "discounts", "cost", "costs", "value", "expensive", "cheap"],
+    "customer_support": ["support", "service", "help", "helpful", "helped", "representatives",
+                         "answers", "answered", "queries", "questions", "advice", "caring"],
+    "digital_experience": ["app", "online", "portal", "website", "mobile", "chat", "digital",
+                           "features", "user-friendly"],
+    "communication": ["communication", "reminders", "documentation", "documents", "updates",
+                      "wording", "clear", "clearer", "transparent", "email", "responses"],
+    "coverage": ["coverage", "covers", "benefits", "riders", "options", "plan", "plans",
+                 "add-ons", "terms"],
+    "speed": ["quick", "fast", "prompt", "slow", "delay", "delays", "minutes", "effortless",
+              "smooth", "wait", "time", "times"]
+}
+
+# Placeholder values that carry no feedback
+EMPTY_FEEDBACK = {"", "n/a", "na", "none", "no feedback available"}
+
+TOKEN_PATTERN = r"[a-z]+(?:[-'’][a-z]+)*"
+
+
+class ThemeExtractor:
+    """
+    Keyword/theme extractor that scales to hundreds of thousands of comments.
+
+    Comments are de-duplicated first, tokenized in one vectorized pass, mapped
+    to ids through the theme keyword vocabulary (other tokens are dropped),
+    and reduced to sparse (document, term, count) triples. Theme hits and
+    per-group theme frequencies are then pure array reductions.
+
+    The vocabulary is built once and never modified, so one extractor can
+    be shared by concurrent campaigns and its size is bounded by the
+    keyword lists.
+    """
+
+    def __init__(self, themes: Optional[Dict[str, List[str]]] = None, max_examples: int = 2):
+        """
+        Initialize theme extractor.
+
+        Args:
+            themes: Theme -> keyword list (defaults to DEFAULT_THEMES)
+            max_examples: Number of example quotes kept per theme
+        """
+        self.themes = themes or DEFAULT_THEMES
+        self.theme_names = list(self.themes)
+        self.max_examples = max_examples
+
+        # Keyword -> term id, and term id -> theme index (read-only after init)
+        keyword_themes: Dict[str, int] = {}
+        for theme_index, theme in enumerate(self.theme_names):
+            for keyword in self.themes[theme]:
+                keyword_themes.setdefault(keyword.lower(), theme_index)
+
+        self._vocabulary = {keyword: term_id for term_id, keyword in enumerate(keyword_themes)}
+        self._term_themes = np.array(list(keyword_themes.values()), dtype=np.int32)
+
+    def _term_counts(self, documents: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tokenize documents and build sparse counts of the keyword terms.
+
+        Args:
+            documents: Unique, non-empty comment texts
+
+        Returns:
+            Tuple of (document index, term id, count) arrays
+        """
+        tokens = documents.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        term_ids = tokens.map(self._vocabulary).dropna()
+        if term_ids.empty:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+
+        doc_ids = term_ids.index.to_numpy(dtype=np.int64)
+        term_ids = term_ids.to_numpy(dtype=np.int64)
+
+        # Collapse repeated (document, term) pairs into counts
+        vocabulary_size = len(self._vocabulary)
+        keys, counts = np.unique(doc_ids * vocabulary_size + term_ids, return_counts=True)
+        return keys // vocabulary_size, keys % vocabulary_size, counts
+
+    def extract(self, texts: pd.Series, groups: Optional[pd.Series] = None) -> Dict[str, Any]:
+        """
+        Extract theme frequencies and example quotes.
+
+        Args:
+            texts: Feedback comments (one per agent)
+            groups: Optional group label per comment (e.g. segment)
+
+        Returns:
+            Dictionary with overall and per-group theme frequencies
+        """
+        texts = texts.where(texts.map(lambda value: isinstance(value, str)), None)
+        texts = texts.where(~texts.str.strip().str.lower().isin(EMPTY_FEEDBACK), None)
+
+        # Work on unique comments only; codes map every row back to its comment
+        codes, uniques = pd.factorize(texts.reset_index(drop=True))
+        documents = pd.Series(uniques, dtype=object)
+
+        theme_count = len(self.theme_names)
+        doc_idx, term_ids, counts = self._term_counts(documents)
+        themes_of_terms = self._term_themes[term_ids] if term_ids.size else np.empty(0, dtype=np.int32)
+        matched = themes_of_terms >= 0
+
+        hits = np.zeros((len(documents), theme_count), dtype=np.int32)
+        np.add.at(hits, (doc_idx[matched], themes_of_terms[matched]), counts[matched])
+        present = hits > 0
+
+        if groups is None:
+            group_codes = np.zeros(len(codes), dtype=np.int64)
+            group_names = ["all"]
+        else:
+            group_codes, group_names = pd.factorize(groups.reset_index(drop=True).astype(str))
+
+        # (group, comment) pair counts, then theme mentions per group in one reduction
+        has_comment = codes >= 0
+        group_count = max(len(group_names), 1)
+        pair_keys, pair_counts = np.unique(
+            group_codes[has_comment] * max(len(documents), 1) + codes[has_comment],
+            return_counts=True
+        )
+        pair_groups = pair_keys // max(len(documents), 1)
+        pair_docs = pair_keys % max(len(documents), 1)
+
+        group_mentions = np.zeros((group_count, theme_count), dtype=np.int64)
+        np.add.at(group_mentions, pair_groups, present[pair_docs] * pair_counts[:, None])
+        group_comments = np.bincount(pair_groups, weights=pair_counts, minlength=group_count).astype(np.int64)
+
+        total_comments = int(has_comment.sum())
+        doc_counts = np.bincount(codes[has_comment], minlength=len(documents))
+        all_docs = np.flatnonzero(doc_counts)
+        result = {
+            "total_comments": total_comments,
+            "themes": self._summarize(
+                group_mentions.sum(axis=0), total_comments,
+                all_docs, doc_counts[all_docs], documents, hits
+            ),
+            "by_segment": {}
+        }
+
+        if groups is not None:
+            for group_index, group_name in enumerate(group_names):
+                in_group = pair_groups == group_index
+                result["by_segment"][group_name] = {
+                    "total_comments": int(group_comments[group_index]),
+                    "themes": self._summarize(
+                        group_mentions[group_index], int(group_comments[group_index]),
+                        pair_docs[in_group], pair_counts[in_group], documents, hits
+                    )
+                }
+
+        return result
+
+    def _summarize(self, mentions: np.ndarray, total_comments: int, pair_docs: np.ndarray,
+                   pair_counts: np.ndarray, documents: pd.Series, hits: np.ndarray) -> Dict[str, Any]:
+        """
+        Build theme frequency summary with example quotes.
+
+        Args:
+            mentions: Number of comments mentioning each theme
+            total_comments: Number of non-empty comments
+            pair_docs: Unique comment indices in scope
+            pair_counts: Occurrences of each comment in scope
+            documents: Unique comment texts
+            hits: Keyword hits per unique comment and theme
+
+        Returns:
+            Theme -> {mentions, share, examples}, ordered by mentions
+        """
+        summary = {}
+        for theme_index in np.argsort(-mentions, kind='stable'):
+            if mentions[theme_index] == 0:
+                continue
+
+            # Prefer comments with the most keyword hits, then the most frequent
+            theme_hits = hits[pair_docs, theme_index]
+            candidates = np.flatnonzero(theme_hits > 0)
+            order = np.lexsort((-pair_counts[candidates], -theme_hits[candidates]))
+            examples = [documents.iat[pair_docs[i]] for i in candidates[order[:self.max_examples]]]
+
+            summary[self.theme_names[theme_index]] = {
+                "mentions": int(mentions[theme_index]),
+                "share": float(mentions[theme_index] / total_comments) if total_comments else 0.0,
+                "examples": examples
+            }
+
+        return summary
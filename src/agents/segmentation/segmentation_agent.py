@@ -1,10 +1,11 @@
 """Segmentation Agent - Filters agent population based on parsed criteria."""
 
 import pandas as pd
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Union, Optional
 
 from src.agents.base_agent import BaseAgent, Message
 from src.core.config import get_settings
+from src.core.stats import PopulationBaseline, get_population_baseline
 
 
 class SegmentationAgent(BaseAgent):
@@ -30,6 +31,9 @@ class SegmentationAgent(BaseAgent):
         super().__init__("SegmentationAgent", agent_config)
         
         self.settings = settings
+
+        # Reads the shared population (created on first use, reused by every campaign)
+        self._data_loader = None
         
     def process(self, message: Message) -> Dict[str, Any]:
         """
@@ -52,33 +56,24 @@ class SegmentationAgent(BaseAgent):
             if not agent_data or not agent_data.get('success'):
                 raise ValueError("No valid agent data provided for segmentation")
             
-            # Get the actual DataFrame from DataLoader cache
-            from src.agents.data_loader import DataLoaderAgent
-            data_loader = DataLoaderAgent({})
-            data_result = data_loader.process(
-                Message(
-                    sender=self.name,
-                    recipient="DataLoader",
-                    content={},  # Load unified dataset
-                    message_type="load_data"
-                )
-            )
-            
-            if not data_result.get('success'):
-                raise ValueError(f"Failed to load agent data: {data_result.get('error')}")
-            
-            # Get the full dataset from the DataLoader's cache
-            if hasattr(data_loader, 'data_cache') and 'agent_persona' in data_loader.data_cache:
-                agent_df = data_loader.data_cache['agent_persona']
-            else:
-                # Load the full dataset directly instead of using sample data
-                agent_df = data_loader._load_agent_persona_data()
+            # Get the full dataset from the DataLoader's process-wide cache
+            if self._data_loader is None:
+                from src.agents.data_loader import DataLoaderAgent
+                self._data_loader = DataLoaderAgent({})
+            try:
+                # Only read here (filters build new frames), so the shared frame is not copied
+                agent_df = self._data_loader._get_shared_agent_persona_data()
+            except Exception as e:
+                raise ValueError(f"Failed to load agent data: {e}") from e
             
             # Apply segmentation criteria
             filtered_agents = self._apply_criteria(agent_df, criteria)
             
+            # Population aggregates are computed once per dataset version
+            baseline = get_population_baseline(agent_df)
+
             # Generate segmentation statistics
-            stats = self._generate_segmentation_stats(agent_df, filtered_agents, criteria)
+            stats = self._generate_segmentation_stats(agent_df, filtered_agents, criteria, baseline)
             
             # Convert numpy types to native Python types for JSON serialization
             agent_ids = []
@@ -95,11 +90,11 @@ class SegmentationAgent(BaseAgent):
             else:
                 print("❌ No AGENT_ID column found in filtered agents")
             
-            # Prepare all filtered agents for profile generation
+            # All filtered agents for profile generation, as a DataFrame with real nulls;
+            # the artifact store writes it as an Arrow table (or records with nulls)
             all_filtered = []
             if len(filtered_agents) > 0:
-                all_filtered_df = filtered_agents.fillna("N/A")
-                all_filtered = all_filtered_df.to_dict('records')
+                all_filtered = filtered_agents.reset_index(drop=True)
             
             # Also prepare a small sample for display purposes
             sample_filtered = []
@@ -110,6 +105,7 @@ class SegmentationAgent(BaseAgent):
             return {
                 "success": True,
                 "total_agents": int(len(agent_df)),  # This will now be the full dataset size
+                "dataset_version": baseline.dataset_version,
                 "filtered_agents": int(len(filtered_agents)),
                 "criteria_applied": criteria,
                 "statistics": stats,
@@ -156,7 +152,7 @@ class SegmentationAgent(BaseAgent):
             criteria: Parsed criteria from GoalParser
             
         Returns:
-            Filtered DataFrame
+            Filtered DataFrame (df itself if no constraint applies; treat as read-only)
         """
         if df.empty:
             print("❌ DataFrame is empty")
@@ -165,7 +161,8 @@ class SegmentationAgent(BaseAgent):
         print(f"🔍 Starting with {len(df)} agents")
         print(f"📋 Available columns: {list(df.columns)}")
         
-        filtered_df = df.copy()
+        # Each mask builds a new frame, so df (the shared population) is never modified
+        filtered_df = df
         constraints = criteria.get('constraints', [])
         
         # Field name mapping from goal parser to actual DataFrame columns
@@ -220,7 +217,9 @@ class SegmentationAgent(BaseAgent):
         print(f"🎯 Final result: {len(filtered_df)} agents after filtering")
         return filtered_df
     
-    def _generate_segmentation_stats(self, original_df: pd.DataFrame, filtered_df: pd.DataFrame, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_segmentation_stats(self, original_df: pd.DataFrame, filtered_df: pd.DataFrame,
+                                     criteria: Dict[str, Any],
+                                     baseline: Optional[PopulationBaseline] = None) -> Dict[str, Any]:
         """
         Generate segmentation statistics.
         
@@ -228,10 +227,14 @@ class SegmentationAgent(BaseAgent):
             original_df: Original agent DataFrame
             filtered_df: Filtered agent DataFrame
             criteria: Applied criteria
+            baseline: Cached population aggregates (computed from original_df if omitted)
             
         Returns:
             Statistics dictionary
         """
+        if baseline is None:
+            baseline = get_population_baseline(original_df)
+
         stats = {
             "segmentation_rate": float(len(filtered_df) / len(original_df)) if len(original_df) > 0 else 0.0,
             "criteria_count": int(len(criteria.get('constraints', []))),
@@ -249,19 +252,31 @@ class SegmentationAgent(BaseAgent):
         for field in key_fields:
             actual_field = field_mapping.get(field, field)
             if actual_field in original_df.columns and actual_field in filtered_df.columns:
-                stats[f"{field}_original"] = {
-                    "mean": float(original_df[actual_field].mean()) if pd.notna(original_df[actual_field].mean()) else None,
-                    "median": float(original_df[actual_field].median()) if pd.notna(original_df[actual_field].median()) else None,
-                    "min": float(original_df[actual_field].min()) if pd.notna(original_df[actual_field].min()) else None,
-                    "max": float(original_df[actual_field].max()) if pd.notna(original_df[actual_field].max()) else None
-                }
+                stats[f"{field}_original"] = baseline.summary(actual_field)
                 
                 if len(filtered_df) > 0:
-                    stats[f"{field}_filtered"] = {
-                        "mean": float(filtered_df[actual_field].mean()) if pd.notna(filtered_df[actual_field].mean()) else None,
-                        "median": float(filtered_df[actual_field].median()) if pd.notna(filtered_df[actual_field].median()) else None,
-                        "min": float(filtered_df[actual_field].min()) if pd.notna(filtered_df[actual_field].min()) else None,
-                        "max": float(filtered_df[actual_field].max()) if pd.notna(filtered_df[actual_field].max()) else None
-                    }
+                    stats[f"{field}_filtered"] = self._summarize_column(filtered_df[actual_field])
         
         return stats
+
+    def _summarize_column(self, series: pd.Series) -> Dict[str, Any]:
+        """
+        Compute mean/median/min/max for a column, evaluating each aggregate once.
+        
+        Values are coerced to numbers (non-numeric entries become missing),
+        matching the population baseline.
+        
+        Args:
+            series: Column to summarize
+            
+        Returns:
+            Summary dictionary with None for missing values
+        """
+        series = pd.to_numeric(series, errors='coerce')
+        summary = {
+            "mean": series.mean(),
+            "median": series.median(),
+            "min": series.min(),
+            "max": series.max()
+        }
+        return {key: float(value) if pd.notna(value) else None for key, value in summary.items()}
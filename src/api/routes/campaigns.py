@@ -1,8 +1,11 @@
 """Campaign management endpoints."""
 
-from fastapi import APIRouter, HTTPException, Path
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
 
 from src.services import CampaignService
@@ -10,6 +13,21 @@ from src.services import CampaignService
 router = APIRouter()
 campaign_service = CampaignService()
 
+# Seconds between checks for newly streamed narrative text
+STREAM_POLL_INTERVAL = 0.1
+
+# Seconds without events after which /stream sends a keepalive comment
+STREAM_KEEPALIVE_INTERVAL = 15.0
+
+# Longest a /stream connection is held open, in seconds (clients reconnect)
+STREAM_MAX_DURATION = 900.0
+
+# Long-poll of /plan: default wait in seconds
+PLAN_LONG_POLL_TIMEOUT = 25.0
+
+# Plan statuses after which a plan no longer changes
+FINISHED_STATUSES = ('completed', 'failed')
+
 
 class Campaign(BaseModel):
     """Response model for campaign details."""
@@ -34,6 +52,11 @@ class CampaignRequest(BaseModel):
         description="Optional custom campaign name. If not provided, a name will be generated based on the goal.",
         example="Q4 High-Value Retention Campaign"
     )
+    priority: str = Field(
+        "interactive",
+        description="LLM scheduling priority: 'interactive' (user waiting) or 'batch' (bulk jobs)",
+        pattern="^(interactive|batch)$"
+    )
 
 
 class TodoItem(BaseModel):
@@ -46,6 +69,7 @@ class TodoItem(BaseModel):
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     error: Optional[str] = None
+    llm_metrics: Optional[Dict[str, Any]] = None
 
 
 class CampaignResponse(BaseModel):
@@ -153,7 +177,8 @@ async def create_campaign(request: CampaignRequest) -> CampaignResponse:
     try:
         result = campaign_service.create_campaign(
             goal=request.goal,
-            campaign_name=request.campaign_name
+            campaign_name=request.campaign_name,
+            priority=request.priority
         )
 
         # Return immediately with pending status
@@ -175,18 +200,40 @@ async def create_campaign(request: CampaignRequest) -> CampaignResponse:
 
 
 @router.get("/{campaign_id}/plan")
-async def get_campaign_plan(campaign_id: str = Path(..., description="Campaign ID")):
+async def get_campaign_plan(
+    response: Response,
+    campaign_id: str = Path(..., description="Campaign ID"),
+    since_version: Optional[int] = Query(
+        None,
+        description="Long-poll: wait until the plan version exceeds this value (X-Plan-Version of the last response)"
+    ),
+    timeout: float = Query(PLAN_LONG_POLL_TIMEOUT, ge=0, le=60, description="Long-poll wait in seconds")
+):
     """
     Get the execution plan for a specific campaign with current status.
 
+    With since_version, the request returns as soon as the plan changes or
+    after the timeout, whichever comes first (finished plans return at
+    once). The plan version is returned in the X-Plan-Version header.
+
     Args:
         campaign_id: The ID of the campaign
+        since_version: Plan version the client already has
+        timeout: Maximum seconds to wait for a change
 
     Returns:
         Plan with step statuses
     """
     try:
-        status = campaign_service.get_campaign_status(campaign_id)
+        # May read an evicted plan from the store; keep that off the event loop
+        loop = asyncio.get_running_loop()
+        status = await loop.run_in_executor(None, campaign_service.get_campaign_projection, campaign_id)
+
+        if (since_version is not None and status.get('success') and status['version'] <= since_version
+                and status['status'] not in FINISHED_STATUSES):
+            # Woken by the planner when the plan changes, no polling
+            await campaign_service.wait_for_campaign_change(campaign_id, since_version, timeout)
+            status = await loop.run_in_executor(None, campaign_service.get_campaign_projection, campaign_id)
 
         if not status.get('success'):
             raise HTTPException(
@@ -194,6 +241,7 @@ async def get_campaign_plan(campaign_id: str = Path(..., description="Campaign I
                 detail=status.get('error', 'Campaign not found')
             )
 
+        response.headers["X-Plan-Version"] = str(status['version'])
         return status.get('steps', [])
     except HTTPException:
         raise
@@ -216,7 +264,9 @@ async def get_campaign_status(campaign_id: str = Path(..., description="Campaign
         Campaign status (pending, executing, completed, failed)
     """
     try:
-        status = campaign_service.get_campaign_status(campaign_id)
+        # May read the plan from the store; keep that off the event loop
+        loop = asyncio.get_running_loop()
+        status = await loop.run_in_executor(None, campaign_service.get_campaign_projection, campaign_id)
 
         if not status.get('success'):
             raise HTTPException(
@@ -228,7 +278,8 @@ async def get_campaign_status(campaign_id: str = Path(..., description="Campaign
             "campaign_id": status.get('campaign_id'),
             "status": status.get('status'),
             "created_at": status.get('created_at'),
-            "error": status.get('error')
+            "error": status.get('error'),
+            "version": status.get('version')
         }
     except HTTPException:
         raise
@@ -239,6 +290,82 @@ async def get_campaign_status(campaign_id: str = Path(..., description="Campaign
         )
 
 
+@router.get("/{campaign_id}/stream")
+async def stream_campaign_narratives(
+    request: Request,
+    campaign_id: str = Path(..., description="Campaign ID")
+):
+    """
+    Stream LLM narrative text (segment description, strategy narratives) as it is generated.
+
+    Server-sent events: 'partial' events carry {"key", "text"} deltas, 'replace'
+    events carry {"key", "text"} superseding everything streamed for the key
+    (e.g. a template narrative after a failed stream), a final 'done' event
+    carries the plan status once the campaign completes or fails. Idle
+    connections get a ': ping' comment every STREAM_KEEPALIVE_INTERVAL
+    seconds; after STREAM_MAX_DURATION seconds a 'timeout' event carrying
+    the current status ends the stream and the client should reconnect.
+
+    Args:
+        request: Incoming request (checked for client disconnects)
+        campaign_id: The ID of the campaign
+
+    Returns:
+        text/event-stream response
+    """
+    loop = asyncio.get_running_loop()
+    initial = await loop.run_in_executor(None, campaign_service.get_campaign_stream, campaign_id)
+    if not initial.get('success'):
+        raise HTTPException(
+            status_code=404,
+            detail=initial.get('error', 'Campaign not found')
+        )
+
+    async def events() -> AsyncIterator[str]:
+        offsets: Dict[str, int] = {}
+        revisions: Dict[str, int] = {}
+        started = last_sent = loop.time()
+        while not await request.is_disconnected():
+            # Plans run by another worker are read from the plan store
+            update = await loop.run_in_executor(
+                None, campaign_service.get_campaign_stream, campaign_id, offsets, revisions
+            )
+            if not update.get('success'):
+                break
+
+            for key, text in update['replaced'].items():
+                offsets[key] = len(text)
+                revisions[key] = update['revisions'][key]
+                last_sent = loop.time()
+                yield f"event: replace\ndata: {json.dumps({'key': key, 'text': text})}\n\n"
+
+            for key, text in update['deltas'].items():
+                offsets[key] = offsets.get(key, 0) + len(text)
+                last_sent = loop.time()
+                yield f"event: partial\ndata: {json.dumps({'key': key, 'text': text})}\n\n"
+
+            # Deltas read together with the final status are already flushed above
+            if update['status'] in FINISHED_STATUSES:
+                yield f"event: done\ndata: {json.dumps({'status': update['status']})}\n\n"
+                break
+
+            now = loop.time()
+            if now - started >= STREAM_MAX_DURATION:
+                yield f"event: timeout\ndata: {json.dumps({'status': update['status']})}\n\n"
+                break
+            if now - last_sent >= STREAM_KEEPALIVE_INTERVAL:
+                last_sent = now
+                yield ": ping\n\n"
+
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{campaign_id}/result")
 async def get_campaign_result(campaign_id: str = Path(..., description="Campaign ID")):
     """
@@ -1,9 +1,13 @@
 """Health check endpoint."""
 
+from typing import Dict, Any, Optional
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from src.agents.goal_parser import get_goal_cache
 from src.core.config import get_settings
+from src.llm import get_response_cache, get_rate_limiter_stats, get_prompt_token_stats, get_llm_call_stats
 
 router = APIRouter()
 settings = get_settings()
@@ -15,6 +19,11 @@ class HealthResponse(BaseModel):
     app_name: str
     version: str
     environment: str
+    llm_cache: Optional[Dict[str, Any]] = None
+    llm_rate_limits: Optional[Dict[str, Any]] = None
+    llm_prompt_tokens: Optional[Dict[str, Any]] = None
+    llm_calls: Optional[Dict[str, Any]] = None
+    goal_cache: Optional[Dict[str, Any]] = None
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -25,9 +34,17 @@ async def health_check():
     Returns:
         HealthResponse: Application health status
     """
+    response_cache = get_response_cache()
+    goal_cache = get_goal_cache()
+
     return HealthResponse(
         status="healthy",
         app_name=settings.app_name,
         version=settings.app_version,
-        environment=settings.environment
+        environment=settings.environment,
+        llm_cache=response_cache.stats() if response_cache else None,
+        llm_rate_limits=get_rate_limiter_stats() or None,
+        llm_prompt_tokens=get_prompt_token_stats() or None,
+        llm_calls=get_llm_call_stats() or None,
+        goal_cache=goal_cache.stats() if goal_cache else None
     )
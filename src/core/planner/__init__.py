@@ -2,11 +2,20 @@
 
 from src.core.planner.models import PlanStep, CampaignPlan, PlanStatus, StepStatus
 from src.core.planner.planner_service import CampaignPlanner
+from src.core.planner.store import PlanStore, SQLitePlanStore, PostgresPlanStore, create_plan_store
+from src.core.planner.artifacts import ArtifactStore, get_artifact_store, is_artifact
 
 __all__ = [
     'PlanStep',
     'CampaignPlan',
     'PlanStatus',
     'StepStatus',
-    'CampaignPlanner'
+    'CampaignPlanner',
+    'PlanStore',
+    'SQLitePlanStore',
+    'PostgresPlanStore',
+    'create_plan_store',
+    'ArtifactStore',
+    'get_artifact_store',
+    'is_artifact'
 ]
@@ -0,0 +1,351 @@
+"""Out-of-band storage for large step outputs (Arrow IPC or gzip-compressed JSON files)."""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+import pandas as pd
+
+from src.core.config import get_settings
+from src.core.planner.store import dumps
+
+# Key marking a dict as an artifact handle
+ARTIFACT_KEY = '__artifact__'
+
+# Nesting depth kept inline: step result -> agent output -> fields (the fields are offloaded)
+_INLINE_DEPTH = 2
+
+# Records serialized to estimate the size of a list
+_SIZE_SAMPLE = 20
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+# Seconds between sweeps for expired artifact directories
+_CLEANUP_INTERVAL = 3600
+
+
+def is_artifact(value: Any) -> bool:
+    """Whether a value is an artifact handle."""
+    return isinstance(value, dict) and ARTIFACT_KEY in value
+
+
+def _frame_records(df: pd.DataFrame) -> list:
+    """Records of a DataFrame with missing values as None (JSON null)."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate JSON size of a value; lists are extrapolated from a sample."""
+    if isinstance(value, list) and len(value) > _SIZE_SAMPLE:
+        sample = value[:_SIZE_SAMPLE]
+        return len(dumps(sample)) * len(value) // len(sample)
+    return len(dumps(value))
+
+
+def _import_pyarrow() -> Any:
+    """pyarrow modules, or None if not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        return pa
+    except ImportError:
+        return None
+
+
+class ArtifactStore:
+    """
+    Local files holding step outputs too large to keep in the plan.
+
+    Offloaded values are replaced by handles: small dicts with the file
+    name, format, size and a summary (row count and columns for tables,
+    keys for dicts). DataFrames and lists of records are written as
+    uncompressed Arrow IPC files so readers memory-map them instead of
+    parsing; anything else, or tables Arrow can't type, goes to
+    gzip-compressed JSON. DataFrames kept inline become records with nulls.
+
+    Files are local to this host: a plan resumed or read on another host
+    needs the artifact directory on a shared volume. Campaign directories
+    untouched for ``retention_days`` are deleted.
+    """
+
+    def __init__(self, path: str, threshold_bytes: int = 262144, enabled: bool = True, use_arrow: bool = True,
+                 retention_days: Optional[float] = 7):
+        """
+        Initialize artifact store.
+
+        Args:
+            path: Directory for artifact files
+            threshold_bytes: Outputs with a larger (estimated) JSON size are offloaded
+            enabled: Offload outputs (handles are resolved either way)
+            use_arrow: Write tables as Arrow IPC when pyarrow is installed
+            retention_days: Age after which campaign directories are deleted (None keeps them)
+        """
+        self.path = Path(path)
+        self.threshold_bytes = threshold_bytes
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self._pa = _import_pyarrow() if use_arrow else None
+        if use_arrow and self._pa is None:
+            print("⚠️  pyarrow not installed, writing artifacts as compressed JSON")
+
+        self._last_cleanup = 0.0
+        self._cleanup_lock = threading.Lock()
+        self.cleanup()
+
+    def offload(self, campaign_id: str, name: str, result: Any) -> Any:
+        """
+        Move the large fields of a step result to artifact files.
+
+        Args:
+            campaign_id: Campaign identifier
+            name: Result name (agent name)
+            result: Step result, e.g. {"segmentation": {..., "all_filtered": [...]}}
+
+        Returns:
+            Copy of the result with large fields replaced by handles (and
+            DataFrames kept inline converted to records)
+        """
+        return self._offload(campaign_id, name, result, 0)
+
+    def _offload(self, campaign_id: str, key: str, value: Any, depth: int) -> Any:
+        """Offload a value if it sits at the field level and is over the threshold."""
+        if depth < _INLINE_DEPTH:
+            if not isinstance(value, dict) or is_artifact(value):
+                return value
+            return {
+                field: self._offload(campaign_id, f"{key}.{field}", item, depth + 1)
+                for field, item in value.items()
+            }
+
+        if isinstance(value, pd.DataFrame):
+            # Arrow is built from the frame itself, keeping its dtypes and real nulls
+            if self.enabled and len(value) and self._estimate_frame_size(value) > self.threshold_bytes:
+                return self.put(campaign_id, key, value)
+            return _frame_records(value)
+
+        if self.enabled and isinstance(value, (list, dict)) and value and _estimate_size(value) > self.threshold_bytes:
+            return self.put(campaign_id, key, value)
+        return value
+
+    @staticmethod
+    def _estimate_frame_size(df: pd.DataFrame) -> int:
+        """Approximate JSON size of a DataFrame's records, extrapolated from its first rows."""
+        sample = _frame_records(df.head(_SIZE_SAMPLE))
+        return len(dumps(sample)) * len(df) // len(sample)
+
+    def put(self, campaign_id: str, key: str, value: Any) -> Dict[str, Any]:
+        """
+        Write a value to an artifact file.
+
+        Args:
+            campaign_id: Campaign identifier
+            key: Name of the value within the campaign (e.g. "SegmentationAgent.segmentation.all_filtered")
+            value: DataFrame, list of records, dict or other JSON-serializable value
+
+        Returns:
+            Artifact handle
+        """
+        self._maybe_cleanup()
+
+        directory = self.path / _UNSAFE_NAME.sub('_', campaign_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = _UNSAFE_NAME.sub('_', key)
+
+        handle: Dict[str, Any] = {}
+        if isinstance(value, pd.DataFrame):
+            handle["rows"] = len(value)
+            handle["columns"] = [str(column) for column in value.columns]
+        elif isinstance(value, list):
+            handle["rows"] = len(value)
+            if value and isinstance(value[0], dict):
+                handle["columns"] = list(value[0].keys())
+        elif isinstance(value, dict):
+            handle["keys"] = list(value.keys())
+
+        table = self._to_table(value)
+        if table is not None:
+            file_name = f"{stem}.arrow"
+            self._write(directory / file_name, lambda sink: self._write_table(sink, table))
+            handle["format"] = "arrow"
+            handle["columns"] = table.schema.names
+        else:
+            file_name = f"{stem}.json.gz"
+            if isinstance(value, pd.DataFrame):
+                value = _frame_records(value)
+            data = gzip.compress(dumps(value).encode('utf-8'))
+            self._write(directory / file_name, lambda sink: sink.write(data))
+            handle["format"] = "json.gz"
+
+        handle[ARTIFACT_KEY] = f"{directory.name}/{file_name}"
+        handle["bytes"] = (directory / file_name).stat().st_size
+        return handle
+
+    def _to_table(self, value: Any) -> Any:
+        """Arrow table for a DataFrame or list of records, or None to write JSON instead."""
+        if self._pa is None:
+            return None
+
+        if isinstance(value, pd.DataFrame):
+            try:
+                table = self._pa.Table.from_pandas(value, preserve_index=False)
+            except (self._pa.ArrowException, TypeError, ValueError):
+                # Object columns mixing types stay JSON
+                return None
+            if any(self._pa.types.is_nested(field.type) for field in table.schema):
+                return None
+            return table
+
+        if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+            return None
+
+        # Arrow takes the columns from the first record; ragged records would lose keys
+        columns = list(value[0].keys())
+        if any(not isinstance(record, dict) or list(record.keys()) != columns for record in value):
+            return None
+
+        try:
+            table = self._pa.Table.from_pylist(value)
+        except (self._pa.ArrowException, TypeError, ValueError):
+            # Mixed-type columns (e.g. numbers filled with "N/A") stay JSON
+            return None
+
+        # Nested dicts come back with the union of their keys; keep them JSON too
+        if any(self._pa.types.is_nested(field.type) for field in table.schema):
+            return None
+        return table
+
+    def _write_table(self, sink: Any, table: Any) -> None:
+        """Write a table in the Arrow IPC file format (uncompressed, so it can be memory-mapped)."""
+        with self._pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    @staticmethod
+    def _write(path: Path, write: Callable[[Any], Any]) -> None:
+        """Write a file atomically (readers never see a partial artifact)."""
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, 'wb') as sink:
+                write(sink)
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _maybe_cleanup(self) -> None:
+        """Run cleanup if the last sweep is older than the cleanup interval."""
+        if self.retention_days is not None and time.time() - self._last_cleanup > _CLEANUP_INTERVAL:
+            self.cleanup()
+
+    def cleanup(self) -> int:
+        """
+        Delete campaign directories not modified for retention_days.
+
+        Plans still referencing them can no longer load those results.
+
+        Returns:
+            Number of directories deleted
+        """
+        if self.retention_days is None or not self._cleanup_lock.acquire(blocking=False):
+            return 0
+
+        removed = 0
+        try:
+            self._last_cleanup = time.time()
+            if not self.path.is_dir():
+                return 0
+            cutoff = time.time() - self.retention_days * 86400
+            for directory in self.path.iterdir():
+                try:
+                    if directory.is_dir() and directory.stat().st_mtime < cutoff:
+                        shutil.rmtree(directory)
+                        removed += 1
+                except OSError as e:
+                    print(f"⚠️  Failed to delete expired artifacts {directory}: {e}")
+        finally:
+            self._cleanup_lock.release()
+
+        if removed:
+            print(f"🔄 Deleted {removed} expired artifact directories")
+        return removed
+
+    def load(self, handle: Dict[str, Any], as_frame: bool = False) -> Any:
+        """
+        Read an artifact.
+
+        Args:
+            handle: Artifact handle
+            as_frame: Return tables as a DataFrame instead of a list of records
+
+        Returns:
+            The stored value
+        """
+        path = self.path / handle[ARTIFACT_KEY]
+
+        if handle.get("format") == "arrow":
+            pa = self._pa or _import_pyarrow()
+            if pa is None:
+                raise RuntimeError(f"pyarrow is required to read artifact {handle[ARTIFACT_KEY]}")
+            with pa.memory_map(str(path), 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            return table.to_pandas() if as_frame else table.to_pylist()
+
+        with gzip.open(path, 'rt', encoding='utf-8') as source:
+            value = json.load(source)
+        if as_frame and isinstance(value, list):
+            return pd.DataFrame(value)
+        return value
+
+    def resolve(self, value: Any, as_frame: bool = False) -> Any:
+        """
+        Replace the artifact handles in a step result (or part of one) with their values.
+
+        Args:
+            value: Value possibly containing handles
+            as_frame: Load tables as DataFrames
+
+        Returns:
+            Value with every handle loaded (unchanged if there were none)
+        """
+        if is_artifact(value):
+            return self.load(value, as_frame)
+        if isinstance(value, dict):
+            return {key: self.resolve(item, as_frame) for key, item in value.items()}
+        return value
+
+
+_artifact_store: Optional[ArtifactStore] = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Get the process-wide artifact store configured under planner.artifacts.
+
+    Returns:
+        ArtifactStore instance (offloading nothing if disabled)
+    """
+    global _artifact_store
+
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            settings = get_settings()
+            config = settings.get('planner.artifacts') or {}
+            _artifact_store = ArtifactStore(
+                path=config.get('path', './data/cache/artifacts'),
+                threshold_bytes=config.get('threshold_bytes', 262144),
+                enabled=config.get('enabled', True),
+                use_arrow=config.get('format', 'arrow') == 'arrow',
+                retention_days=config.get('retention_days', 7)
+            )
+            if _artifact_store.enabled and settings.get('planner.store', 'sqlite') == 'postgres':
+                # The plan store is shared, the artifact files are not (unless the path is a shared volume)
+                print(f"⚠️  Plan artifacts are local files under {_artifact_store.path}; with several hosts "
+                      "it must be a shared volume, or plans resumed elsewhere can't load their results")
+        return _artifact_store
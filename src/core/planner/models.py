@@ -1,7 +1,8 @@
 """Data models for campaign planning."""
 
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 from enum import Enum
 
@@ -22,6 +23,11 @@ class StepStatus(Enum):
     FAILED = "failed"
 
 
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp written by to_dict()."""
+    return datetime.fromisoformat(value) if value else None
+
+
 @dataclass
 class PlanStep:
     """Represents a single step in the execution plan."""
@@ -34,6 +40,8 @@ class PlanStep:
     completed_at: Optional[datetime] = None
     result: Any = None
     error: Optional[str] = None
+    llm_metrics: Dict[str, Any] = field(default_factory=dict)  # LLM call summary for this step
+    depends_on: List[int] = field(default_factory=list)  # steps whose results this step reads
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -45,9 +53,37 @@ class PlanStep:
             "status": self.status,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "error": self.error
+            "error": self.error,
+            "llm_metrics": self.llm_metrics,
+            "depends_on": self.depends_on
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], result: Any = None) -> 'PlanStep':
+        """
+        Rebuild a step from its to_dict() form.
+
+        Args:
+            data: Step dictionary
+            result: Step result (stored separately, see CampaignPlan.to_record)
+
+        Returns:
+            PlanStep instance
+        """
+        return cls(
+            step=data["step"],
+            description=data["description"],
+            agent_name=data["agent"],
+            active_form=data["active_form"],
+            status=data.get("status", StepStatus.PENDING.value),
+            started_at=_parse_datetime(data.get("started_at")),
+            completed_at=_parse_datetime(data.get("completed_at")),
+            result=result,
+            error=data.get("error"),
+            llm_metrics=data.get("llm_metrics") or {},
+            depends_on=data.get("depends_on") or []
+        )
+
 
 @dataclass
 class CampaignPlan:
@@ -60,6 +96,15 @@ class CampaignPlan:
     steps: List[PlanStep] = field(default_factory=list)
     results: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
+    priority: str = "interactive"  # LLM scheduling priority, kept so a resumed run keeps it
+    partial_outputs: Dict[str, List[str]] = field(default_factory=dict)  # streamed LLM text chunks by output key
+    partial_revisions: Dict[str, int] = field(default_factory=dict)  # bumped when a key's text is replaced
+    results_evicted: bool = False  # results dropped from memory; the plan store holds them
+    checkpointed: Set[str] = field(default_factory=set, repr=False)  # results keys already in the plan store
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)  # guards mutations
+    persist_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)  # orders store writes
+    snapshot: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)  # published status, never mutated
+    version: int = 0  # incremented on every published change
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -70,9 +115,78 @@ class CampaignPlan:
             "created_at": self.created_at.isoformat(),
             "status": self.status,
             "steps": [step.to_dict() for step in self.steps],
-            "error": self.error
+            "error": self.error,
+            "version": self.version
         }
 
+    @property
+    def is_finished(self) -> bool:
+        """Whether the plan reached a terminal status."""
+        return self.status in (PlanStatus.COMPLETED.value, PlanStatus.FAILED.value)
+
+    def status_snapshot(self) -> Dict[str, Any]:
+        """
+        Build the status view published to readers (everything but results).
+
+        Returns:
+            New dictionary; callers must treat it as immutable once published
+        """
+        return {
+            "success": True,
+            "campaign_id": self.campaign_id,
+            "campaign_name": self.campaign_name,
+            "goal": self.goal,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "steps": [step.to_dict() for step in self.steps],
+            "error": self.error,
+            "version": self.version
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Convert to the plan store's light record (everything except results).
+
+        Step results are not included: they are the values of ``results``
+        (keyed by agent name), which the store keeps separately.
+        """
+        record = self.to_dict()
+        record["priority"] = self.priority
+        record["partial_outputs"] = {key: "".join(chunks) for key, chunks in self.partial_outputs.items()}
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], results: Optional[Dict[str, Any]] = None) -> 'CampaignPlan':
+        """
+        Rebuild a plan from a plan store record.
+
+        Args:
+            record: Light record from to_record()
+            results: Plan results, or None if they were not loaded
+
+        Returns:
+            CampaignPlan instance (results_evicted set when results is None)
+        """
+        step_results = results or {}
+        return cls(
+            campaign_id=record["campaign_id"],
+            campaign_name=record["campaign_name"],
+            goal=record["goal"],
+            created_at=_parse_datetime(record["created_at"]),
+            status=record.get("status", PlanStatus.PENDING.value),
+            steps=[
+                PlanStep.from_dict(step, step_results.get(step["agent"]))
+                for step in record.get("steps", [])
+            ],
+            results=dict(step_results),
+            error=record.get("error"),
+            priority=record.get("priority", "interactive"),
+            partial_outputs={key: [text] for key, text in (record.get("partial_outputs") or {}).items()},
+            version=record.get("version", 0),
+            results_evicted=results is None,
+            checkpointed=set(step_results)
+        )
+
     def get_step(self, step_num: int) -> Optional[PlanStep]:
         """Get a specific step by number."""
         for step in self.steps:
@@ -1,11 +1,25 @@
 """Campaign planner for managing campaign execution plans."""
 
+import asyncio
 import threading
+import time
 import uuid
-from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
+from src.core.config import get_settings
 from src.core.planner.models import CampaignPlan, PlanStep, PlanStatus, StepStatus
+from src.core.planner.store import UNFINISHED_STATUSES, PlanStore, create_plan_store
+
+# Seconds between store reads while waiting on a plan run by another worker
+STORE_POLL_INTERVAL = 1.0
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Complete a long-poll future (on its event loop) unless it was cancelled."""
+    if not future.done():
+        future.set_result(None)
 
 
 class CampaignPlanner:
@@ -14,10 +28,20 @@ class CampaignPlanner:
 
     Responsibilities:
     - Generate unique campaign IDs
-    - Create execution plans (5 steps)
-    - Store plans in memory
+    - Create execution plans (5 steps with declared dependencies)
+    - Persist plans to the configured plan store
     - Track execution status
-    - Thread-safe access to plans
+    - Thread-safe access to plans (per-plan locks, lock-free status reads)
+
+    Recently used plans are kept in memory (an LRU bounded by
+    ``planner.max_hot_plans``; running plans are never evicted). Once a plan
+    finishes and its results are persisted, the in-memory copy drops them
+    and they are read back from the store on demand.
+
+    Plans created or claimed here are owned by this process until they
+    finish; a heartbeat thread refreshes their update time in the store
+    every ``planner.heartbeat_interval`` seconds, so other workers never
+    take them for abandoned.
     """
 
     _instance = None
@@ -37,8 +61,25 @@ class CampaignPlanner:
         if self._initialized:
             return
 
-        self.campaign_plans: Dict[str, CampaignPlan] = {}
+        settings = get_settings()
+
+        # Hot plans, least recently used first
+        self.campaign_plans: 'OrderedDict[str, CampaignPlan]' = OrderedDict()
+        self.max_hot_plans = settings.get('planner.max_hot_plans', 128)
+        self.store: PlanStore = create_plan_store()
+        # Guards only the hot-plan LRU; each plan has its own lock
         self.access_lock = threading.Lock()
+
+        # Long-poll waiters (event loop, future) per campaign, woken by _publish
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._waiters_lock = threading.Lock()
+
+        # Unfinished plans this process runs (or will run), kept fresh in the store
+        self._owned: Set[str] = set()
+        self._owned_lock = threading.Lock()
+        self.heartbeat_interval = settings.get('planner.heartbeat_interval', 60)
+        if self.heartbeat_interval:
+            threading.Thread(target=self._heartbeat, name="plan-heartbeat", daemon=True).start()
         self._initialized = True
 
     @classmethod
@@ -46,13 +87,15 @@ class CampaignPlanner:
         """Get the singleton instance."""
         return cls()
 
-    def create_plan(self, goal: str, campaign_name: Optional[str] = None) -> Tuple[str, CampaignPlan]:
+    def create_plan(self, goal: str, campaign_name: Optional[str] = None,
+                    priority: str = "interactive") -> Tuple[str, CampaignPlan]:
         """
         Create a new campaign execution plan.
 
         Args:
             goal: Natural language campaign goal
             campaign_name: Optional campaign name
+            priority: LLM scheduling priority ('interactive' or 'batch')
 
         Returns:
             Tuple of (campaign_id, plan)
@@ -64,37 +107,42 @@ class CampaignPlanner:
         if not campaign_name:
             campaign_name = f"Campaign {datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-        # Create plan steps
+        # Create plan steps; independent steps (goal parsing, data load) may run concurrently
         steps = [
             PlanStep(
                 step=1,
                 description="Parse campaign goal and extract criteria",
                 agent_name="GoalParser",
-                active_form="Parsing campaign goal"
+                active_form="Parsing campaign goal",
+                depends_on=[]
             ),
             PlanStep(
                 step=2,
                 description="Load agent population data from CSV files",
                 agent_name="DataLoader",
-                active_form="Loading agent data"
+                active_form="Loading agent data",
+                depends_on=[]
             ),
             PlanStep(
                 step=3,
                 description="Filter agents based on parsed criteria",
                 agent_name="SegmentationAgent",
-                active_form="Segmenting agent population"
+                active_form="Segmenting agent population",
+                depends_on=[1, 2]
             ),
             PlanStep(
                 step=4,
                 description="Generate comprehensive agent profiles and insights",
                 agent_name="ProfileGeneratorAgent",
-                active_form="Analyzing segment characteristics"
+                active_form="Analyzing segment characteristics",
+                depends_on=[1, 2, 3]
             ),
             PlanStep(
                 step=5,
                 description="Develop comprehensive campaign strategy and recommendations",
                 agent_name="CampaignStrategistAgent",
-                active_form="Creating campaign strategy"
+                active_form="Creating campaign strategy",
+                depends_on=[1, 4]
             )
         ]
 
@@ -105,27 +153,239 @@ class CampaignPlanner:
             goal=goal,
             created_at=datetime.now(),
             status=PlanStatus.PENDING.value,
-            steps=steps
+            steps=steps,
+            priority=priority
         )
 
-        # Store in memory
-        with self.access_lock:
-            self.campaign_plans[campaign_id] = plan
+        # Keep hot and persist
+        self._publish(plan)
+        self._remember(plan)
+        self._persist(plan)
+        with self._owned_lock:
+            self._owned.add(campaign_id)
 
         return campaign_id, plan
 
-    def get_plan(self, campaign_id: str) -> Optional[CampaignPlan]:
+    def get_plan(self, campaign_id: str, include_results: bool = True) -> Optional[CampaignPlan]:
         """
         Get a campaign plan by ID.
 
         Args:
             campaign_id: Campaign identifier
+            include_results: Whether the plan's results are needed (finished
+                plans are then read back from the store as a separate copy)
+
+        Returns:
+            CampaignPlan if found, None otherwise
+        """
+        plan = self._get_hot_plan(campaign_id)
+        if plan is None or not (include_results and plan.results_evicted):
+            return plan
+
+        loaded = self._read_store(campaign_id, include_results=True)
+        return CampaignPlan.from_record(*loaded) if loaded else plan
+
+    def _get_hot_plan(self, campaign_id: str, claim: bool = False) -> Optional[CampaignPlan]:
+        """
+        Get the in-memory plan, loading it from the store on a miss.
+
+        Finished plans are loaded without results and kept in memory.
+        Unfinished plans are kept in memory (in full) only if this process
+        owns them; one run by another worker is read from the store on every
+        call and never cached, so its status, version and streamed text
+        stay current here.
+
+        Args:
+            campaign_id: Campaign identifier
+            claim: Take ownership of the plan (it was just claimed from the store)
 
         Returns:
             CampaignPlan if found, None otherwise
         """
         with self.access_lock:
-            return self.campaign_plans.get(campaign_id)
+            plan = self.campaign_plans.get(campaign_id)
+            if plan is not None:
+                self.campaign_plans.move_to_end(campaign_id)
+                return plan
+
+        loaded = self._read_store(campaign_id, include_results=False)
+        if loaded is None:
+            return None
+        plan = CampaignPlan.from_record(*loaded)
+        if not plan.is_finished:
+            with self._owned_lock:
+                owned = claim or campaign_id in self._owned
+            if not owned:
+                # Running elsewhere: a read-only view at the stored version
+                plan.snapshot = plan.status_snapshot()
+                return plan
+            loaded = self._read_store(campaign_id, include_results=True)
+            if loaded is None:
+                return None
+            plan = CampaignPlan.from_record(*loaded)
+        self._publish(plan)
+
+        plan = self._remember(plan)
+        if claim:
+            # Owned only once hot, so the heartbeat never drops it as evicted
+            with self._owned_lock:
+                self._owned.add(campaign_id)
+        return plan
+
+    def _remember(self, plan: CampaignPlan) -> CampaignPlan:
+        """
+        Add a plan to the hot set unless another thread already did.
+
+        Args:
+            plan: Plan to keep in memory
+
+        Returns:
+            The plan held in memory for its campaign ID
+        """
+        with self.access_lock:
+            plan = self.campaign_plans.setdefault(plan.campaign_id, plan)
+            self._evict_plans()
+            return plan
+
+    def _publish(self, plan: CampaignPlan) -> None:
+        """
+        Bump the plan version, replace its status snapshot and wake long-pollers.
+
+        Callers hold the plan lock, except for a plan that was just built
+        (create_plan, a store load) and that no other thread can see yet.
+        """
+        plan.version += 1
+        plan.snapshot = plan.status_snapshot()
+
+        with self._waiters_lock:
+            waiters = self._waiters.pop(plan.campaign_id, [])
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # the waiter's loop is closed
+
+    async def wait_for_change(self, campaign_id: str, since_version: int, timeout: float) -> None:
+        """
+        Wait without blocking the event loop until a plan's version exceeds
+        since_version, the plan finishes, or the timeout expires.
+
+        Plans in memory wake the waiter from _publish. Plans that aren't
+        (run by another worker, or finished and evicted) are re-read from the
+        store every STORE_POLL_INTERVAL seconds, off the event loop.
+
+        Args:
+            campaign_id: Campaign identifier
+            since_version: Plan version the caller already has
+            timeout: Maximum seconds to wait
+        """
+        with self.access_lock:
+            hot = campaign_id in self.campaign_plans
+        if not hot:
+            await self._wait_for_stored_change(campaign_id, since_version, timeout)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (asyncio.get_running_loop(), future)
+        with self._waiters_lock:
+            self._waiters.setdefault(campaign_id, []).append(waiter)
+
+        try:
+            # Checked after registering, so a change published in between still wakes us
+            with self.access_lock:
+                plan = self.campaign_plans.get(campaign_id)
+            if plan is None or plan.is_finished or plan.version > since_version:
+                return
+            try:
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            with self._waiters_lock:
+                waiters = self._waiters.get(campaign_id)
+                if waiters is not None and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._waiters[campaign_id]
+
+    async def _wait_for_stored_change(self, campaign_id: str, since_version: int, timeout: float) -> None:
+        """Poll the store until a plan not held in memory changes, finishes, or the timeout expires."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            loaded = await loop.run_in_executor(None, self._read_store, campaign_id, False)
+            if loaded is None:
+                return
+            record = loaded[0]
+            if (record.get("status") not in UNFINISHED_STATUSES
+                    or record.get("version", 0) > since_version):
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(STORE_POLL_INTERVAL, remaining))
+
+    def _read_store(self, campaign_id: str, include_results: bool
+                    ) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Load a plan from the store, treating store errors as a miss."""
+        try:
+            return self.store.load(campaign_id, include_results=include_results)
+        except Exception as e:
+            print(f"⚠️  Failed to load plan {campaign_id} from the plan store: {e}")
+            return None
+
+    def _persist(self, plan: CampaignPlan, checkpoint: Optional[str] = None) -> None:
+        """
+        Write a plan's current state to the store.
+
+        Writes of one plan are serialized by its persist lock, and each takes
+        its record after acquiring it, so the latest state always lands last.
+        Finished plans are written with any results not yet checkpointed,
+        which are then dropped from memory.
+
+        Args:
+            plan: Plan to write
+            checkpoint: Results key (agent name) of a just-completed step to write
+        """
+        with plan.persist_lock:
+            with plan.lock:
+                offload = plan.is_finished and not plan.results_evicted
+                if offload:
+                    names = [name for name in plan.results if name not in plan.checkpointed]
+                else:
+                    names = [checkpoint] if checkpoint in plan.results else []
+                status = plan.status
+                record = plan.to_record()
+                results = {name: plan.results[name] for name in names}
+
+            try:
+                self.store.save(plan.campaign_id, status, record, results)
+            except Exception as e:
+                print(f"⚠️  Failed to persist plan {plan.campaign_id}: {e}")
+                return
+
+            with plan.lock:
+                plan.checkpointed.update(names)
+                if offload:
+                    # Flag first: readers that then see empty results reload them from the store
+                    plan.results_evicted = True
+                    plan.results = {}
+                    for step in plan.steps:
+                        step.result = None
+
+        if offload:
+            with self.access_lock:
+                self._evict_plans()
+
+    def _evict_plans(self) -> None:
+        """Drop least recently used finished plans beyond max_hot_plans (access lock held)."""
+        for campaign_id in list(self.campaign_plans):
+            if len(self.campaign_plans) <= self.max_hot_plans:
+                break
+            plan = self.campaign_plans[campaign_id]
+            # Only plans whose results are safely in the store
+            if plan.is_finished and plan.results_evicted:
+                del self.campaign_plans[campaign_id]
 
     def update_step_status(
         self,
@@ -133,7 +393,8 @@ class CampaignPlanner:
         step_num: int,
         status: str,
         result: Any = None,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        llm_metrics: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
         Update the status of a specific step.
@@ -144,15 +405,16 @@ class CampaignPlanner:
             status: New status (pending, in_progress, completed, failed)
             result: Optional result data from step execution
             error: Optional error message if step failed
+            llm_metrics: Optional LLM call summary for the step
 
         Returns:
             True if updated successfully, False otherwise
         """
-        with self.access_lock:
-            plan = self.campaign_plans.get(campaign_id)
-            if not plan:
-                return False
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return False
 
+        with plan.lock:
             step = plan.get_step(step_num)
             if not step:
                 return False
@@ -167,16 +429,85 @@ class CampaignPlanner:
 
             if result is not None:
                 step.result = result
-                # Also store in plan-level results for easy access
-                plan.results[step.agent_name] = result
+                # Also store in plan-level results for easy access (copy-on-write for lock-free readers)
+                plan.results = {**plan.results, step.agent_name: result}
 
             if error:
                 step.error = error
 
+            if llm_metrics:
+                step.llm_metrics = llm_metrics
+
             # Update plan status based on steps
             self._update_plan_status(plan)
+            self._publish(plan)
+
+        # Checkpoint completed steps so a restarted process can resume after them
+        checkpoint = step.agent_name if status == StepStatus.COMPLETED.value and result is not None else None
+        self._persist(plan, checkpoint=checkpoint)
+        return True
 
-            return True
+    def claim_interrupted_plans(self, stale_after: float = 360) -> List[str]:
+        """
+        Claim unfinished plans left behind by a stopped process.
+
+        A plan is claimed only if it is not running here, has not been updated
+        for ``stale_after`` seconds, and no other worker claimed it first.
+
+        Args:
+            stale_after: Seconds since a plan's last update before it is
+                considered abandoned
+
+        Returns:
+            Campaign IDs to resume
+        """
+        try:
+            unfinished = self.store.list_unfinished()
+        except Exception as e:
+            print(f"⚠️  Failed to list unfinished plans: {e}")
+            return []
+
+        claimed = []
+        now = time.time()
+        for campaign_id, updated_at in unfinished:
+            with self.access_lock:
+                if campaign_id in self.campaign_plans:
+                    continue
+            if now - updated_at < stale_after:
+                continue
+            try:
+                if self.store.claim(campaign_id, updated_at):
+                    claimed.append(campaign_id)
+            except Exception as e:
+                print(f"⚠️  Failed to claim plan {campaign_id}: {e}")
+
+        for campaign_id in claimed:
+            # Hold claimed plans hot (unfinished plans are never evicted) until they run
+            self._get_hot_plan(campaign_id, claim=True)
+        return claimed
+
+    def _heartbeat(self) -> None:
+        """Refresh the store update time of owned unfinished plans, forever (daemon thread)."""
+        while True:
+            time.sleep(self.heartbeat_interval)
+
+            with self._owned_lock:
+                owned = list(self._owned)
+            running = []
+            for campaign_id in owned:
+                with self.access_lock:
+                    plan = self.campaign_plans.get(campaign_id)
+                if plan is None or plan.is_finished:
+                    with self._owned_lock:
+                        self._owned.discard(campaign_id)
+                else:
+                    running.append(campaign_id)
+
+            if running:
+                try:
+                    self.store.touch(running)
+                except Exception as e:
+                    print(f"⚠️  Failed to refresh running plans in the plan store: {e}")
 
     def update_plan_status(
         self,
@@ -195,47 +526,170 @@ class CampaignPlanner:
         Returns:
             True if updated successfully, False otherwise
         """
-        with self.access_lock:
-            plan = self.campaign_plans.get(campaign_id)
-            if not plan:
-                return False
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return False
 
+        with plan.lock:
             plan.status = status
             if error:
                 plan.error = error
+            self._publish(plan)
+
+        self._persist(plan)
+        return True
+
+    def append_partial_output(self, campaign_id: str, key: str, text: str) -> bool:
+        """
+        Append streamed LLM text to a partial output of a plan.
+
+        Chunks are appended to the key's list in place (no copy of the text
+        so far), so a narrative of n chunks costs O(n) to collect.
+
+        Args:
+            campaign_id: Campaign identifier
+            key: Output key (e.g. 'segment_description', 'strategy:<segment>')
+            text: Text chunk to append
+
+        Returns:
+            True if appended successfully, False otherwise
+        """
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return False
+
+        with plan.lock:
+            chunks = plan.partial_outputs.get(key)
+            if chunks is None:
+                # New keys are added copy-on-write so readers can iterate without the lock
+                plan.partial_outputs = {**plan.partial_outputs, key: [text]}
+            else:
+                chunks.append(text)
+        return True
+
+    def replace_partial_output(self, campaign_id: str, key: str, text: str) -> bool:
+        """
+        Replace the streamed text of a partial output (e.g. with a template
+        narrative after the stream failed partway).
+
+        Readers see the key's revision change and receive the new text whole.
+
+        Args:
+            campaign_id: Campaign identifier
+            key: Output key
+            text: Text replacing everything streamed so far
+
+        Returns:
+            True if replaced successfully, False otherwise
+        """
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return False
+
+        with plan.lock:
+            plan.partial_revisions = {**plan.partial_revisions, key: plan.partial_revisions.get(key, 0) + 1}
+            plan.partial_outputs = {**plan.partial_outputs, key: [text]}
+        return True
+
+    def get_partial_outputs(self, campaign_id: str, offsets: Optional[Dict[str, int]] = None,
+                            revisions: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Get streamed LLM text produced since the given offsets.
+
+        Args:
+            campaign_id: Campaign identifier
+            offsets: Output key -> number of characters already received
+            revisions: Output key -> revision of the text already received
+
+        Returns:
+            Dictionary with plan status, new text per output key ('deltas'),
+            the full text of keys replaced since the given revision
+            ('replaced') and the current revision of every key ('revisions')
+        """
+        offsets = offsets or {}
+        revisions = revisions or {}
 
-            return True
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return {
+                "success": False,
+                "error": f"Campaign {campaign_id} not found"
+            }
+
+        # Status first: text appended before a final status is then always included
+        status = plan.snapshot["status"]
+        with plan.lock:
+            # Revisions and chunk lists are swapped together; the lists themselves only grow
+            current_revisions = plan.partial_revisions
+            partial_outputs = plan.partial_outputs
+
+        deltas = {}
+        replaced = {}
+        for key, chunks in partial_outputs.items():
+            text = "".join(list(chunks))
+            if current_revisions.get(key, 0) != revisions.get(key, 0):
+                replaced[key] = text
+            elif len(text) > offsets.get(key, 0):
+                deltas[key] = text[offsets.get(key, 0):]
+
+        return {
+            "success": True,
+            "status": status,
+            "deltas": deltas,
+            "replaced": replaced,
+            "revisions": dict(current_revisions)
+        }
+
+    def get_plan_projection(self, campaign_id: str) -> Dict[str, Any]:
+        """
+        Get the status-only view of a plan (no results), for polling.
+
+        Costs O(steps) regardless of segment size; ``version`` increases
+        with every change, so pollers can tell whether anything happened.
+
+        Args:
+            campaign_id: Campaign identifier
+
+        Returns:
+            Dictionary with plan status, steps and version
+        """
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
+            return {
+                "success": False,
+                "error": f"Campaign {campaign_id} not found"
+            }
+
+        return dict(plan.snapshot)
 
     def get_plan_status(self, campaign_id: str) -> Dict[str, Any]:
         """
         Get current status of a campaign plan.
 
+        Served from the plan's published snapshot without taking any lock.
+
         Args:
             campaign_id: Campaign identifier
 
         Returns:
             Dictionary with plan status and details
         """
-        with self.access_lock:
-            plan = self.campaign_plans.get(campaign_id)
-            if not plan:
-                return {
-                    "success": False,
-                    "error": f"Campaign {campaign_id} not found"
-                }
-
+        plan = self._get_hot_plan(campaign_id)
+        if not plan:
             return {
-                "success": True,
-                "campaign_id": plan.campaign_id,
-                "campaign_name": plan.campaign_name,
-                "goal": plan.goal,
-                "status": plan.status,
-                "created_at": plan.created_at.isoformat(),
-                "steps": [step.to_dict() for step in plan.steps],
-                "results": plan.results,
-                "error": plan.error
+                "success": False,
+                "error": f"Campaign {campaign_id} not found"
             }
 
+        snapshot = plan.snapshot
+        # Results before the flag (see _persist)
+        results = plan.results
+        if plan.results_evicted:
+            loaded = self._read_store(campaign_id, include_results=True)
+            results = loaded[1] if loaded else {}
+
+        return {**snapshot, "results": results}
+
     def _generate_campaign_id(self) -> str:
         """Generate a unique campaign ID."""
         return f"CAM{str(uuid.uuid4())[:8].upper()}"
@@ -0,0 +1,312 @@
+"""Durable storage for campaign plans (SQLite or PostgreSQL)."""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Callable, ContextManager, Iterator, List, Optional, Tuple
+
+from src.core.config import get_settings
+
+UNFINISHED_STATUSES = ('pending', 'executing')
+
+# Light plan records; results are stored per name (agent) so steps checkpoint independently
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS campaign_plans ("
+    "campaign_id TEXT PRIMARY KEY, status TEXT NOT NULL, plan TEXT NOT NULL, updated_at {real} NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS campaign_plan_results ("
+    "campaign_id TEXT NOT NULL, name TEXT NOT NULL, result TEXT NOT NULL, PRIMARY KEY (campaign_id, name))",
+)
+
+_UPSERT_PLAN = (
+    "INSERT INTO campaign_plans (campaign_id, status, plan, updated_at) "
+    "VALUES (:campaign_id, :status, :plan, :updated_at) "
+    "ON CONFLICT (campaign_id) DO UPDATE SET "
+    "status = excluded.status, plan = excluded.plan, updated_at = excluded.updated_at"
+)
+
+_UPSERT_RESULT = (
+    "INSERT INTO campaign_plan_results (campaign_id, name, result) VALUES (:campaign_id, :name, :result) "
+    "ON CONFLICT (campaign_id, name) DO UPDATE SET result = excluded.result"
+)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values json can't: numpy scalars/arrays, timestamps, DataFrames."""
+    if hasattr(value, 'to_dict') and hasattr(value, 'columns'):
+        return value.to_dict('records')
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Serialize a plan record or results to JSON."""
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+class PlanStore:
+    """
+    In-memory plan store (nothing survives a restart).
+
+    Stores keep a light plan record (status, steps, partial outputs) and the
+    plan's results separately, so status reads never load segment data.
+    Results are merged by name, which lets each completed step be
+    checkpointed on its own.
+    """
+
+    def __init__(self):
+        """Initialize in-memory plan store."""
+        self._plans: Dict[str, Tuple[Dict[str, Any], Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, campaign_id: str, status: str, record: Dict[str, Any],
+             results: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Insert or update a plan.
+
+        Args:
+            campaign_id: Campaign identifier
+            status: Plan status
+            record: Light plan record (CampaignPlan.to_record)
+            results: Results to add or replace, by name (others are kept)
+        """
+        with self._lock:
+            stored_results = self._plans.get(campaign_id, (None, {}, 0.0))[1]
+            self._plans[campaign_id] = (record, {**stored_results, **(results or {})}, time.time())
+
+    def load(self, campaign_id: str, include_results: bool = True
+             ) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """
+        Load a plan.
+
+        Args:
+            campaign_id: Campaign identifier
+            include_results: Also load the (possibly large) results
+
+        Returns:
+            Tuple of (light record, results or None), or None if unknown
+        """
+        with self._lock:
+            entry = self._plans.get(campaign_id)
+        if entry is None:
+            return None
+        return entry[0], dict(entry[1]) if include_results else None
+
+    def list_unfinished(self) -> List[Tuple[str, float]]:
+        """
+        List plans that are pending or executing.
+
+        Returns:
+            List of (campaign_id, last update time as a Unix timestamp)
+        """
+        with self._lock:
+            return [
+                (campaign_id, updated_at)
+                for campaign_id, (record, _, updated_at) in self._plans.items()
+                if record.get("status") in UNFINISHED_STATUSES
+            ]
+
+    def claim(self, campaign_id: str, updated_at: float) -> bool:
+        """
+        Take over an unfinished plan, unless someone updated it since it was listed.
+
+        Args:
+            campaign_id: Campaign identifier
+            updated_at: Update time returned by list_unfinished
+
+        Returns:
+            True if this caller now owns the plan
+        """
+        with self._lock:
+            entry = self._plans.get(campaign_id)
+            if entry is None or entry[2] != updated_at:
+                return False
+            self._plans[campaign_id] = (entry[0], entry[1], time.time())
+            return True
+
+    def touch(self, campaign_ids: List[str]) -> None:
+        """
+        Refresh the update time of unfinished plans still being run here.
+
+        Args:
+            campaign_ids: Campaign identifiers
+        """
+        now = time.time()
+        with self._lock:
+            for campaign_id in campaign_ids:
+                entry = self._plans.get(campaign_id)
+                if entry is not None and entry[0].get("status") in UNFINISHED_STATUSES:
+                    self._plans[campaign_id] = (entry[0], entry[1], now)
+
+
+class SQLPlanStore(PlanStore, ABC):
+    """Plan store on a SQL database; subclasses provide transactions."""
+
+    @abstractmethod
+    def _transaction(self) -> ContextManager[Callable[..., Any]]:
+        """Open a transaction yielding execute(sql, params) -> cursor/result."""
+        pass
+
+    def _create_schema(self, real_type: str) -> None:
+        """Create the plan tables if missing."""
+        with self._transaction() as execute:
+            for statement in _SCHEMA:
+                execute(statement.format(real=real_type))
+
+    def save(self, campaign_id: str, status: str, record: Dict[str, Any],
+             results: Optional[Dict[str, Any]] = None) -> None:
+        """Insert or update a plan (see PlanStore.save)."""
+        with self._transaction() as execute:
+            execute(_UPSERT_PLAN, {
+                "campaign_id": campaign_id,
+                "status": status,
+                "plan": dumps(record),
+                "updated_at": time.time()
+            })
+            for name, result in (results or {}).items():
+                execute(_UPSERT_RESULT, {"campaign_id": campaign_id, "name": name, "result": dumps(result)})
+
+    def load(self, campaign_id: str, include_results: bool = True
+             ) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Load a plan (see PlanStore.load)."""
+        params = {"campaign_id": campaign_id}
+        with self._transaction() as execute:
+            row = execute("SELECT plan FROM campaign_plans WHERE campaign_id = :campaign_id", params).fetchone()
+            if row is None:
+                return None
+
+            results = None
+            if include_results:
+                rows = execute(
+                    "SELECT name, result FROM campaign_plan_results WHERE campaign_id = :campaign_id", params
+                ).fetchall()
+                results = {name: json.loads(result) for name, result in rows}
+
+        return json.loads(row[0]), results
+
+    def list_unfinished(self) -> List[Tuple[str, float]]:
+        """List plans that are pending or executing (see PlanStore.list_unfinished)."""
+        with self._transaction() as execute:
+            rows = execute(
+                "SELECT campaign_id, updated_at FROM campaign_plans WHERE status IN ('pending', 'executing')"
+            ).fetchall()
+        return [(campaign_id, updated_at) for campaign_id, updated_at in rows]
+
+    def claim(self, campaign_id: str, updated_at: float) -> bool:
+        """Take over an unfinished plan (see PlanStore.claim)."""
+        with self._transaction() as execute:
+            result = execute(
+                "UPDATE campaign_plans SET updated_at = :now "
+                "WHERE campaign_id = :campaign_id AND updated_at = :updated_at",
+                {"now": time.time(), "campaign_id": campaign_id, "updated_at": updated_at}
+            )
+            return result.rowcount == 1
+
+    def touch(self, campaign_ids: List[str]) -> None:
+        """Refresh the update time of unfinished plans (see PlanStore.touch)."""
+        now = time.time()
+        with self._transaction() as execute:
+            for campaign_id in campaign_ids:
+                execute(
+                    "UPDATE campaign_plans SET updated_at = :now "
+                    "WHERE campaign_id = :campaign_id AND status IN ('pending', 'executing')",
+                    {"now": now, "campaign_id": campaign_id}
+                )
+
+
+class SQLitePlanStore(SQLPlanStore):
+    """Plan store in a local SQLite file (survives restarts on one host)."""
+
+    def __init__(self, path: str):
+        """
+        Initialize SQLite plan store.
+
+        Args:
+            path: SQLite database file
+        """
+        super().__init__()
+        self.path = path
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as execute:
+            execute("PRAGMA journal_mode=WAL")
+        self._create_schema("REAL")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Callable[..., Any]]:
+        """Short-lived connection committing on success."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn.execute
+        finally:
+            conn.close()
+
+
+class PostgresPlanStore(SQLPlanStore):
+    """Plan store in the campaign PostgreSQL database (shared by every API worker)."""
+
+    def __init__(self, engine: Any):
+        """
+        Initialize PostgreSQL plan store.
+
+        Args:
+            engine: SQLAlchemy engine (PostgreSQLConnector.engine)
+        """
+        super().__init__()
+        from sqlalchemy import text
+
+        self._text = text
+        self.engine = engine
+        self._create_schema("DOUBLE PRECISION")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Callable[..., Any]]:
+        """Pooled connection in a transaction committing on success."""
+        with self.engine.begin() as conn:
+            yield lambda sql, params=None: conn.execute(self._text(sql), params or {})
+
+
+def create_plan_store() -> PlanStore:
+    """
+    Create the plan store configured under planner.store.
+
+    An unknown or unavailable backend fails startup: plans kept in memory
+    instead would be lost on restart and invisible to other workers. Set
+    planner.fallback_to_memory to accept that and fall back to the
+    in-memory store.
+
+    Returns:
+        PlanStore instance
+
+    Raises:
+        RuntimeError: If the configured backend can't be used and falling
+            back to memory is not enabled
+    """
+    settings = get_settings()
+    backend = settings.get('planner.store', 'sqlite')
+    fallback_to_memory = settings.get('planner.fallback_to_memory', False)
+
+    try:
+        if backend == 'sqlite':
+            return SQLitePlanStore(settings.get('planner.path', './data/cache/campaign_plans.sqlite'))
+        if backend == 'postgres':
+            from src.connectors.factory import create_connector
+            connector = create_connector('postgres', settings.get_connector_config('postgres'))
+            return PostgresPlanStore(connector.engine)
+        if backend == 'memory':
+            return PlanStore()
+        raise ValueError(f"unknown plan store '{backend}' (expected sqlite, postgres or memory)")
+    except Exception as e:
+        if not fallback_to_memory:
+            raise RuntimeError(f"Plan store '{backend}' unavailable: {e}") from e
+        print(f"⚠️  Plan store '{backend}' unavailable ({e}), keeping plans in memory (planner.fallback_to_memory)")
+
+    return PlanStore()
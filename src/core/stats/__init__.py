@@ -0,0 +1,21 @@
+"""Shared statistical aggregates for EngageIQ agents."""
+
+from src.core.stats.baseline import (
+    PopulationBaseline,
+    compute_dataset_version,
+    get_dataset_version,
+    get_population_baseline,
+    get_cached_baseline,
+    DATASET_VERSION_ATTR
+)
+from src.core.stats.lift import compute_lift
+
+__all__ = [
+    'PopulationBaseline',
+    'compute_dataset_version',
+    'get_dataset_version',
+    'get_population_baseline',
+    'get_cached_baseline',
+    'DATASET_VERSION_ATTR',
+    'compute_lift'
+]
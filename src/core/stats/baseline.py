@@ -0,0 +1,202 @@
+"""Population baseline aggregates, computed once per dataset version."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+# Key under DataFrame.attrs where the dataset fingerprint is stored
+DATASET_VERSION_ATTR = 'dataset_version'
+
+# Number of dataset versions whose baselines are kept in memory
+MAX_CACHED_VERSIONS = 4
+
+# Categorical columns whose level counts are kept for lift computation
+BASELINE_CATEGORICAL_COLUMNS = ('segment', 'education', 'city')
+
+
+def compute_dataset_version(df: pd.DataFrame) -> str:
+    """
+    Compute a content fingerprint for a DataFrame.
+
+    The fingerprint covers column names, row count and a row-wise hash of
+    every value, so it changes whenever the underlying data changes.
+
+    Args:
+        df: DataFrame to fingerprint
+
+    Returns:
+        Short hexadecimal version string
+    """
+    hasher = hashlib.sha1()
+    hasher.update(repr(list(df.columns)).encode('utf-8'))
+    hasher.update(str(len(df)).encode('utf-8'))
+
+    if len(df) > 0:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        hasher.update(row_hashes.tobytes())
+
+    return hasher.hexdigest()[:16]
+
+
+def get_dataset_version(df: pd.DataFrame) -> str:
+    """
+    Get the dataset version stamped on a DataFrame, computing it if missing.
+
+    Args:
+        df: Population DataFrame
+
+    Returns:
+        Dataset version string
+    """
+    version = df.attrs.get(DATASET_VERSION_ATTR)
+    if not version:
+        version = compute_dataset_version(df)
+        df.attrs[DATASET_VERSION_ATTR] = version
+    return version
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a scalar to float, mapping NaN/None to None."""
+    return float(value) if pd.notna(value) else None
+
+
+def _numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Numeric view of a DataFrame, including object columns holding numbers.
+
+    Object columns are coerced with pd.to_numeric(errors='coerce') and kept
+    if any value converts (e.g. numbers read as text, or mixed with "N/A").
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            columns[column] = series
+        elif series.dtype == object:
+            coerced = pd.to_numeric(series, errors='coerce')
+            if coerced.notna().any():
+                columns[column] = coerced
+    return pd.DataFrame(columns, index=df.index)
+
+
+@dataclass
+class PopulationBaseline:
+    """Aggregates over the full agent population for one dataset version."""
+    dataset_version: str
+    row_count: int
+    numeric: Dict[str, Dict[str, Optional[float]]] = field(default_factory=dict)
+    categorical: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, dataset_version: str) -> 'PopulationBaseline':
+        """
+        Build a baseline from the population DataFrame.
+
+        Args:
+            df: Population DataFrame
+            dataset_version: Version the aggregates belong to
+
+        Returns:
+            PopulationBaseline instance
+        """
+        numeric = {}
+        numeric_df = _numeric_columns(df)
+
+        if not numeric_df.empty:
+            described = numeric_df.describe().T
+            for column, row in described.iterrows():
+                numeric[column] = {
+                    "count": _to_float(row['count']),
+                    "mean": _to_float(row['mean']),
+                    "std": _to_float(row['std']),
+                    "min": _to_float(row['min']),
+                    "q25": _to_float(row['25%']),
+                    "median": _to_float(row['50%']),
+                    "q75": _to_float(row['75%']),
+                    "max": _to_float(row['max'])
+                }
+
+        categorical = {}
+        for column in BASELINE_CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                counts = df[column].value_counts(dropna=True)
+                categorical[column] = {str(level): int(count) for level, count in counts.items()}
+
+        return cls(
+            dataset_version=dataset_version,
+            row_count=int(len(df)),
+            numeric=numeric,
+            categorical=categorical
+        )
+
+    def summary(self, column: str) -> Dict[str, Optional[float]]:
+        """
+        Get the mean/median/min/max summary used in segmentation statistics.
+
+        Args:
+            column: Population column name
+
+        Returns:
+            Summary dictionary (values are None if the column has no numeric data)
+        """
+        column_stats = self.numeric.get(column, {})
+        return {
+            "mean": column_stats.get('mean'),
+            "median": column_stats.get('median'),
+            "min": column_stats.get('min'),
+            "max": column_stats.get('max')
+        }
+
+
+_baseline_cache: 'OrderedDict[str, PopulationBaseline]' = OrderedDict()
+_baseline_lock = threading.Lock()
+
+
+def get_population_baseline(df: pd.DataFrame) -> PopulationBaseline:
+    """
+    Get population baseline for a DataFrame, computing it once per dataset version.
+
+    Args:
+        df: Population DataFrame
+
+    Returns:
+        Cached or freshly computed PopulationBaseline
+    """
+    version = get_dataset_version(df)
+
+    # Compute under the lock so concurrent campaigns share a single pass
+    with _baseline_lock:
+        baseline = _baseline_cache.get(version)
+        if baseline is not None:
+            _baseline_cache.move_to_end(version)
+            return baseline
+
+        baseline = PopulationBaseline.from_dataframe(df, version)
+        _baseline_cache[version] = baseline
+        while len(_baseline_cache) > MAX_CACHED_VERSIONS:
+            _baseline_cache.popitem(last=False)
+
+        return baseline
+
+
+def get_cached_baseline(dataset_version: Optional[str]) -> Optional[PopulationBaseline]:
+    """
+    Look up an already computed baseline by dataset version.
+
+    Args:
+        dataset_version: Dataset version string
+
+    Returns:
+        PopulationBaseline if cached, None otherwise
+    """
+    if not dataset_version:
+        return None
+
+    with _baseline_lock:
+        return _baseline_cache.get(dataset_version)
@@ -0,0 +1,157 @@
+"""Segment-vs-population lift computed against cached population aggregates."""
+
+from typing import Dict, Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.core.stats.baseline import PopulationBaseline
+
+# Number of features reported as most distinguishing
+TOP_DISTINGUISHING = 5
+
+
+def _is_identifier(column: str) -> bool:
+    """Identifier columns are numeric but carry no population signal."""
+    name = column.lower()
+    return name == 'id' or name.endswith('_id')
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division returning NaN where the denominator is zero or missing."""
+    result = np.full(numerator.shape, np.nan)
+    valid = np.isfinite(denominator) & (denominator != 0) & np.isfinite(numerator)
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+
+def _round_or_none(value: float) -> Any:
+    """Round a float for reporting, mapping NaN to None."""
+    return round(float(value), 4) if np.isfinite(value) else None
+
+
+def compute_lift(segment_df: pd.DataFrame, baseline: PopulationBaseline,
+                 categorical_columns: Sequence[str] = None) -> Dict[str, Any]:
+    """
+    Compute lift ratios and standardized differences of a segment vs. the population.
+
+    Numeric columns are compared on their means (lift = segment mean / population
+    mean, standardized difference = (segment mean - population mean) / population
+    std). Categorical levels are compared on their shares (standardized difference
+    = (p_segment - p_population) / sqrt(p_population * (1 - p_population))).
+    Each family is evaluated as a single vectorized operation over all features.
+
+    Args:
+        segment_df: Segment DataFrame
+        baseline: Cached population aggregates
+        categorical_columns: Categorical columns to compare (defaults to the
+            columns captured in the baseline)
+
+    Returns:
+        Dictionary with numeric, categorical and top distinguishing features
+    """
+    segment_size = len(segment_df)
+    result = {
+        "dataset_version": baseline.dataset_version,
+        "segment_size": segment_size,
+        "population_size": baseline.row_count,
+        "numeric": {},
+        "categorical": {},
+        "top_distinguishing": []
+    }
+
+    if segment_size == 0:
+        return result
+
+    features: List[Dict[str, Any]] = []
+
+    # Numeric columns: one matrix of segment values against population vectors
+    numeric_columns = [
+        column for column in baseline.numeric
+        if column in segment_df.columns and not _is_identifier(column)
+    ]
+    if numeric_columns:
+        values = segment_df[numeric_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        counts = present.sum(axis=0)
+        sums = np.where(present, values, 0.0).sum(axis=0)
+        segment_means = _safe_divide(sums, counts.astype(np.float64))
+
+        population_means = np.array([baseline.numeric[c].get('mean') for c in numeric_columns], dtype=np.float64)
+        population_stds = np.array([baseline.numeric[c].get('std') for c in numeric_columns], dtype=np.float64)
+
+        lifts = _safe_divide(segment_means, population_means)
+        std_diffs = _safe_divide(segment_means - population_means, population_stds)
+
+        for i, column in enumerate(numeric_columns):
+            result["numeric"][column] = {
+                "segment_mean": _round_or_none(segment_means[i]),
+                "population_mean": _round_or_none(population_means[i]),
+                "lift": _round_or_none(lifts[i]),
+                "std_diff": _round_or_none(std_diffs[i])
+            }
+            features.append({
+                "feature": column,
+                "type": "numeric",
+                "lift": _round_or_none(lifts[i]),
+                "std_diff": std_diffs[i]
+            })
+
+    # Categorical levels: segment level counts via bincount against population shares
+    if categorical_columns is None:
+        categorical_columns = list(baseline.categorical)
+
+    level_keys = []
+    segment_counts = []
+    population_counts = []
+    for column in categorical_columns:
+        population_levels = baseline.categorical.get(column)
+        if not population_levels or column not in segment_df.columns:
+            continue
+
+        levels = list(population_levels)
+        codes = pd.Categorical(segment_df[column].astype(str), categories=levels).codes
+        counts = np.bincount(codes[codes >= 0], minlength=len(levels))
+
+        level_keys.extend((column, level) for level in levels)
+        segment_counts.append(counts)
+        population_counts.append(np.fromiter(population_levels.values(), dtype=np.float64, count=len(levels)))
+
+    if level_keys and baseline.row_count > 0:
+        segment_counts_vec = np.concatenate(segment_counts).astype(np.float64)
+        segment_shares = segment_counts_vec / segment_size
+        population_shares = np.concatenate(population_counts) / baseline.row_count
+
+        lifts = _safe_divide(segment_shares, population_shares)
+        std_diffs = _safe_divide(
+            segment_shares - population_shares,
+            np.sqrt(population_shares * (1.0 - population_shares))
+        )
+
+        # Only report levels that occur in the segment to keep payloads small
+        for i in np.flatnonzero(segment_counts_vec > 0):
+            column, level = level_keys[i]
+            result["categorical"].setdefault(column, {})[level] = {
+                "segment_share": _round_or_none(segment_shares[i]),
+                "population_share": _round_or_none(population_shares[i]),
+                "lift": _round_or_none(lifts[i]),
+                "std_diff": _round_or_none(std_diffs[i])
+            }
+            features.append({
+                "feature": f"{column}={level}",
+                "type": "categorical",
+                "lift": _round_or_none(lifts[i]),
+                "std_diff": std_diffs[i]
+            })
+
+    ranked = sorted(
+        (f for f in features if np.isfinite(f['std_diff'])),
+        key=lambda f: abs(f['std_diff']),
+        reverse=True
+    )
+    result["top_distinguishing"] = [
+        {**feature, "std_diff": _round_or_none(feature['std_diff'])}
+        for feature in ranked[:TOP_DISTINGUISHING]
+    ]
+
+    return result
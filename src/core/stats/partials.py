@@ -0,0 +1,257 @@
+"""Mergeable partial aggregates computed over row partitions in a process pool."""
+
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (name, low, high, include_high): counts values with low <= x < high (or <= high)
+BinSpec = Tuple[str, float, float, bool]
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Describes which partial aggregates to collect for a numeric column."""
+    bins: Tuple[BinSpec, ...] = ()
+    keep_values: bool = False  # retain (sorted) values for exact quantiles
+    value_counts: bool = False  # count integer-truncated values
+
+
+@dataclass
+class NumericPartial:
+    """
+    Partial aggregates for one numeric column over a subset of rows.
+
+    Partials from disjoint partitions merge exactly: moments use Chan's
+    parallel variance update. Each partition sorts its own values (in the
+    worker), merging only collects the sorted runs, and a quantile finds
+    its order statistics across the runs by binary search, so the parent
+    never concatenates or sorts the segment. Reads never modify a partial.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    bin_counts: Dict[str, int] = field(default_factory=dict)
+    value_counts: Dict[int, int] = field(default_factory=dict)
+    value_parts: Optional[List[np.ndarray]] = None  # sorted values of each merged partition
+
+    @classmethod
+    def from_array(cls, raw: np.ndarray, spec: ColumnSpec) -> 'NumericPartial':
+        """
+        Compute partial aggregates for one partition of a column.
+
+        Args:
+            raw: Column values (any dtype, non-numeric values are ignored)
+            spec: Aggregates to collect
+
+        Returns:
+            NumericPartial for the partition
+        """
+        values = pd.to_numeric(pd.Series(raw), errors='coerce').to_numpy(dtype=np.float64)
+        valid = values[~np.isnan(values)]
+
+        partial = cls(count=int(valid.size))
+        for name, low, high, include_high in spec.bins:
+            upper = valid <= high if include_high else valid < high
+            partial.bin_counts[name] = int(np.count_nonzero((valid >= low) & upper))
+
+        if spec.keep_values:
+            partial.value_parts = [np.sort(valid)]
+
+        if valid.size == 0:
+            return partial
+
+        partial.mean = float(valid.mean())
+        partial.m2 = float(np.square(valid - partial.mean).sum())
+        partial.total = float(valid.sum())
+        partial.minimum = float(valid.min())
+        partial.maximum = float(valid.max())
+
+        if spec.value_counts:
+            levels, counts = np.unique(valid.astype(np.int64), return_counts=True)
+            partial.value_counts = {int(level): int(count) for level, count in zip(levels, counts)}
+
+        return partial
+
+    def merge(self, other: 'NumericPartial') -> 'NumericPartial':
+        """
+        Combine with the partial of a disjoint partition.
+
+        Args:
+            other: Partial from another partition
+
+        Returns:
+            New merged NumericPartial
+        """
+        count = self.count + other.count
+        if count == 0:
+            mean, m2 = 0.0, 0.0
+        else:
+            delta = other.mean - self.mean
+            mean = self.mean + delta * other.count / count
+            m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+
+        bin_counts = dict(self.bin_counts)
+        for name, value in other.bin_counts.items():
+            bin_counts[name] = bin_counts.get(name, 0) + value
+
+        value_counts = dict(self.value_counts)
+        for level, value in other.value_counts.items():
+            value_counts[level] = value_counts.get(level, 0) + value
+
+        value_parts = None
+        if self.value_parts is not None or other.value_parts is not None:
+            value_parts = (self.value_parts or []) + (other.value_parts or [])
+
+        return NumericPartial(
+            count=count,
+            mean=mean,
+            m2=m2,
+            total=self.total + other.total,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum),
+            bin_counts=bin_counts,
+            value_counts=value_counts,
+            value_parts=value_parts
+        )
+
+    def mean_or(self, default: float = 0) -> float:
+        """Mean of the merged rows, or default if there are none."""
+        return self.mean if self.count > 0 else default
+
+    def std_or(self, default: float = 0) -> float:
+        """Sample standard deviation (ddof=1), or default if undefined."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else default
+
+    def min_or(self, default: float = 0) -> float:
+        """Minimum value, or default if there are no rows."""
+        return self.minimum if self.count > 0 else default
+
+    def max_or(self, default: float = 0) -> float:
+        """Maximum value, or default if there are no rows."""
+        return self.maximum if self.count > 0 else default
+
+    def quantile_or(self, q: float, default: float = 0) -> float:
+        """Exact quantile (linear interpolation, as np.quantile), or default if unavailable."""
+        if not self.value_parts:
+            return default
+        size = sum(part.size for part in self.value_parts)
+        if size == 0:
+            return default
+
+        position = q * (size - 1)
+        low = int(math.floor(position))
+        high = min(low + 1, size - 1)
+        low_value = self._order_statistic(low)
+        high_value = self._order_statistic(high) if high != low else low_value
+        return float(low_value + (high_value - low_value) * (position - low))
+
+    def _order_statistic(self, rank: int) -> float:
+        """
+        The rank-th smallest value (0-based) across the sorted value parts.
+
+        Binary searches each part for an element whose rank range over all
+        parts contains rank; O(parts^2 * log^2 n) without copying values.
+        """
+        parts = [part for part in self.value_parts if part.size]
+        for part in parts:
+            lo, hi = 0, part.size - 1
+            while lo <= hi:
+                middle = (lo + hi) // 2
+                value = part[middle]
+                below = sum(int(np.searchsorted(other, value, side='left')) for other in parts)
+                if below > rank:
+                    hi = middle - 1
+                    continue
+                through = sum(int(np.searchsorted(other, value, side='right')) for other in parts)
+                if through <= rank:
+                    lo = middle + 1
+                    continue
+                return float(value)
+        raise IndexError(f"rank {rank} out of range")
+
+
+def compute_partition_partials(columns: Dict[str, np.ndarray],
+                               specs: Dict[str, ColumnSpec]) -> Dict[str, NumericPartial]:
+    """
+    Compute partials for every column of one row partition (process pool worker).
+
+    Args:
+        columns: Column name -> values for the partition
+        specs: Column name -> aggregates to collect
+
+    Returns:
+        Column name -> NumericPartial
+    """
+    return {
+        column: NumericPartial.from_array(values, specs.get(column, ColumnSpec()))
+        for column, values in columns.items()
+    }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared process pool, (re)creating it for the requested size."""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn avoids forking a process that holds thread locks (API workers)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def compute_partials(columns: Dict[str, np.ndarray], specs: Dict[str, ColumnSpec],
+                     workers: int = 1) -> Dict[str, NumericPartial]:
+    """
+    Compute merged partial aggregates, splitting rows across a process pool.
+
+    Args:
+        columns: Column name -> full column values (all of equal length)
+        specs: Column name -> aggregates to collect
+        workers: Number of worker processes (1 computes in-process)
+
+    Returns:
+        Column name -> merged NumericPartial
+    """
+    if workers <= 1 or not columns:
+        return compute_partition_partials(columns, specs)
+
+    row_count = len(next(iter(columns.values())))
+    boundaries = np.linspace(0, row_count, workers + 1, dtype=np.int64)
+
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(
+            compute_partition_partials,
+            {column: values[start:end] for column, values in columns.items()},
+            specs
+        )
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+        if end > start
+    ]
+
+    merged: Dict[str, NumericPartial] = {}
+    for future in futures:
+        for column, partial in future.result().items():
+            merged[column] = merged[column].merge(partial) if column in merged else partial
+
+    return merged
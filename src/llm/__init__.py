@@ -1,6 +1,57 @@
 """LLM provider implementations for EngageIQ."""
 
 from .base_provider import BaseLLMProvider
-from .claude import ClaudeProvider
+from .cache import ResponseCache, get_response_cache
+from .claude import ClaudeProvider, get_chat_client
+from .stub import StubProvider
+from .registry import get_llm_provider, get_agent_llm_provider
+from .event_loop import get_event_loop, run_sync
+from .tokens import estimate_tokens
+from .prompts import compact_prompt, get_prompt_token_stats
+from .metrics import (
+    LLMCallRecord,
+    get_llm_call_stats,
+    llm_call_scope,
+    pop_step_llm_metrics,
+    record_llm_fallback,
+)
+from .resilience import backoff_delay, is_retryable, llm_deadline, remaining_time
+from .rate_limiter import (
+    Priority,
+    RateLimiter,
+    get_current_priority,
+    get_rate_limiter,
+    get_rate_limiter_stats,
+    llm_priority,
+)
 
-__all__ = ["BaseLLMProvider", "ClaudeProvider"]
+__all__ = [
+    "BaseLLMProvider",
+    "ClaudeProvider",
+    "StubProvider",
+    "ResponseCache",
+    "get_response_cache",
+    "get_chat_client",
+    "get_llm_provider",
+    "get_agent_llm_provider",
+    "get_event_loop",
+    "run_sync",
+    "estimate_tokens",
+    "compact_prompt",
+    "get_prompt_token_stats",
+    "LLMCallRecord",
+    "get_llm_call_stats",
+    "llm_call_scope",
+    "pop_step_llm_metrics",
+    "record_llm_fallback",
+    "backoff_delay",
+    "is_retryable",
+    "llm_deadline",
+    "remaining_time",
+    "Priority",
+    "RateLimiter",
+    "get_current_priority",
+    "get_rate_limiter",
+    "get_rate_limiter_stats",
+    "llm_priority",
+]
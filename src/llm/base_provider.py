@@ -1,7 +1,17 @@
 """Base LLM provider interface."""
 
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterator, AsyncIterator
+
+from .cache import ResponseCache, get_response_cache
+from .metrics import LLMCallRecord, get_latency_percentile, record_llm_call
+from .prompts import record_prompt_tokens
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .resilience import backoff_delay, is_retryable, remaining_time
+from .tokens import estimate_tokens
 
 
 class BaseLLMProvider(ABC):
@@ -15,10 +25,26 @@ class BaseLLMProvider(ABC):
             config: Provider configuration from config.yaml
         """
         self.config = config
+        self.name = config.get('name', '')
         self.api_key = config.get('api_key', '')
         self.model = config.get('model', '')
         self.max_tokens = config.get('max_tokens', 4000)
         self.temperature = config.get('temperature', 0.7)
+        self.request_timeout = config.get('request_timeout')  # seconds, None = no limit
+        self.max_retries = config.get('max_retries', 0)
+        self.retry_backoff = config.get('retry_backoff', 1.0)  # seconds, doubled per retry (jittered)
+        self.retry_max_delay = config.get('retry_max_delay', 20.0)
+        self.hedge_percentile = config.get('hedge_percentile')  # e.g. 0.95; None disables hedging
+        self.hedge_min_samples = config.get('hedge_min_samples', 20)
+        self.agent_name = config.get('agent') or self.name  # prompt statistics attribution
+
+        # Response cache (agents opt out for high-temperature creative calls)
+        self.response_cache: Optional[ResponseCache] = (
+            get_response_cache() if config.get('cache_responses', True) else None
+        )
+
+        # Process-wide request/token budget shared by every provider of this name
+        self.rate_limiter: Optional[RateLimiter] = get_rate_limiter(self.name) if self.name else None
 
     @abstractmethod
     def query(
@@ -64,6 +90,602 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    async def aquery(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> str:
+        """
+        Async variant of query.
+
+        The default implementation runs query in a worker thread; providers
+        with a native async client override it. Cancelling the awaiting task
+        abandons the request.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLM response as string
+        """
+        return await self._with_timeout(
+            asyncio.to_thread(self.query, prompt, temperature, max_tokens, **kwargs),
+            timeout
+        )
+
+    async def aquery_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query_json.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            Parsed JSON response as dictionary
+        """
+        return await self._with_timeout(
+            asyncio.to_thread(self.query_json, prompt, temperature, max_tokens, **kwargs),
+            timeout
+        )
+
+    def stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream a text response as it is generated.
+
+        The default implementation yields the full query result as one
+        chunk; providers with native streaming override it.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Text chunks
+        """
+        yield self.query(prompt, temperature, max_tokens, **kwargs)
+
+    async def astream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Text chunks
+        """
+        yield await self.aquery(prompt, temperature, max_tokens, **kwargs)
+
+    async def _with_timeout(self, awaitable: Awaitable[Any], timeout: Optional[float]) -> Any:
+        """
+        Await an LLM request, cancelling it once the timeout expires.
+
+        Args:
+            awaitable: Pending LLM request
+            timeout: Seconds to wait (None falls back to request_timeout); capped
+                by the context's llm_deadline
+
+        Returns:
+            Request result
+        """
+        try:
+            timeout = self.effective_timeout(timeout)
+        except TimeoutError:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        if not timeout:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+
+    def effective_timeout(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Get the timeout for one request, capped by the context's deadline.
+
+        Args:
+            timeout: Requested timeout (None falls back to request_timeout)
+
+        Returns:
+            Seconds the request may take, or None for no limit
+
+        Raises:
+            TimeoutError: If the context's deadline has already passed
+        """
+        timeout = self.request_timeout if timeout is None else timeout
+        remaining = remaining_time()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise TimeoutError("LLM call deadline exceeded")
+        return min(timeout, remaining) if timeout else remaining
+
+    def _cache_key(
+        self,
+        kind: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """Build the response cache key using the effective sampling parameters."""
+        return ResponseCache.make_key(
+            self.model, kind, system, prompt,
+            self.temperature if temperature is None else temperature,
+            max_tokens or self.max_tokens
+        )
+
+    def _start_call(self, kind: str, prompt: str, system: Optional[str]) -> LLMCallRecord:
+        """Start measuring a provider call attributed to this provider's agent."""
+        return LLMCallRecord(
+            agent=self.agent_name,
+            kind=kind,
+            wall_time=0.0,
+            started=time.perf_counter(),
+            input_tokens=estimate_tokens(system) + estimate_tokens(prompt)
+        )
+
+    def _finish_call(
+        self,
+        record: LLMCallRecord,
+        response: Any = None,
+        cache_hit: bool = False,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Complete a call measurement and add it to the process-wide metrics.
+
+        Args:
+            record: Record returned by _start_call
+            response: Response (for output token estimates)
+            cache_hit: Whether the response came from the response cache
+            error: Exception raised by the call, if any
+        """
+        record.wall_time = time.perf_counter() - record.started
+        record.cache_hit = cache_hit
+        if cache_hit:
+            record.input_tokens = 0
+        if response is not None and not cache_hit:
+            record.output_tokens = self._response_tokens(response)
+        if error is not None:
+            record.error = f"{type(error).__name__}: {error}"
+        record_llm_call(record)
+
+    def _cached_call(
+        self,
+        kind: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        call: Callable[[], Any]
+    ) -> Any:
+        """
+        Serve a request from the response cache, calling the LLM on a miss.
+
+        Every request is measured (wall time, queueing, tokens, cache hit
+        and errors) and recorded in the LLM call metrics.
+
+        Args:
+            kind: Response kind ('text' or 'json')
+            prompt: The prompt to send
+            system: System prompt
+            temperature: Requested temperature (None for the default)
+            max_tokens: Requested max tokens (None for the default)
+            call: Function performing the actual LLM request
+
+        Returns:
+            Cached or fresh response
+        """
+        record = self._start_call(kind, prompt, system)
+
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(kind, prompt, system, temperature, max_tokens)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self._finish_call(record, cached, cache_hit=True)
+                return cached
+
+        try:
+            response = self._rate_limited(prompt, system, call, record)
+        except Exception as e:
+            self._finish_call(record, error=e)
+            raise
+
+        self._finish_call(record, response)
+        if key is not None:
+            self.response_cache.set(key, response)
+        return response
+
+    async def _acached_call(
+        self,
+        kind: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Async variant of _cached_call; only the LLM request is subject to the timeout.
+
+        Args:
+            kind: Response kind ('text' or 'json')
+            prompt: The prompt to send
+            system: System prompt
+            temperature: Requested temperature (None for the default)
+            max_tokens: Requested max tokens (None for the default)
+            call: Coroutine function performing the actual LLM request
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+
+        Returns:
+            Cached or fresh response
+        """
+        record = self._start_call(kind, prompt, system)
+
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(kind, prompt, system, temperature, max_tokens)
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                self._finish_call(record, cached, cache_hit=True)
+                return cached
+
+        try:
+            response = await self._arate_limited(prompt, system, call, timeout, record)
+        except (Exception, asyncio.CancelledError) as e:
+            self._finish_call(record, error=e)
+            raise
+
+        self._finish_call(record, response)
+        if key is not None:
+            await self.response_cache.aset(key, response)
+        return response
+
+    def _cached_stream(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        call: Callable[[], Iterator[str]]
+    ) -> Iterator[str]:
+        """
+        Stream a text response, serving cache hits as a single chunk.
+
+        A fully received stream is stored under the same key as query, so
+        streamed and non-streamed calls share cache entries. Time to first
+        token is recorded along with the call metrics.
+
+        Args:
+            prompt: The prompt to send
+            system: System prompt
+            temperature: Requested temperature (None for the default)
+            max_tokens: Requested max tokens (None for the default)
+            call: Function starting the actual streaming LLM request
+
+        Yields:
+            Text chunks
+        """
+        record = self._start_call('stream', prompt, system)
+
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key('text', prompt, system, temperature, max_tokens)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self._finish_call(record, cached, cache_hit=True)
+                yield cached
+                return
+
+        record_prompt_tokens(self.agent_name, prompt, system)
+        chunks = []
+        try:
+            if self.rate_limiter is not None:
+                record.queue_time = self.rate_limiter.acquire(record.input_tokens, timeout=remaining_time())
+
+            for chunk in call():
+                if not chunks:
+                    record.time_to_first_token = time.perf_counter() - record.started
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._finish_call(record, error=e)
+            raise
+
+        response = "".join(chunks)
+        self._finish_call(record, response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimate_tokens(response))
+        if key is not None:
+            self.response_cache.set(key, response)
+
+    async def _acached_stream(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        call: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of _cached_stream.
+
+        Args:
+            prompt: The prompt to send
+            system: System prompt
+            temperature: Requested temperature (None for the default)
+            max_tokens: Requested max tokens (None for the default)
+            call: Function starting the actual streaming LLM request
+
+        Yields:
+            Text chunks
+        """
+        record = self._start_call('stream', prompt, system)
+
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key('text', prompt, system, temperature, max_tokens)
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                self._finish_call(record, cached, cache_hit=True)
+                yield cached
+                return
+
+        record_prompt_tokens(self.agent_name, prompt, system)
+        chunks = []
+        try:
+            if self.rate_limiter is not None:
+                record.queue_time = await self.rate_limiter.aacquire(record.input_tokens, timeout=remaining_time())
+
+            async for chunk in call():
+                if not chunks:
+                    record.time_to_first_token = time.perf_counter() - record.started
+                chunks.append(chunk)
+                yield chunk
+        except (Exception, asyncio.CancelledError) as e:
+            self._finish_call(record, error=e)
+            raise
+
+        response = "".join(chunks)
+        self._finish_call(record, response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimate_tokens(response))
+        if key is not None:
+            await self.response_cache.aset(key, response)
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Decide whether to retry a failed request and how long to back off.
+
+        Args:
+            error: Exception raised by the request
+            attempt: Retries already made
+
+        Returns:
+            Seconds to sleep before retrying, or None to give up
+        """
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+
+        delay = backoff_delay(attempt, self.retry_backoff, self.retry_max_delay)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def _rate_limited(
+        self,
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[], Any],
+        record: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """
+        Send a request through the rate limiter, retrying transient failures.
+
+        The prompt's estimated tokens are reserved on admission and the
+        response's tokens are charged once it arrives. Failed attempts are
+        retried up to max_retries times with jittered exponential backoff,
+        within the context's deadline.
+
+        Args:
+            prompt: The prompt to send
+            system: System prompt
+            call: Function performing the actual LLM request
+            record: Call measurement receiving queue time and retry count
+
+        Returns:
+            LLM response
+        """
+        record_prompt_tokens(self.agent_name, prompt, system)
+        attempt = 0
+        while True:
+            try:
+                self.effective_timeout()  # raises once the deadline has passed
+                return self._send(prompt, system, call, record)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                if record is not None:
+                    record.retries = attempt
+                print(f"⚠️  LLM call failed ({e}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _send(
+        self,
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[], Any],
+        record: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """Wait for the rate limiter to admit one attempt, then send it."""
+        if self.rate_limiter is None:
+            return call()
+
+        # Queueing may not outlast the context's deadline either
+        waited = self.rate_limiter.acquire(
+            estimate_tokens(system) + estimate_tokens(prompt), timeout=remaining_time()
+        )
+        if record is not None:
+            record.queue_time += waited
+        response = call()
+        self.rate_limiter.record_usage(self._response_tokens(response))
+        return response
+
+    async def _arate_limited(
+        self,
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        record: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """
+        Async variant of _rate_limited; time spent queued does not count
+        toward the request timeout, and slow attempts may be hedged.
+
+        Args:
+            prompt: The prompt to send
+            system: System prompt
+            call: Coroutine function performing the actual LLM request
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+            record: Call measurement receiving queue time, retries and hedging
+
+        Returns:
+            LLM response
+        """
+        record_prompt_tokens(self.agent_name, prompt, system)
+        attempt = 0
+        while True:
+            try:
+                return await self._ahedged_send(prompt, system, call, timeout, record)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                if record is not None:
+                    record.retries = attempt
+                print(f"⚠️  LLM call failed ({e}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _asend(
+        self,
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        record: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """Wait for the rate limiter to admit one attempt, then send it under the timeout."""
+        if self.rate_limiter is None:
+            return await self._with_timeout(call(), timeout)
+
+        waited = await self.rate_limiter.aacquire(
+            estimate_tokens(system) + estimate_tokens(prompt), timeout=remaining_time()
+        )
+        if record is not None:
+            record.queue_time += waited
+        response = await self._with_timeout(call(), timeout)
+        self.rate_limiter.record_usage(self._response_tokens(response))
+        return response
+
+    async def _ahedged_send(
+        self,
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        record: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """
+        Send one attempt, duplicating it if it outlives the hedge delay.
+
+        The hedge delay is the agent's hedge_percentile service time; the
+        first successful response wins and the other request is cancelled.
+        Without hedging configured (or enough samples) this is _asend.
+
+        Returns:
+            LLM response
+        """
+        hedge_delay = None
+        if self.hedge_percentile:
+            hedge_delay = get_latency_percentile(self.agent_name, self.hedge_percentile, self.hedge_min_samples)
+        if hedge_delay is None:
+            return await self._asend(prompt, system, call, timeout, record)
+
+        primary = asyncio.ensure_future(self._asend(prompt, system, call, timeout, record))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            if record is not None:
+                record.hedged = True
+            tasks.append(asyncio.ensure_future(self._asend(prompt, system, call, timeout)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled mid-wait: don't leave
+            # requests running (and holding rate limit slots) behind it
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _response_tokens(response: Any) -> int:
+        """Estimate the tokens of a text or parsed JSON response."""
+        if isinstance(response, (dict, list)):
+            response = json.dumps(response)
+        return estimate_tokens(response)
+
     def validate_config(self) -> bool:
         """
         Validate provider configuration.
@@ -0,0 +1,253 @@
+"""Two-tier (memory LRU + SQLite) cache for LLM responses."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from src.core.config import get_settings
+
+
+class ResponseCache:
+    """
+    LLM response cache keyed by a hash of the request parameters.
+
+    Lookups go to an in-memory LRU first and fall back to an on-disk SQLite
+    table, which survives restarts and is shared by every worker on the host.
+    Both tiers expire entries after the configured TTL. The async variants
+    (aget/aset) run SQLite I/O in the event loop's executor.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: int = 86400, path: Optional[str] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            ttl: Entry lifetime in seconds (0 disables expiry)
+            path: SQLite file for the disk tier (None disables it)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+
+        self._memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+
+    @staticmethod
+    def make_key(model: str, kind: str, system: Optional[str], prompt: str,
+                 temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name
+            kind: Response kind ('text' or 'json')
+            system: System prompt
+            prompt: User prompt
+            temperature: Effective temperature
+            max_tokens: Effective max tokens
+
+        Returns:
+            SHA-256 hex digest of the request parameters
+        """
+        payload = json.dumps(
+            [model, kind, system or "", prompt, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection to the disk tier."""
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _expired(self, created_at: float) -> bool:
+        """Check whether an entry created at the given time has expired."""
+        return bool(self.ttl) and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        found, value = self._get_memory(key)
+        return value if found else self._get_disk(key)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response without blocking the event loop.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        if not self.path:
+            return self._get_disk(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_disk, key)
+
+    def _get_memory(self, key: str) -> Tuple[bool, Any]:
+        """Look up the memory tier; returns (found, response)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return True, json.loads(entry[1])
+                del self._memory[key]
+        return False, None
+
+    def _get_disk(self, key: str) -> Optional[Any]:
+        """Look up the disk tier after a memory miss, promoting hits to memory."""
+        row = None
+        if self.path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️  LLM cache read failed: {e}")
+
+        with self._lock:
+            if row is None or self._expired(row[1]):
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["disk_hits"] += 1
+            self._remember(key, row[1], row[0])
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable response
+        """
+        serialized, created_at = self._set_memory(key, value)
+        if self.path:
+            self._set_disk(key, serialized, created_at)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """
+        Store a response in both tiers without blocking the event loop.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable response
+        """
+        serialized, created_at = self._set_memory(key, value)
+        if self.path:
+            await asyncio.get_running_loop().run_in_executor(None, self._set_disk, key, serialized, created_at)
+
+    def _set_memory(self, key: str, value: Any) -> Tuple[str, float]:
+        """Store in the memory tier; returns (serialized value, creation time)."""
+        serialized = json.dumps(value, ensure_ascii=False)
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, created_at, serialized)
+            self._stats["writes"] += 1
+        return serialized, created_at
+
+    def _set_disk(self, key: str, serialized: str, created_at: float) -> None:
+        """Write an entry to the disk tier, dropping expired rows."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, serialized, created_at)
+                )
+                if self.ttl:
+                    conn.execute(
+                        "DELETE FROM llm_responses WHERE created_at < ?", (created_at - self.ttl,)
+                    )
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache write failed: {e}")
+
+    def _remember(self, key: str, created_at: float, serialized: str) -> None:
+        """Insert into the memory tier, evicting least recently used entries (lock held)."""
+        self._memory[key] = (created_at, serialized)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and hit rates
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["memory_hit_rate"] = round(stats["memory_hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache configured under llm.cache.
+
+    Returns:
+        ResponseCache instance, or None if caching is disabled
+    """
+    global _response_cache
+
+    settings = get_settings()
+    if not settings.get('llm.cache.enabled', True):
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                max_entries=settings.get('llm.cache.max_entries', 512),
+                ttl=settings.get('llm.cache.ttl', 86400),
+                path=settings.get('llm.cache.path', './data/cache/llm_responses.sqlite') or None
+            )
+        return _response_cache
@@ -1,13 +1,89 @@
 """Claude LLM provider implementation using LangChain."""
 
 import json
-from typing import Dict, Any, Optional
+import threading
+from importlib import metadata
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import Runnable
 
 from .base_provider import BaseLLMProvider
 
+# One ChatAnthropic (and HTTP connection pool) per
+# (api_key, model, temperature, max_tokens, request_timeout, prompt_caching)
+_clients: Dict[Tuple[str, str, float, int, Optional[float], bool], ChatAnthropic] = {}
+_clients_lock = threading.Lock()
+
+# Beta header enabling cache_control markers on older API versions
+PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+
+# First langchain-anthropic accepting content blocks (and cache_control) in system messages
+PROMPT_CACHING_MIN_VERSION = (0, 1, 23)
+
+
+def supports_prompt_caching() -> bool:
+    """Whether the installed langchain-anthropic can send cache_control markers."""
+    try:
+        version = metadata.version('langchain-anthropic')
+    except metadata.PackageNotFoundError:
+        return False
+    parts = []
+    for part in version.split('.')[:3]:
+        digits = ''.join(ch for ch in part if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    return tuple(parts) >= PROMPT_CACHING_MIN_VERSION
+
+
+def get_chat_client(api_key: str, model: str, temperature: float, max_tokens: int,
+                    request_timeout: Optional[float] = None, prompt_caching: bool = False) -> ChatAnthropic:
+    """
+    Get the process-wide ChatAnthropic client for a model and sampling parameters.
+
+    Sampling parameters and the request timeout are set on the client: the
+    pinned langchain-anthropic ignores parameters bound per call. Agents with
+    the same settings share one client (and its connection pool).
+
+    Args:
+        api_key: Anthropic API key
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        request_timeout: Seconds per request attempt (None for the SDK default)
+        prompt_caching: Send the prompt caching beta header with every request
+
+    Returns:
+        Shared ChatAnthropic instance
+    """
+    key = (api_key, model, temperature, max_tokens, request_timeout, prompt_caching)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # model_kwargs reach the SDK's messages.create/stream as keyword arguments
+            model_kwargs = {}
+            if request_timeout:
+                # 0.1.1 does not forward default_request_timeout to the SDK client
+                model_kwargs["timeout"] = request_timeout
+            if prompt_caching:
+                model_kwargs["extra_headers"] = {"anthropic-beta": PROMPT_CACHING_BETA}
+            client = ChatAnthropic(
+                anthropic_api_key=api_key,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                default_request_timeout=request_timeout,
+                model_kwargs=model_kwargs
+            )
+            # The SDK retries twice by default, under our own retries and
+            # outside the rate limiter; 0.1.1 has no field to turn that off.
+            # The SDK clients are plain attributes, so pydantic's __setattr__
+            # (which only accepts declared fields) is bypassed.
+            object.__setattr__(client, "_client", client._client.with_options(max_retries=0))
+            object.__setattr__(client, "_async_client", client._async_client.with_options(max_retries=0))
+            _clients[key] = client
+        return client
+
 
 class ClaudeProvider(BaseLLMProvider):
     """Claude (Anthropic) LLM provider using LangChain."""
@@ -22,14 +98,90 @@ class ClaudeProvider(BaseLLMProvider):
         super().__init__(config)
         self.validate_config()
 
-        # Initialize LangChain ChatAnthropic
-        self.client = ChatAnthropic(
-            anthropic_api_key=self.api_key,
-            model=self.model,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature
+        # Mark system prompts (the static prefix) as cacheable by the API; needs a
+        # langchain-anthropic accepting system content blocks (the pinned 0.1.1 rejects them)
+        self.prompt_caching = config.get('prompt_caching', False)
+        if self.prompt_caching and not supports_prompt_caching():
+            print("⚠️  prompt_caching needs langchain-anthropic >= "
+                  f"{'.'.join(map(str, PROMPT_CACHING_MIN_VERSION))}, sending plain system prompts")
+            self.prompt_caching = False
+
+        # Shared LangChain ChatAnthropic for this model and the default sampling parameters
+        self.client = get_chat_client(
+            self.api_key, self.model, self.temperature, self.max_tokens,
+            self.request_timeout, self.prompt_caching
         )
 
+    def _get_client(self, temperature: Optional[float], max_tokens: Optional[int]) -> ChatAnthropic:
+        """
+        Get the shared client for the effective sampling parameters.
+
+        The request timeout is the client's; the context's deadline is
+        enforced between attempts and while queued for the rate limiter.
+
+        Args:
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+
+        Returns:
+            Client for the effective parameters
+        """
+        temperature = self.temperature if temperature is None else temperature
+        max_tokens = max_tokens or self.max_tokens
+        if temperature == self.temperature and max_tokens == self.max_tokens:
+            return self.client
+        return get_chat_client(
+            self.api_key, self.model, temperature, max_tokens,
+            self.request_timeout, self.prompt_caching
+        )
+
+    def _build_messages(self, prompt: str, system: Optional[str]) -> List[BaseMessage]:
+        """
+        Build the message list for a prompt and optional system prompt.
+
+        With prompt caching enabled the system prompt carries a cache
+        breakpoint, so the API reuses it across calls and only the prompt
+        is processed fresh (prefixes below the model minimum are not cached).
+        """
+        messages = []
+        if system:
+            if self.prompt_caching:
+                messages.append(SystemMessage(content=[
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]))
+            else:
+                messages.append(SystemMessage(content=system))
+        messages.append(HumanMessage(content=prompt))
+        return messages
+
+    def _build_json_request(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system: Optional[str]
+    ) -> Tuple[Runnable, List[BaseMessage]]:
+        """
+        Build the client | JSON parser chain and its messages.
+
+        Returns:
+            Tuple of (chain, messages)
+        """
+        client = self._get_client(temperature, max_tokens)
+
+        # Create JSON output parser
+        json_parser = JsonOutputParser()
+
+        # Create chain: client | parser
+        chain = client | json_parser
+
+        # Add format instructions from parser to the static system prefix,
+        # keeping them out of the per-call prompt
+        format_instructions = json_parser.get_format_instructions()
+        full_system = f"{system}\n\n{format_instructions}" if system else format_instructions
+
+        return chain, self._build_messages(prompt, full_system)
+
     def query(
         self,
         prompt: str,
@@ -51,25 +203,21 @@ class ClaudeProvider(BaseLLMProvider):
         Returns:
             Claude's response as string
         """
-        # Create a new client instance with overridden parameters if provided
-        client = self.client
-        if temperature is not None or max_tokens is not None:
-            client = ChatAnthropic(
-                anthropic_api_key=self.api_key,
-                model=self.model,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature or self.temperature
-            )
-
-        # Build messages
-        messages = []
-        if system:
-            messages.append(SystemMessage(content=system))
-        messages.append(HumanMessage(content=prompt))
-
-        # Invoke the model
-        response = client.invoke(messages)
+        return self._cached_call(
+            'text', prompt, system, temperature, max_tokens,
+            lambda: self._query(prompt, temperature, max_tokens, system)
+        )
 
+    def _query(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system: Optional[str]
+    ) -> str:
+        """Send an uncached text query to Claude."""
+        client = self._get_client(temperature, max_tokens)
+        response = client.invoke(self._build_messages(prompt, system))
         return response.content
 
     def query_json(
@@ -93,33 +241,158 @@ class ClaudeProvider(BaseLLMProvider):
         Returns:
             Parsed JSON response as dictionary
         """
-        # Create client with JSON output parser
-        client = self.client
-        if temperature is not None or max_tokens is not None:
-            client = ChatAnthropic(
-                anthropic_api_key=self.api_key,
-                model=self.model,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature or self.temperature
-            )
+        return self._cached_call(
+            'json', prompt, system, temperature, max_tokens,
+            lambda: self._query_json(prompt, temperature, max_tokens, system)
+        )
 
-        # Create JSON output parser
-        json_parser = JsonOutputParser()
+    def _query_json(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system: Optional[str]
+    ) -> Dict[str, Any]:
+        """Send an uncached JSON query to Claude."""
+        chain, messages = self._build_json_request(prompt, temperature, max_tokens, system)
+        return chain.invoke(messages)
 
-        # Create chain: client | parser
-        chain = client | json_parser
+    async def aquery(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Send a query to Claude without blocking the event loop.
 
-        # Build messages
-        messages = []
-        if system:
-            messages.append(SystemMessage(content=system))
+        Args:
+            prompt: The prompt to send
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+            system: System prompt (optional)
+            **kwargs: Additional parameters
 
-        # Add format instructions from parser
-        format_instructions = json_parser.get_format_instructions()
-        full_prompt = f"{prompt}\n\n{format_instructions}"
-        messages.append(HumanMessage(content=full_prompt))
+        Returns:
+            Claude's response as string
+        """
+        return await self._acached_call(
+            'text', prompt, system, temperature, max_tokens,
+            lambda: self._aquery(prompt, temperature, max_tokens, system),
+            timeout
+        )
+
+    async def _aquery(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system: Optional[str]
+    ) -> str:
+        """Send an uncached async text query to Claude."""
+        client = self._get_client(temperature, max_tokens)
+        response = await client.ainvoke(self._build_messages(prompt, system))
+        return response.content
+
+    async def aquery_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a JSON query to Claude without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            timeout: Seconds before asyncio.TimeoutError (defaults to request_timeout)
+            system: System prompt (optional)
+            **kwargs: Additional parameters
+
+        Returns:
+            Parsed JSON response as dictionary
+        """
+        return await self._acached_call(
+            'json', prompt, system, temperature, max_tokens,
+            lambda: self._aquery_json(prompt, temperature, max_tokens, system),
+            timeout
+        )
 
-        # Invoke chain
-        result = chain.invoke(messages)
+    async def _aquery_json(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system: Optional[str]
+    ) -> Dict[str, Any]:
+        """Send an uncached async JSON query to Claude."""
+        chain, messages = self._build_json_request(prompt, temperature, max_tokens, system)
+        return await chain.ainvoke(messages)
+
+    def stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream Claude's text response chunk by chunk.
+
+        Args:
+            prompt: The prompt to send
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            system: System prompt (optional)
+            **kwargs: Additional parameters
+
+        Yields:
+            Text chunks
+        """
+        def call() -> Iterator[str]:
+            client = self._get_client(temperature, max_tokens)
+            for chunk in client.stream(self._build_messages(prompt, system)):
+                if chunk.content:
+                    yield chunk.content
+
+        yield from self._cached_stream(prompt, system, temperature, max_tokens, call)
+
+    async def astream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream Claude's text response without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            system: System prompt (optional)
+            **kwargs: Additional parameters
+
+        Yields:
+            Text chunks
+        """
+        async def call() -> AsyncIterator[str]:
+            client = self._get_client(temperature, max_tokens)
+            async for chunk in client.astream(self._build_messages(prompt, system)):
+                if chunk.content:
+                    yield chunk.content
 
-        return result
+        async for chunk in self._acached_stream(prompt, system, temperature, max_tokens, call):
+            yield chunk
@@ -0,0 +1,57 @@
+"""Shared background event loop for running async LLM calls from sync code."""
+
+import asyncio
+import contextvars
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide LLM event loop, starting it on first use.
+
+    A single long-lived loop keeps the async HTTP connection pools of the
+    shared LLM clients valid across calls (a pool cannot outlive its loop).
+
+    Returns:
+        Running event loop owned by a daemon thread
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True)
+            thread.start()
+        return _loop
+
+
+def run_sync(coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared LLM event loop and wait for its result.
+
+    The caller's context variables are visible to the coroutine. Must not
+    be called from a coroutine running on that loop.
+
+    Args:
+        coroutine: Coroutine to run
+        timeout: Seconds to wait before cancelling it (None waits indefinitely)
+
+    Returns:
+        Coroutine result
+    """
+    # Carry the caller's context (e.g. LLM priority) into the loop thread
+    context = contextvars.copy_context()
+
+    async def run_in_context() -> Any:
+        return await asyncio.get_running_loop().create_task(coroutine, context=context)
+
+    future = asyncio.run_coroutine_threadsafe(run_in_context(), get_event_loop())
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        future.cancel()
+        raise
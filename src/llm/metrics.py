@@ -0,0 +1,235 @@
+"""Per-call LLM instrumentation aggregated in-process by agent and campaign step."""
+
+import contextvars
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Any, Iterator, List, Optional, Tuple
+
+# Recent calls kept per agent for latency percentiles
+RECENT_CALLS_PER_AGENT = 500
+
+# Campaign/step that LLM calls made in the current context are attributed to
+_call_scope: contextvars.ContextVar[Tuple[Optional[str], Optional[int]]] = contextvars.ContextVar(
+    'llm_call_scope', default=(None, None)
+)
+
+
+@contextmanager
+def llm_call_scope(campaign_id: Optional[str], step: Optional[int] = None) -> Iterator[None]:
+    """
+    Attribute LLM calls made within a block to a campaign and plan step.
+
+    Args:
+        campaign_id: Campaign identifier
+        step: Plan step number
+    """
+    token = _call_scope.set((campaign_id, step))
+    try:
+        yield
+    finally:
+        _call_scope.reset(token)
+
+
+@dataclass
+class LLMCallRecord:
+    """Measurements for a single provider call."""
+    agent: str
+    kind: str  # text, json, stream
+    wall_time: float  # seconds, including rate-limit queueing
+    queue_time: float = 0.0  # seconds waiting for the rate limiter
+    time_to_first_token: Optional[float] = None  # seconds, streamed calls only
+    input_tokens: int = 0
+    output_tokens: int = 0
+    retries: int = 0
+    hedged: bool = False  # a duplicate request was sent after the hedge delay
+    cache_hit: bool = False
+    error: Optional[str] = None
+    campaign_id: Optional[str] = None
+    step: Optional[int] = None
+    started: float = 0.0  # time.perf_counter() when the call began
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0, "cache_hits": 0, "errors": 0, "retries": 0, "hedges": 0, "fallbacks": 0,
+        "input_tokens": 0, "output_tokens": 0,
+        "wall_time": 0.0, "max_wall_time": 0.0, "queue_time": 0.0,
+        "time_to_first_token": 0.0, "streamed_calls": 0
+    }
+
+
+def _add_record(totals: Dict[str, Any], record: LLMCallRecord) -> None:
+    totals["calls"] += 1
+    totals["cache_hits"] += int(record.cache_hit)
+    totals["errors"] += int(record.error is not None)
+    totals["retries"] += record.retries
+    totals["hedges"] += int(record.hedged)
+    totals["input_tokens"] += record.input_tokens
+    totals["output_tokens"] += record.output_tokens
+    totals["wall_time"] += record.wall_time
+    totals["max_wall_time"] = max(totals["max_wall_time"], record.wall_time)
+    totals["queue_time"] += record.queue_time
+    if record.time_to_first_token is not None:
+        totals["time_to_first_token"] += record.time_to_first_token
+        totals["streamed_calls"] += 1
+
+
+def _summarize(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn running totals into a JSON-friendly summary."""
+    calls = totals["calls"]
+    streamed = totals.pop("streamed_calls")
+    ttft_total = totals.pop("time_to_first_token")
+    summary = {key: round(value, 3) if isinstance(value, float) else value for key, value in totals.items()}
+    summary["avg_wall_time"] = round(totals["wall_time"] / calls, 3) if calls else 0.0
+    summary["avg_time_to_first_token"] = round(ttft_total / streamed, 3) if streamed else None
+    summary["cache_hit_rate"] = round(totals["cache_hits"] / calls, 3) if calls else 0.0
+    return summary
+
+
+class LLMCallMetrics:
+    """
+    Thread-safe aggregator for LLM call records.
+
+    Keeps running totals per agent (with a window of recent wall times for
+    percentiles) and per (campaign, step) until the step's summary is taken.
+    Successful uncached calls also feed a per-agent window of service times
+    (excluding queueing) used to pick hedge delays.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_agent: Dict[str, Dict[str, Any]] = {}
+        self._recent: Dict[str, Deque[float]] = {}
+        self._service_times: Dict[str, Deque[float]] = {}
+        self._by_step: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
+
+    def record(self, record: LLMCallRecord) -> None:
+        """
+        Add a call record, tagging it with the current campaign/step scope.
+
+        Args:
+            record: Call measurements
+        """
+        if record.campaign_id is None:
+            record.campaign_id, record.step = _call_scope.get()
+
+        with self._lock:
+            _add_record(self._by_agent.setdefault(record.agent, _empty_totals()), record)
+            self._recent.setdefault(record.agent, deque(maxlen=RECENT_CALLS_PER_AGENT)).append(record.wall_time)
+            if not record.cache_hit and record.error is None and not record.retries:
+                self._service_times.setdefault(record.agent, deque(maxlen=RECENT_CALLS_PER_AGENT)).append(
+                    record.wall_time - record.queue_time
+                )
+            if record.campaign_id is not None:
+                _add_record(self._by_step.setdefault((record.campaign_id, record.step), _empty_totals()), record)
+
+    def record_fallback(self, agent: str) -> None:
+        """
+        Count an agent falling back to non-LLM output after a failed call.
+
+        Args:
+            agent: Agent name
+        """
+        campaign_id, step = _call_scope.get()
+        with self._lock:
+            self._by_agent.setdefault(agent, _empty_totals())["fallbacks"] += 1
+            if campaign_id is not None:
+                self._by_step.setdefault((campaign_id, step), _empty_totals())["fallbacks"] += 1
+
+    def latency_percentile(self, agent: str, fraction: float, min_samples: int) -> Optional[float]:
+        """
+        Get a percentile of an agent's recent service times.
+
+        Args:
+            agent: Agent name
+            fraction: Percentile as a fraction (e.g. 0.95)
+            min_samples: Samples required before a value is returned
+
+        Returns:
+            Service time in seconds, or None with too few samples
+        """
+        with self._lock:
+            times = list(self._service_times.get(agent, ()))
+        if len(times) < max(min_samples, 1):
+            return None
+        return _percentile(times, fraction)
+
+    def pop_step(self, campaign_id: str, step: Optional[int]) -> Dict[str, Any]:
+        """
+        Take the summary of the calls made during a plan step.
+
+        Args:
+            campaign_id: Campaign identifier
+            step: Plan step number
+
+        Returns:
+            Step summary (empty if the step made no LLM calls)
+        """
+        with self._lock:
+            totals = self._by_step.pop((campaign_id, step), None)
+        return _summarize(totals) if totals else {}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-agent call statistics.
+
+        Returns:
+            Agent name -> totals, averages and p50/p95 wall time of recent calls
+        """
+        with self._lock:
+            snapshot = {agent: dict(totals) for agent, totals in self._by_agent.items()}
+            recent = {agent: list(times) for agent, times in self._recent.items()}
+
+        result = {}
+        for agent, totals in snapshot.items():
+            summary = _summarize(totals)
+            times = recent.get(agent)
+            if times:
+                summary["p50_wall_time"] = round(_percentile(times, 0.5), 3)
+                summary["p95_wall_time"] = round(_percentile(times, 0.95), 3)
+            result[agent] = summary
+        return result
+
+
+_metrics = LLMCallMetrics()
+
+
+def record_llm_call(record: LLMCallRecord) -> None:
+    """Add a call record to the process-wide metrics."""
+    _metrics.record(record)
+
+
+def record_llm_fallback(agent: str, error: Optional[BaseException] = None) -> None:
+    """
+    Record that an agent used its non-LLM fallback.
+
+    Args:
+        agent: Agent name
+        error: Exception that triggered the fallback (logged)
+    """
+    if error is not None:
+        print(f"⚠️  {agent} LLM call failed, using fallback: {error}")
+    _metrics.record_fallback(agent)
+
+
+def pop_step_llm_metrics(campaign_id: str, step: Optional[int]) -> Dict[str, Any]:
+    """Take the LLM call summary for a campaign plan step."""
+    return _metrics.pop_step(campaign_id, step)
+
+
+def get_latency_percentile(agent: str, fraction: float, min_samples: int = 20) -> Optional[float]:
+    """Get a percentile of an agent's recent uncached LLM service times."""
+    return _metrics.latency_percentile(agent, fraction, min_samples)
+
+
+def get_llm_call_stats() -> Dict[str, Any]:
+    """Get per-agent LLM call statistics for this process."""
+    return _metrics.stats()
@@ -0,0 +1,96 @@
+"""Prompt compaction and per-agent prompt token accounting."""
+
+import re
+import textwrap
+import threading
+from typing import Dict, Any, Optional
+
+from .tokens import estimate_tokens
+
+_BLANK_LINE_RUNS = re.compile(r'\n{3,}')
+
+
+def compact_prompt(text: str) -> str:
+    """
+    Remove whitespace that costs tokens without carrying meaning.
+
+    Strips the common indentation of triple-quoted prompts, trailing
+    spaces and runs of blank lines; relative indentation and single blank
+    lines between sections are kept.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Compacted prompt text
+    """
+    if not text:
+        return text
+    lines = [line.rstrip() for line in textwrap.dedent(text).strip().splitlines()]
+    return _BLANK_LINE_RUNS.sub("\n\n", "\n".join(lines))
+
+
+class PromptTokenStats:
+    """Per-agent prompt size counters, split into static (system) and dynamic (prompt) tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, agent: str, prompt: str, system: Optional[str]) -> None:
+        """
+        Record the size of a prompt sent to the LLM.
+
+        Args:
+            agent: Agent (or provider) name the request is attributed to
+            prompt: Dynamic prompt text
+            system: Static system prompt (the cacheable prefix)
+        """
+        static_tokens = estimate_tokens(system)
+        dynamic_tokens = estimate_tokens(prompt)
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                agent, {"requests": 0, "static_tokens": 0, "dynamic_tokens": 0, "max_prompt_tokens": 0}
+            )
+            stats["requests"] += 1
+            stats["static_tokens"] += static_tokens
+            stats["dynamic_tokens"] += dynamic_tokens
+            stats["max_prompt_tokens"] = max(stats["max_prompt_tokens"], static_tokens + dynamic_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get prompt token statistics.
+
+        Returns:
+            Agent name -> request count, average static/dynamic tokens,
+            largest prompt and the cacheable share of prompt tokens
+        """
+        with self._lock:
+            snapshot = {agent: dict(stats) for agent, stats in self._stats.items()}
+
+        result = {}
+        for agent, stats in snapshot.items():
+            requests = stats["requests"]
+            total = stats["static_tokens"] + stats["dynamic_tokens"]
+            result[agent] = {
+                "requests": requests,
+                "avg_static_tokens": round(stats["static_tokens"] / requests, 1),
+                "avg_dynamic_tokens": round(stats["dynamic_tokens"] / requests, 1),
+                "max_prompt_tokens": stats["max_prompt_tokens"],
+                "static_share": round(stats["static_tokens"] / total, 3) if total else 0.0
+            }
+        return result
+
+
+_prompt_stats = PromptTokenStats()
+
+
+def get_prompt_token_stats() -> Dict[str, Any]:
+    """Get per-agent prompt token statistics for this process."""
+    return _prompt_stats.stats()
+
+
+def record_prompt_tokens(agent: str, prompt: str, system: Optional[str]) -> None:
+    """Record a sent prompt in the process-wide per-agent statistics."""
+    _prompt_stats.record(agent, prompt, system)
@@ -0,0 +1,329 @@
+"""Process-wide LLM request scheduler with token-bucket budgets and priorities."""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.core.config import get_settings
+
+class Priority(IntEnum):
+    """LLM request priority classes (lower value is served first)."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+# Priority applied to LLM calls made in the current context (campaign thread)
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    'llm_priority', default=Priority.INTERACTIVE
+)
+
+
+def get_current_priority() -> Priority:
+    """Get the LLM priority of the current context."""
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: Any) -> Iterator[Priority]:
+    """
+    Run a block with the given LLM priority.
+
+    Args:
+        priority: Priority member or name ('interactive', 'batch')
+
+    Yields:
+        Effective Priority
+    """
+    if not isinstance(priority, Priority):
+        priority = Priority[str(priority).upper()]
+
+    token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """Bucket refilled continuously up to a per-minute capacity."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            per_minute: Capacity and refill amount per minute (0 = unlimited)
+        """
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until the bucket holds amount (capped at capacity)."""
+        if self.unlimited:
+            return 0.0
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Remove tokens (the level may go negative when settling actual usage)."""
+        if not self.unlimited:
+            self.level -= amount
+
+
+class RateLimiter:
+    """
+    Fair scheduler for LLM requests under requests-per-minute and
+    tokens-per-minute budgets.
+
+    Waiters are queued by (priority, arrival), so interactive requests are
+    admitted ahead of queued batch requests and callers within a class are
+    served in order. Both sync (thread) and async callers share the queue:
+    threads wait on a condition, coroutines on a per-waiter asyncio.Event,
+    and both are woken whenever the head of the queue changes.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Request budget (0 = unlimited)
+            tokens_per_minute: Token budget (0 = unlimited)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        # Async waiter ticket -> (its event loop, event set on queue changes)
+        self._async_events: Dict[Tuple[int, int], Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = {}
+        self._sequence = itertools.count()
+        self._stats = {"admitted": 0, "waited": 0, "wait_seconds": 0.0, "timeouts": 0}
+        self._stats_by_priority = {priority.name.lower(): 0 for priority in Priority}
+
+    def _enqueue(self, priority: Priority) -> Tuple[int, int]:
+        """Add a waiter ticket to the queue (lock held)."""
+        ticket = (int(priority), next(self._sequence))
+        heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]) -> None:
+        """Remove a waiter ticket from the queue and wake the others (lock held)."""
+        if self._waiters and self._waiters[0] == ticket:
+            heapq.heappop(self._waiters)
+        elif ticket in self._waiters:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+        self._async_events.pop(ticket, None)
+        self._condition.notify_all()
+        for loop, event in self._async_events.values():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # the waiter's loop is closed
+
+    def _try_admit(self, ticket: Tuple[int, int], tokens: float) -> Optional[float]:
+        """
+        Admit the ticket if it is first in line and the budgets allow (lock held).
+
+        Returns:
+            None if admitted, otherwise seconds to wait before retrying
+            (infinite while other waiters are ahead: _dequeue wakes the queue)
+        """
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+        if self._waiters[0] != ticket:
+            return math.inf
+
+        wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+        if wait > 0:
+            return wait
+
+        self.requests.take(1)
+        self.tokens.take(min(tokens, self.tokens.capacity))
+        self._dequeue(ticket)
+        return None
+
+    def _record_admission(self, priority: Priority, waited: float) -> None:
+        """Update admission statistics (lock held)."""
+        self._stats["admitted"] += 1
+        self._stats_by_priority[priority.name.lower()] += 1
+        if waited > 0.001:
+            self._stats["waited"] += 1
+            self._stats["wait_seconds"] += waited
+
+    def acquire(self, tokens: float = 0, priority: Optional[Priority] = None,
+                timeout: Optional[float] = None) -> float:
+        """
+        Block until a request with the given token estimate may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+            priority: Priority class (defaults to the current context's)
+            timeout: Seconds to wait before raising TimeoutError
+
+        Returns:
+            Seconds spent waiting
+        """
+        priority = get_current_priority() if priority is None else priority
+        started = time.monotonic()
+        deadline = started + timeout if timeout else None
+
+        with self._condition:
+            ticket = self._enqueue(priority)
+            try:
+                while True:
+                    wait = self._try_admit(ticket, tokens)
+                    if wait is None:
+                        waited = time.monotonic() - started
+                        self._record_admission(priority, waited)
+                        return waited
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["timeouts"] += 1
+                            raise TimeoutError("Timed out waiting for LLM rate limit")
+                        wait = min(wait, remaining)
+
+                    self._condition.wait(timeout=None if wait == math.inf else wait)
+            except BaseException:
+                self._dequeue(ticket)
+                raise
+
+    async def aacquire(self, tokens: float = 0, priority: Optional[Priority] = None,
+                       timeout: Optional[float] = None) -> float:
+        """
+        Async variant of acquire; waits without blocking the event loop.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+            priority: Priority class (defaults to the current context's)
+            timeout: Seconds to wait before raising TimeoutError
+
+        Returns:
+            Seconds spent waiting
+        """
+        priority = get_current_priority() if priority is None else priority
+        started = time.monotonic()
+        deadline = started + timeout if timeout else None
+        event = asyncio.Event()
+
+        with self._condition:
+            ticket = self._enqueue(priority)
+            self._async_events[ticket] = (asyncio.get_running_loop(), event)
+
+        try:
+            while True:
+                with self._condition:
+                    # Cleared before checking, so a change made after the check still wakes us
+                    event.clear()
+                    wait = self._try_admit(ticket, tokens)
+                    if wait is None:
+                        waited = time.monotonic() - started
+                        self._record_admission(priority, waited)
+                        return waited
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["timeouts"] += 1
+                            raise TimeoutError("Timed out waiting for LLM rate limit")
+                        wait = min(wait, remaining)
+
+                try:
+                    await asyncio.wait_for(event.wait(), None if wait == math.inf else wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._condition:
+                self._dequeue(ticket)
+            raise
+
+    def record_usage(self, tokens: float) -> None:
+        """
+        Charge tokens consumed beyond the admission estimate (e.g. the response).
+
+        Args:
+            tokens: Additional tokens used
+        """
+        if tokens <= 0:
+            return
+        with self._condition:
+            self.tokens.refill(time.monotonic())
+            self.tokens.take(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dictionary with budgets, queue depth and admission counters
+        """
+        with self._condition:
+            return {
+                "requests_per_minute": self.requests.capacity,
+                "tokens_per_minute": self.tokens.capacity,
+                "queued": len(self._waiters),
+                "admitted_by_priority": dict(self._stats_by_priority),
+                **{key: round(value, 3) if isinstance(value, float) else value
+                   for key, value in self._stats.items()}
+            }
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider_name: str) -> Optional[RateLimiter]:
+    """
+    Get the process-wide rate limiter for a provider (llm.rate_limits.<provider>).
+
+    Args:
+        provider_name: Provider name from config.yaml
+
+    Returns:
+        RateLimiter instance, or None if no budgets are configured
+    """
+    settings = get_settings()
+    limits = settings.get(f'llm.rate_limits.{provider_name}') or {}
+    requests_per_minute = limits.get('requests_per_minute', 0) or 0
+    tokens_per_minute = limits.get('tokens_per_minute', 0) or 0
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(provider_name)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            _rate_limiters[provider_name] = limiter
+        return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """Get statistics for every active rate limiter, keyed by provider."""
+    with _rate_limiters_lock:
+        limiters = dict(_rate_limiters)
+    return {provider_name: limiter.stats() for provider_name, limiter in limiters.items()}
@@ -0,0 +1,84 @@
+"""Process-wide registry of configured LLM providers."""
+
+import threading
+from typing import Dict, Any, Optional, Tuple, Type
+
+from src.core.config import get_settings
+
+from .base_provider import BaseLLMProvider
+from .claude import ClaudeProvider
+from .stub import StubProvider
+
+# Provider name (as in config.yaml llm.providers) -> implementation
+PROVIDER_CLASSES: Dict[str, Type[BaseLLMProvider]] = {
+    "claude": ClaudeProvider,
+    "stub": StubProvider,
+}
+
+# Agent config keys that override the provider config for that agent's calls
+AGENT_PROVIDER_OVERRIDES = (
+    'temperature',
+    'request_timeout',
+    'max_retries',
+    'retry_backoff',
+    'hedge_percentile',
+)
+
+_providers: Dict[Tuple, BaseLLMProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_llm_provider(provider_name: Optional[str] = None, **overrides: Any) -> BaseLLMProvider:
+    """
+    Get a shared provider instance for a provider name and config overrides.
+
+    Providers with the same name and overrides (e.g. agent temperature) are
+    created once per process, and all providers of a model share one pooled
+    client.
+
+    Args:
+        provider_name: Provider name from config.yaml (defaults to llm.default_provider)
+        **overrides: Provider config values to override (temperature, cache_responses, ...)
+
+    Returns:
+        Shared BaseLLMProvider instance
+    """
+    settings = get_settings()
+    provider_name = provider_name or settings.llm_default_provider
+
+    provider_class = PROVIDER_CLASSES.get(provider_name)
+    if provider_class is None:
+        raise ValueError(f"Unsupported LLM provider: {provider_name}")
+
+    key = (provider_name, tuple(sorted(overrides.items())))
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            # Copy so overrides never leak into the shared settings dict
+            config = {**settings.get_llm_config(provider_name), **overrides, "name": provider_name}
+            provider = provider_class(config)
+            _providers[key] = provider
+        return provider
+
+
+def get_agent_llm_provider(agent_config: Dict[str, Any], agent_name: Optional[str] = None) -> BaseLLMProvider:
+    """
+    Get the shared provider configured for an agent.
+
+    Args:
+        agent_config: Agent configuration from config.yaml
+        agent_name: Agent name that prompt statistics are attributed to
+
+    Returns:
+        Shared BaseLLMProvider instance with the agent's overrides applied
+    """
+    overrides = {"cache_responses": agent_config.get('cache_responses', True)}
+    if agent_name:
+        overrides['agent'] = agent_name
+
+    # Override temperature, timeouts, retries and hedging if specified in agent config
+    for key in AGENT_PROVIDER_OVERRIDES:
+        if key in agent_config:
+            overrides[key] = agent_config[key]
+
+    return get_llm_provider(agent_config.get('provider'), **overrides)
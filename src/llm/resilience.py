@@ -0,0 +1,96 @@
+"""Deadlines, retry backoff and retryable-error classification for LLM calls."""
+
+import asyncio
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Exception class names (Anthropic/OpenAI SDKs, LangChain) that are transient
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "OverloadedError",
+    "OutputParserException",  # malformed JSON; a new sample usually parses
+}
+
+# Absolute time.monotonic() deadline for LLM calls made in the current context
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('llm_deadline', default=None)
+
+
+@contextmanager
+def llm_deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound the LLM calls (including retries) made within a block.
+
+    Nested deadlines never extend an enclosing one.
+
+    Args:
+        seconds: Time budget for the block (None or 0 = no limit)
+
+    Yields:
+        Effective absolute deadline (time.monotonic() based), or None
+    """
+    current = _deadline.get()
+    deadline = current
+    if seconds:
+        deadline = time.monotonic() + seconds
+        if current is not None:
+            deadline = min(deadline, current)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the seconds left before the current context's deadline.
+
+    Returns:
+        Remaining seconds (may be negative), or None without a deadline
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, max_delay: float) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number (0 for the first retry)
+        base: Delay scale in seconds
+        max_delay: Upper bound for the un-jittered delay
+
+    Returns:
+        Seconds to sleep, drawn uniformly from [0, min(max_delay, base * 2^attempt)]
+    """
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether a failed LLM call is worth retrying.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True for timeouts, connection errors, rate limits, server errors
+        and unparseable output
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return isinstance(status_code, int) and status_code in RETRYABLE_STATUS_CODES
@@ -0,0 +1,319 @@
+"""Deterministic offline LLM provider for load testing and benchmarks."""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator
+
+from .base_provider import BaseLLMProvider
+
+GOAL_PATTERN = re.compile(r'GOAL:\s*"(.*?)"', re.S)
+SEGMENT_LINE_PATTERN = re.compile(r'^\s*-\s*"([^"]+)"', re.M)
+QUOTED_PATTERN = re.compile(r'"([^"]{2,80})"')
+
+# Goal keyword -> objective
+OBJECTIVE_KEYWORDS = [
+    ("winback", ("win back", "winback", "lapsed", "churned", "inactive")),
+    ("upsell", ("upsell", "cross-sell", "cross sell", "upgrade")),
+    ("acquisition", ("acquire", "acquisition", "recruit", "onboard")),
+    ("engagement", ("engage", "engagement", "activate", "re-engage")),
+    ("retention", ("retain", "retention", "loyal", "keep")),
+]
+
+# Goal keyword -> constraint (mirrors the interpretation guidelines in the goal-parser prompt)
+CONSTRAINT_KEYWORDS = [
+    (("high-value", "high value", "top performer", "top-performer"),
+     {"field": "AUM_SELFREPORTED", "operator": ">", "value": 5000000}),
+    (("excellent satisfaction", "good satisfaction", "satisfied", "promoter"),
+     {"field": "NPS_SCORE", "operator": ">=", "value": 8}),
+    (("poor satisfaction", "at-risk", "at risk", "dissatisfied", "detractor"),
+     {"field": "NPS_SCORE", "operator": "<=", "value": 6}),
+    (("active", "productive"),
+     {"field": "NO_OF_UNIQUE_POLICIES_SOLD_LAST_12_MONTHS", "operator": ">=", "value": 5}),
+    (("veteran", "experienced"),
+     {"field": "AGENT_TENURE", "operator": ">=", "value": 10}),
+    (("new agent", "new agents", "recent"),
+     {"field": "AGENT_TENURE", "operator": "<", "value": 2}),
+    (("high premium", "premium generator"),
+     {"field": "PREMIUM_AMOUNT", "operator": ">", "value": 50000}),
+    (("low premium", "underperforming"),
+     {"field": "PREMIUM_AMOUNT", "operator": "<", "value": 10000}),
+]
+
+NARRATIVE_OPENINGS = [
+    "This segment shows strong potential for a focused, data-driven campaign.",
+    "Agents in this group combine solid fundamentals with clear room to grow.",
+    "The profile points to a stable base that responds well to recognition.",
+    "This cohort is well positioned for targeted engagement and incentives.",
+]
+NARRATIVE_TACTICS = [
+    "Performance Incentive: 5 policies in Q4 → $150 gift card.",
+    "Performance Incentive: 2 policies in 60 days → $200 travel voucher.",
+    "Performance Incentive: $500K AUM → premium tech accessories bundle.",
+    "Training: product certification and a leadership workshop.",
+    "Training: sales fundamentals with 1-1 coaching.",
+    "Training: executive masterclass on portfolio growth.",
+    "Recognition: regional leaderboard and peer network spotlight.",
+    "Recognition: advisory board invitation and achievement award.",
+    "Recognition: new agent spotlight in the monthly newsletter.",
+]
+NARRATIVE_CLOSINGS = [
+    "Track response rates weekly and rebalance incentives after the first month.",
+    "Measure NPS and policy velocity at the midpoint to confirm impact.",
+    "Sequence outreach by channel preference to keep fatigue low.",
+]
+
+
+class StubProvider(BaseLLMProvider):
+    """
+    Offline provider returning deterministic responses with simulated latency.
+
+    Responses depend only on a hash of the system prompt and prompt, so runs
+    are reproducible; latency is drawn from the configured distribution.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize stub provider.
+
+        Args:
+            config: Provider configuration from config.yaml (llm.providers.stub)
+        """
+        super().__init__(config)
+        self.model = self.model or 'stub'
+
+        latency = config.get('latency', {}) or {}
+        self.latency_distribution = latency.get('distribution', 'fixed')  # fixed, lognormal
+        self.latency_ms = float(latency.get('latency_ms', 500))  # fixed value or lognormal median
+        self.latency_sigma = float(latency.get('sigma', 0.5))
+        self.spike_probability = float(latency.get('spike_probability', 0.0))
+        self.spike_ms = float(latency.get('spike_ms', 5000))
+        self.first_token_fraction = float(latency.get('first_token_fraction', 0.2))
+
+        self._random = random.Random(config.get('seed', 42))
+        self._random_lock = threading.Lock()
+
+    def validate_config(self) -> bool:
+        """The stub needs no API key or model."""
+        return True
+
+    def sample_latency(self) -> float:
+        """
+        Draw one response latency.
+
+        Returns:
+            Latency in seconds
+        """
+        with self._random_lock:
+            if self.latency_distribution == 'lognormal':
+                latency_ms = self._random.lognormvariate(math.log(max(self.latency_ms, 1.0)), self.latency_sigma)
+            else:
+                latency_ms = self.latency_ms
+
+            if self.spike_probability and self._random.random() < self.spike_probability:
+                latency_ms += self.spike_ms
+
+        return latency_ms / 1000.0
+
+    def _sleep_latency(self) -> None:
+        """Block for one sampled latency, timing out like a real client would."""
+        latency = self.sample_latency()
+        timeout = self.effective_timeout()
+        if timeout and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Stub request timed out after {timeout:.1f}s")
+        time.sleep(latency)
+
+    @staticmethod
+    def _digest(prompt: str, system: Optional[str]) -> bytes:
+        """Hash of the request that all generated content is derived from."""
+        return hashlib.sha256(f"{system or ''}\n{prompt}".encode('utf-8')).digest()
+
+    def _narrative(self, prompt: str, system: Optional[str], subject: Optional[str] = None) -> str:
+        """Build a deterministic markdown narrative for a prompt."""
+        digest = self._digest(prompt, f"{system or ''}|{subject or ''}")
+
+        if subject is None:
+            quoted = QUOTED_PATTERN.search(prompt)
+            subject = quoted.group(1) if quoted else "this segment"
+
+        tactics = [
+            NARRATIVE_TACTICS[digest[1] % 3],
+            NARRATIVE_TACTICS[3 + digest[2] % 3],
+            NARRATIVE_TACTICS[6 + digest[3] % 3],
+        ]
+        return (
+            f"**Profile Summary**\n"
+            f"{NARRATIVE_OPENINGS[digest[0] % len(NARRATIVE_OPENINGS)]} "
+            f"Focus for {subject}: consistent growth with tailored rewards.\n\n"
+            f"**Engagement Tactics**\n\n"
+            + "\n".join(f"{i}. {tactic}" for i, tactic in enumerate(tactics, start=1))
+            + f"\n\n{NARRATIVE_CLOSINGS[digest[4] % len(NARRATIVE_CLOSINGS)]}"
+        )
+
+    def _json_response(self, prompt: str, system: Optional[str]) -> Dict[str, Any]:
+        """Build a deterministic JSON response matching the prompt's expected schema."""
+        segment_names = []
+        if 'SEGMENTS:' in prompt:
+            segment_names = SEGMENT_LINE_PATTERN.findall(prompt.split('SEGMENTS:', 1)[1])
+        if segment_names:
+            # Multi-segment strategy prompt: narratives keyed by segment name
+            return {name: self._narrative(prompt, system, subject=name) for name in segment_names}
+
+        goal_match = GOAL_PATTERN.search(prompt)
+        goal = (goal_match.group(1) if goal_match else prompt).lower()
+        digest = self._digest(prompt, system)
+
+        objective = next(
+            (name for name, keywords in OBJECTIVE_KEYWORDS if any(k in goal for k in keywords)),
+            "retention"
+        )
+        constraints = [
+            dict(constraint) for keywords, constraint in CONSTRAINT_KEYWORDS
+            if any(k in goal for k in keywords)
+        ]
+        if not constraints:
+            constraints = [{"field": "NPS_SCORE", "operator": ">=", "value": 7}]
+
+        return {
+            "objective": objective,
+            "constraints": constraints,
+            "target_size": 50 + 50 * (digest[0] % 10),
+            "priority": ("quality_over_quantity", "balanced", "quantity_over_quality")[digest[1] % 3]
+        }
+
+    @staticmethod
+    def _chunks(text: str) -> List[str]:
+        """Split text into word-sized stream chunks."""
+        return re.findall(r'\S+\s*|\s+', text)
+
+    def query(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Return a deterministic narrative after a simulated delay.
+
+        Args:
+            prompt: The prompt to send
+            temperature: Ignored (part of the cache key only)
+            max_tokens: Ignored (part of the cache key only)
+            system: System prompt (optional)
+            **kwargs: Additional parameters
+
+        Returns:
+            Narrative text
+        """
+        def call() -> str:
+            self._sleep_latency()
+            return self._narrative(prompt, system)
+
+        return self._cached_call('text', prompt, system, temperature, max_tokens, call)
+
+    def query_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Return schema-valid JSON (goal criteria or per-segment narratives) after a simulated delay.
+
+        Args:
+            prompt: The prompt to send
+            temperature: Ignored (part of the cache key only)
+            max_tokens: Ignored (part of the cache key only)
+            system: System prompt (optional)
+            **kwargs: Additional parameters
+
+        Returns:
+            Parsed JSON response as dictionary
+        """
+        def call() -> Dict[str, Any]:
+            self._sleep_latency()
+            return self._json_response(prompt, system)
+
+        return self._cached_call('json', prompt, system, temperature, max_tokens, call)
+
+    async def aquery(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """Async variant of query (sleeps without blocking the event loop)."""
+        async def call() -> str:
+            await asyncio.sleep(self.sample_latency())
+            return self._narrative(prompt, system)
+
+        return await self._acached_call('text', prompt, system, temperature, max_tokens, call, timeout)
+
+    async def aquery_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Async variant of query_json (sleeps without blocking the event loop)."""
+        async def call() -> Dict[str, Any]:
+            await asyncio.sleep(self.sample_latency())
+            return self._json_response(prompt, system)
+
+        return await self._acached_call('json', prompt, system, temperature, max_tokens, call, timeout)
+
+    def stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """Stream the deterministic narrative word by word over the sampled latency."""
+        def call() -> Iterator[str]:
+            latency = self.sample_latency()
+            chunks = self._chunks(self._narrative(prompt, system))
+            time.sleep(latency * self.first_token_fraction)
+            interval = latency * (1 - self.first_token_fraction) / max(len(chunks), 1)
+            for chunk in chunks:
+                yield chunk
+                time.sleep(interval)
+
+        yield from self._cached_stream(prompt, system, temperature, max_tokens, call)
+
+    async def astream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Async variant of stream."""
+        async def call() -> AsyncIterator[str]:
+            latency = self.sample_latency()
+            chunks = self._chunks(self._narrative(prompt, system))
+            await asyncio.sleep(latency * self.first_token_fraction)
+            interval = latency * (1 - self.first_token_fraction) / max(len(chunks), 1)
+            for chunk in chunks:
+                yield chunk
+                await asyncio.sleep(interval)
+
+        async for chunk in self._acached_stream(prompt, system, temperature, max_tokens, call):
+            yield chunk
@@ -0,0 +1,24 @@
+"""Lightweight token estimates for prompt and response accounting."""
+
+import math
+from typing import Any, Optional
+
+# Average characters per token for English prose on Claude models
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Optional[Any]) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Prompt or response text (non-strings are converted with str)
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = str(text)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
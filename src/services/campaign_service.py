@@ -10,8 +10,9 @@ from concurrent.futures import ThreadPoolExecutor
 
 from src.agents import OrchestratorAgent, Message
 from src.core.config import get_settings
-from src.core.planner import CampaignPlanner
+from src.core.planner import CampaignPlanner, get_artifact_store
 from src.connectors.factory import create_connector
+from src.llm import llm_priority
 
 
 def _serialize_dataframes(obj: Any) -> Any:
@@ -42,6 +43,7 @@ class CampaignService:
     - Accept campaign creation requests
     - Create execution plans via CampaignPlanner
     - Orchestrate multi-agent workflow asynchronously
+    - Resume campaigns interrupted by a restart
     - Return structured results
     """
 
@@ -52,6 +54,9 @@ class CampaignService:
         # Get planner singleton
         self.planner = CampaignPlanner.get_instance()
 
+        # Resolves step outputs the orchestrator moved to artifact files
+        self.artifacts = get_artifact_store()
+
         # Initialize orchestrator
         self.orchestrator = OrchestratorAgent(config={})
 
@@ -68,6 +73,26 @@ class CampaignService:
         self._campaigns_file = campaigns_file
         self._required_fields = ['campaign_id', 'name', 'goal', 'target_criteria', 'segment_size', 'created_at', 'status']
 
+        # Resume campaigns interrupted by a restart from their last completed step
+        if settings.get('planner.resume_on_startup', True):
+            self._resume_interrupted_campaigns(settings.get('planner.resume_stale_after', 360))
+
+    def _resume_interrupted_campaigns(self, stale_after: float) -> None:
+        """
+        Re-submit unfinished campaigns found in the plan store.
+
+        Completed steps are checkpointed, so the orchestrator only runs the
+        remaining ones, at the LLM priority the campaign was created with.
+
+        Args:
+            stale_after: Seconds without updates before a plan counts as abandoned
+        """
+        for campaign_id in self.planner.claim_interrupted_plans(stale_after):
+            plan = self.planner.get_plan(campaign_id, include_results=False)
+            priority = plan.priority if plan else "interactive"
+            print(f"🔄 Resuming interrupted campaign {campaign_id} ({priority})")
+            self.executor.submit(self._execute_campaign_async, campaign_id, priority)
+
     def _generate_campaign_name(self, goal: str) -> str:
         """
         Generate an intelligent campaign name based on the goal.
@@ -177,8 +202,8 @@ class CampaignService:
                 print(f"Warning: No valid profile data found for campaign {campaign_id}")
                 return
             
-            # Get agent profiles from the profile result
-            agent_profiles = profile_result.get('agent_profiles', [])
+            # Get agent profiles from the profile result (loaded if offloaded to an artifact)
+            agent_profiles = self.artifacts.resolve(profile_result.get('agent_profiles', []))
             
             if not agent_profiles:
                 print(f"Warning: No agent profiles found for campaign {campaign_id}")
@@ -215,19 +240,22 @@ class CampaignService:
         """
         Persist complete LLM-generated results to campaign_results table.
         
+        Fields offloaded to the artifact store are loaded and inlined: the
+        artifact files are local to this host, the database is not.
+        
         Args:
             campaign_id: Campaign identifier
             results: Complete LLM execution results from all agents
         """
         try:
             # Get campaign name from the plan
-            plan = self.planner.get_plan(campaign_id)
+            plan = self.planner.get_plan(campaign_id, include_results=False)
             campaign_name = plan.campaign_name if plan else f"Campaign {campaign_id}"
             
             # Check if we're using PostgreSQL connector with the new method
             if hasattr(self.connector, 'insert_campaign_result'):
                 # Store complete LLM results in campaign_results table
-                self.connector.insert_campaign_result(campaign_id, campaign_name, results)
+                self.connector.insert_campaign_result(campaign_id, campaign_name, self.artifacts.resolve(results))
                 print(f"✅ LLM results persisted to campaign_results table for campaign {campaign_id}")
             else:
                 print(f"⚠️  PostgreSQL connector not available, LLM results not persisted for campaign {campaign_id}")
@@ -313,13 +341,15 @@ class CampaignService:
             traceback.print_exc()
             raise Exception(f"Error reading campaigns: {str(e)}")
 
-    def create_campaign(self, goal: str, campaign_name: Optional[str] = None) -> Dict[str, Any]:
+    def create_campaign(self, goal: str, campaign_name: Optional[str] = None,
+                        priority: str = "interactive") -> Dict[str, Any]:
         """
         Create a new campaign plan and start execution asynchronously.
 
         Args:
             goal: Natural language campaign goal
             campaign_name: Optional custom campaign name. If not provided, will be generated.
+            priority: LLM scheduling priority ('interactive' or 'batch')
 
         Returns:
             Campaign creation response with campaign_id and plan (execution starts in background)
@@ -338,10 +368,10 @@ class CampaignService:
             campaign_name = self._generate_campaign_name(goal)
 
         # Create plan via CampaignPlanner
-        campaign_id, plan = self.planner.create_plan(goal, campaign_name)
+        campaign_id, plan = self.planner.create_plan(goal, campaign_name, priority)
 
         # Start async execution in background
-        self.executor.submit(self._execute_campaign_async, campaign_id)
+        self.executor.submit(self._execute_campaign_async, campaign_id, priority)
 
         # Return immediately with campaign_id and pending status
         return {
@@ -355,12 +385,13 @@ class CampaignService:
             "message": "Campaign execution started in background"
         }
 
-    def _execute_campaign_async(self, campaign_id: str) -> None:
+    def _execute_campaign_async(self, campaign_id: str, priority: str = "interactive") -> None:
         """
         Execute campaign in background (called by ThreadPoolExecutor).
 
         Args:
             campaign_id: Campaign identifier
+            priority: LLM scheduling priority for this campaign's calls
         """
         try:
             # Update plan status to executing
@@ -375,7 +406,8 @@ class CampaignService:
             )
 
             # Execute via orchestrator (respects BaseAgent interface)
-            result = self.orchestrator.process(message)
+            with llm_priority(priority):
+                result = self.orchestrator.process(message)
 
             # If successful, persist campaign to database
             if result.get('success'):
@@ -419,3 +451,41 @@ class CampaignService:
             Campaign status with plan details
         """
         return self.planner.get_plan_status(campaign_id)
+
+    def get_campaign_projection(self, campaign_id: str) -> Dict[str, Any]:
+        """
+        Get the status-only view of a campaign plan (no results).
+
+        Args:
+            campaign_id: Campaign identifier
+
+        Returns:
+            Plan status, steps and version
+        """
+        return self.planner.get_plan_projection(campaign_id)
+
+    async def wait_for_campaign_change(self, campaign_id: str, since_version: int, timeout: float) -> None:
+        """
+        Wait until a campaign plan changes past since_version, finishes, or the timeout expires.
+
+        Args:
+            campaign_id: Campaign identifier
+            since_version: Plan version the caller already has
+            timeout: Maximum seconds to wait
+        """
+        await self.planner.wait_for_change(campaign_id, since_version, timeout)
+
+    def get_campaign_stream(self, campaign_id: str, offsets: Optional[Dict[str, int]] = None,
+                            revisions: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Get streamed LLM narrative text produced since the given offsets.
+
+        Args:
+            campaign_id: Campaign identifier
+            offsets: Output key -> number of characters already received
+            revisions: Output key -> revision of the text already received
+
+        Returns:
+            Plan status, new text per output key and the full text of replaced keys
+        """
+        return self.planner.get_partial_outputs(campaign_id, offsets, revisions)